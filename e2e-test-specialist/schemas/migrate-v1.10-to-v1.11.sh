@@ -0,0 +1,47 @@
+#!/usr/bin/env bash
+# Migrate v1.10.0 → v1.11.0.
+#
+# New column:
+#   test_tags.auto                       (INTEGER, 1 if the importer linked it)
+#
+# A re-import trims only the links it made itself, so a tag added with /tag
+# survives even when the taxonomy also produces that name. Existing links
+# to an auto tag are marked auto = 1, which is how they were treated before;
+# re-add a hand-made one with /tag add to claim it.
+#
+# Idempotent: safe to re-run.
+
+set -euo pipefail
+DB="${1:-.e2e-testing/e2e-tests.sqlite}"
+[[ -f "$DB" ]] || { echo "error: db not found: $DB" >&2; exit 1; }
+
+current="$(sqlite3 "$DB" 'SELECT version FROM schema_version ORDER BY applied_at DESC LIMIT 1;')"
+case "$current" in
+    1.10.0) echo "Migrating $DB from v1.10.0 to v1.11.0..." ;;
+    1.11.0) echo "Already at v1.11.0; nothing to do."; exit 0 ;;
+    *)      echo "error: unexpected schema version: $current" >&2; exit 1 ;;
+esac
+
+mkdir -p "$(dirname "$DB")/_backups"
+cp "$DB" "$(dirname "$DB")/_backups/pre-v1.11-migration-$(date -u +%Y%m%dT%H%M%SZ).sqlite"
+
+column_exists() {
+    local table="$1" col="$2"
+    sqlite3 "$DB" "PRAGMA table_info('$table');" | awk -F'|' '{print $2}' | grep -qx "$col"
+}
+
+column_exists test_tags auto || sqlite3 "$DB" "ALTER TABLE test_tags ADD COLUMN auto INTEGER NOT NULL DEFAULT 0;"
+
+sqlite3 "$DB" <<'SQL'
+BEGIN;
+
+UPDATE test_tags SET auto = 1
+ WHERE tag_name IN (SELECT name FROM tags WHERE auto = 1);
+
+INSERT OR IGNORE INTO schema_version (version, applied_at)
+VALUES ('1.11.0', strftime('%Y-%m-%d %H:%M:%f', 'now'));
+
+COMMIT;
+SQL
+
+echo "Migration complete: $DB is now at v1.11.0."
@@ -0,0 +1,51 @@
+#!/usr/bin/env bash
+# Migrate v1.4.0 → v1.5.0.
+#
+# New columns:
+#   phases.content_hash                  (TEXT, NULL = not imported / pre-v1.5)
+#   tests.content_hash                   (TEXT, NULL = not imported / pre-v1.5)
+#
+# Existing rows keep NULL hashes, so the first re-import after migrating
+# rewrites every imported phase once and records its hash.
+#
+# Idempotent: safe to re-run.
+
+set -euo pipefail
+DB="${1:-.e2e-testing/e2e-tests.sqlite}"
+[[ -f "$DB" ]] || { echo "error: db not found: $DB" >&2; exit 1; }
+
+current="$(sqlite3 "$DB" 'SELECT version FROM schema_version ORDER BY applied_at DESC LIMIT 1;')"
+case "$current" in
+    1.4.0) echo "Migrating $DB from v1.4.0 to v1.5.0..." ;;
+    1.5.0) echo "Already at v1.5.0; nothing to do."; exit 0 ;;
+    *)     echo "error: unexpected schema version: $current" >&2; exit 1 ;;
+esac
+
+mkdir -p "$(dirname "$DB")/_backups"
+cp "$DB" "$(dirname "$DB")/_backups/pre-v1.5-migration-$(date -u +%Y%m%dT%H%M%SZ).sqlite"
+
+column_exists() {
+    local table="$1" col="$2"
+    sqlite3 "$DB" "PRAGMA table_info('$table');" | awk -F'|' '{print $2}' | grep -qx "$col"
+}
+
+if ! column_exists phases content_hash; then
+    sqlite3 "$DB" "ALTER TABLE phases ADD COLUMN content_hash TEXT;"
+fi
+
+if ! column_exists tests content_hash; then
+    sqlite3 "$DB" "ALTER TABLE tests ADD COLUMN content_hash TEXT;"
+fi
+
+sqlite3 "$DB" <<'SQL'
+BEGIN;
+
+-- Millisecond timestamp: when /init chains migrations within one second the
+-- newest version must still sort last under ORDER BY applied_at DESC.
+INSERT OR IGNORE INTO schema_version (version, applied_at)
+VALUES ('1.5.0', strftime('%Y-%m-%d %H:%M:%f', 'now'));
+
+COMMIT;
+SQL
+
+echo "Migration complete: $DB is now at v1.5.0."
@@ -0,0 +1,44 @@
+#!/usr/bin/env bash
+# Migrate v1.5.0 → v1.6.0.
+#
+# New columns:
+#   state.import_cursor                  (TEXT JSON, NULL = no interrupted import)
+#
+# The importer commits long Test Results Logs in chunks and records how far it
+# got here, so `import-ledger.py --resume` can continue after a crash.
+#
+# Idempotent: safe to re-run.
+
+set -euo pipefail
+DB="${1:-.e2e-testing/e2e-tests.sqlite}"
+[[ -f "$DB" ]] || { echo "error: db not found: $DB" >&2; exit 1; }
+
+current="$(sqlite3 "$DB" 'SELECT version FROM schema_version ORDER BY applied_at DESC LIMIT 1;')"
+case "$current" in
+    1.5.0) echo "Migrating $DB from v1.5.0 to v1.6.0..." ;;
+    1.6.0) echo "Already at v1.6.0; nothing to do."; exit 0 ;;
+    *)     echo "error: unexpected schema version: $current" >&2; exit 1 ;;
+esac
+
+mkdir -p "$(dirname "$DB")/_backups"
+cp "$DB" "$(dirname "$DB")/_backups/pre-v1.6-migration-$(date -u +%Y%m%dT%H%M%SZ).sqlite"
+
+column_exists() {
+    local table="$1" col="$2"
+    sqlite3 "$DB" "PRAGMA table_info('$table');" | awk -F'|' '{print $2}' | grep -qx "$col"
+}
+
+if ! column_exists state import_cursor; then
+    sqlite3 "$DB" "ALTER TABLE state ADD COLUMN import_cursor TEXT;"
+fi
+
+sqlite3 "$DB" <<'SQL'
+BEGIN;
+
+INSERT OR IGNORE INTO schema_version (version, applied_at)
+VALUES ('1.6.0', strftime('%Y-%m-%d %H:%M:%f', 'now'));
+
+COMMIT;
+SQL
+
+echo "Migration complete: $DB is now at v1.6.0."
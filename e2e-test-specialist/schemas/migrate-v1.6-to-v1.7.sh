@@ -0,0 +1,113 @@
+#!/usr/bin/env bash
+# Migrate v1.6.0 → v1.7.0.
+#
+# New table:
+#   text_blobs                           (content-addressed, zlib-compressed text)
+# New columns:
+#   phases.raw_blob, tests.raw_blob      (BLOB, text_blobs.hash)
+#   test_runs.final_state_blob           (BLOB, text_blobs.hash)
+# New views:
+#   v_phase_markdown, v_test_markdown, v_run_final_state
+#
+# Imported phases/tests (content_hash set) and run summaries whose text
+# compresses well move it into text_blobs, then the file is VACUUMed. That
+# step needs the sqlite3 shell's sqlar_compress() and sha3(); without them
+# the rows stay inline, which the views handle just the same.
+#
+# Idempotent: safe to re-run.
+
+set -euo pipefail
+DB="${1:-.e2e-testing/e2e-tests.sqlite}"
+[[ -f "$DB" ]] || { echo "error: db not found: $DB" >&2; exit 1; }
+
+current="$(sqlite3 "$DB" 'SELECT version FROM schema_version ORDER BY applied_at DESC LIMIT 1;')"
+case "$current" in
+    1.6.0) echo "Migrating $DB from v1.6.0 to v1.7.0..." ;;
+    1.7.0) echo "Already at v1.7.0; nothing to do."; exit 0 ;;
+    *)     echo "error: unexpected schema version: $current" >&2; exit 1 ;;
+esac
+
+mkdir -p "$(dirname "$DB")/_backups"
+cp "$DB" "$(dirname "$DB")/_backups/pre-v1.7-migration-$(date -u +%Y%m%dT%H%M%SZ).sqlite"
+
+column_exists() {
+    local table="$1" col="$2"
+    sqlite3 "$DB" "PRAGMA table_info('$table');" | awk -F'|' '{print $2}' | grep -qx "$col"
+}
+
+column_exists phases raw_blob || sqlite3 "$DB" "ALTER TABLE phases ADD COLUMN raw_blob BLOB;"
+column_exists tests raw_blob || sqlite3 "$DB" "ALTER TABLE tests ADD COLUMN raw_blob BLOB;"
+column_exists test_runs final_state_blob || sqlite3 "$DB" "ALTER TABLE test_runs ADD COLUMN final_state_blob BLOB;"
+
+sqlite3 "$DB" <<'SQL'
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS text_blobs (
+    hash  BLOB PRIMARY KEY,
+    size  INTEGER NOT NULL,
+    data  BLOB NOT NULL
+) WITHOUT ROWID;
+
+CREATE VIEW IF NOT EXISTS v_phase_markdown AS
+SELECT p.id, COALESCE(p.raw_markdown, CAST(sqlar_uncompress(b.data, b.size) AS TEXT)) AS raw_markdown
+FROM phases p
+LEFT JOIN text_blobs b ON b.hash = p.raw_blob;
+
+CREATE VIEW IF NOT EXISTS v_test_markdown AS
+SELECT t.id, COALESCE(t.raw_markdown, CAST(sqlar_uncompress(b.data, b.size) AS TEXT)) AS raw_markdown
+FROM tests t
+LEFT JOIN text_blobs b ON b.hash = t.raw_blob;
+
+CREATE VIEW IF NOT EXISTS v_run_final_state AS
+SELECT r.id, COALESCE(r.final_state, CAST(sqlar_uncompress(b.data, b.size) AS TEXT)) AS final_state
+FROM test_runs r
+LEFT JOIN text_blobs b ON b.hash = r.final_state_blob;
+
+COMMIT;
+SQL
+
+if sqlite3 "$DB" "SELECT sqlar_compress('x'), sha3('x', 256);" >/dev/null 2>&1; then
+    before="$(wc -c < "$DB")"
+    # Same rule as the importer: a text moves when compression saves more
+    # than the two 32-byte digests it costs; shorter text stays inline.
+    sqlite3 "$DB" <<'SQL'
+BEGIN;
+
+INSERT OR IGNORE INTO text_blobs (hash, size, data)
+SELECT sha3(raw_markdown, 256), length(CAST(raw_markdown AS BLOB)), sqlar_compress(CAST(raw_markdown AS BLOB))
+FROM phases WHERE content_hash IS NOT NULL
+  AND length(sqlar_compress(CAST(raw_markdown AS BLOB))) + 64 < length(CAST(raw_markdown AS BLOB));
+INSERT OR IGNORE INTO text_blobs (hash, size, data)
+SELECT sha3(raw_markdown, 256), length(CAST(raw_markdown AS BLOB)), sqlar_compress(CAST(raw_markdown AS BLOB))
+FROM tests WHERE content_hash IS NOT NULL
+  AND length(sqlar_compress(CAST(raw_markdown AS BLOB))) + 64 < length(CAST(raw_markdown AS BLOB));
+INSERT OR IGNORE INTO text_blobs (hash, size, data)
+SELECT sha3(final_state, 256), length(CAST(final_state AS BLOB)), sqlar_compress(CAST(final_state AS BLOB))
+FROM test_runs
+WHERE length(sqlar_compress(CAST(final_state AS BLOB))) + 64 < length(CAST(final_state AS BLOB));
+
+UPDATE phases SET raw_blob = sha3(raw_markdown, 256), raw_markdown = NULL
+WHERE content_hash IS NOT NULL AND sha3(raw_markdown, 256) IN (SELECT hash FROM text_blobs);
+UPDATE tests SET raw_blob = sha3(raw_markdown, 256), raw_markdown = NULL
+WHERE content_hash IS NOT NULL AND sha3(raw_markdown, 256) IN (SELECT hash FROM text_blobs);
+UPDATE test_runs SET final_state_blob = sha3(final_state, 256), final_state = NULL
+WHERE sha3(final_state, 256) IN (SELECT hash FROM text_blobs);
+
+COMMIT;
+VACUUM;
+SQL
+    echo "Moved imported markdown into text_blobs: $before → $(wc -c < "$DB") bytes."
+else
+    echo "note: this sqlite3 shell lacks sqlar_compress()/sha3(); existing markdown stays inline."
+fi
+
+sqlite3 "$DB" <<'SQL'
+BEGIN;
+
+INSERT OR IGNORE INTO schema_version (version, applied_at)
+VALUES ('1.7.0', strftime('%Y-%m-%d %H:%M:%f', 'now'));
+
+COMMIT;
+SQL
+
+echo "Migration complete: $DB is now at v1.7.0."
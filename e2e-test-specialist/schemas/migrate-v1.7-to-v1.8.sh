@@ -0,0 +1,47 @@
+#!/usr/bin/env bash
+# Migrate v1.7.0 → v1.8.0.
+#
+# New columns:
+#   test_steps.source_line, test_steps.source_line_end   (INTEGER, 1-based ledger lines)
+#
+# The importer records where each step came from in the ledger. Existing rows
+# stay NULL until the next import, which fills them in without rewriting the
+# unchanged tests.
+#
+# Idempotent: safe to re-run.
+
+set -euo pipefail
+DB="${1:-.e2e-testing/e2e-tests.sqlite}"
+[[ -f "$DB" ]] || { echo "error: db not found: $DB" >&2; exit 1; }
+
+current="$(sqlite3 "$DB" 'SELECT version FROM schema_version ORDER BY applied_at DESC LIMIT 1;')"
+case "$current" in
+    1.7.0) echo "Migrating $DB from v1.7.0 to v1.8.0..." ;;
+    1.8.0) echo "Already at v1.8.0; nothing to do."; exit 0 ;;
+    *)     echo "error: unexpected schema version: $current" >&2; exit 1 ;;
+esac
+
+mkdir -p "$(dirname "$DB")/_backups"
+cp "$DB" "$(dirname "$DB")/_backups/pre-v1.8-migration-$(date -u +%Y%m%dT%H%M%SZ).sqlite"
+
+column_exists() {
+    local table="$1" col="$2"
+    sqlite3 "$DB" "PRAGMA table_info('$table');" | awk -F'|' '{print $2}' | grep -qx "$col"
+}
+
+for col in source_line source_line_end; do
+    if ! column_exists test_steps "$col"; then
+        sqlite3 "$DB" "ALTER TABLE test_steps ADD COLUMN $col INTEGER;"
+    fi
+done
+
+sqlite3 "$DB" <<'SQL'
+BEGIN;
+
+INSERT OR IGNORE INTO schema_version (version, applied_at)
+VALUES ('1.8.0', strftime('%Y-%m-%d %H:%M:%f', 'now'));
+
+COMMIT;
+SQL
+
+echo "Migration complete: $DB is now at v1.8.0."
@@ -0,0 +1,71 @@
+#!/usr/bin/env bash
+# Migrate v1.8.0 → v1.9.0.
+#
+# New column:
+#   state.credentials_stamp   (TEXT, random token)
+# New triggers:
+#   trg_credentials_stamp_insert / _update / _delete
+#
+# The triggers replace the stamp whenever a credential's name or fields
+# change, so e2e-daemon.py and redact.py --tree can tell from one row
+# whether the credentials they were built from are current.
+#
+# Idempotent: safe to re-run.
+
+set -euo pipefail
+DB="${1:-.e2e-testing/e2e-tests.sqlite}"
+[[ -f "$DB" ]] || { echo "error: db not found: $DB" >&2; exit 1; }
+
+current="$(sqlite3 "$DB" 'SELECT version FROM schema_version ORDER BY applied_at DESC LIMIT 1;')"
+case "$current" in
+    1.8.0) echo "Migrating $DB from v1.8.0 to v1.9.0..." ;;
+    1.9.0) echo "Already at v1.9.0; nothing to do."; exit 0 ;;
+    *)     echo "error: unexpected schema version: $current" >&2; exit 1 ;;
+esac
+
+mkdir -p "$(dirname "$DB")/_backups"
+cp "$DB" "$(dirname "$DB")/_backups/pre-v1.9-migration-$(date -u +%Y%m%dT%H%M%SZ).sqlite"
+
+column_exists() {
+    local table="$1" col="$2"
+    sqlite3 "$DB" "PRAGMA table_info('$table');" | awk -F'|' '{print $2}' | grep -qx "$col"
+}
+
+# ALTER TABLE cannot add a column with a non-constant default; existing rows
+# get their first stamp below.
+if ! column_exists state credentials_stamp; then
+    sqlite3 "$DB" "ALTER TABLE state ADD COLUMN credentials_stamp TEXT;"
+fi
+
+sqlite3 "$DB" <<'SQL'
+BEGIN;
+
+UPDATE state SET credentials_stamp = lower(hex(randomblob(16)))
+ WHERE id = 1 AND credentials_stamp IS NULL;
+
+CREATE TRIGGER IF NOT EXISTS trg_credentials_stamp_insert
+AFTER INSERT ON credentials
+BEGIN
+    UPDATE state SET credentials_stamp = lower(hex(randomblob(16))) WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_credentials_stamp_update
+AFTER UPDATE OF name, fields ON credentials
+WHEN OLD.name IS NOT NEW.name OR OLD.fields IS NOT NEW.fields
+BEGIN
+    UPDATE state SET credentials_stamp = lower(hex(randomblob(16))) WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_credentials_stamp_delete
+AFTER DELETE ON credentials
+BEGIN
+    UPDATE state SET credentials_stamp = lower(hex(randomblob(16))) WHERE id = 1;
+END;
+
+INSERT OR IGNORE INTO schema_version (version, applied_at)
+VALUES ('1.9.0', strftime('%Y-%m-%d %H:%M:%f', 'now'));
+
+COMMIT;
+SQL
+
+echo "Migration complete: $DB is now at v1.9.0."
@@ -0,0 +1,125 @@
+#!/usr/bin/env bash
+# Migrate v1.9.0 → v1.10.0.
+#
+# New column:
+#   memories.body_blob                   (BLOB, text_blobs.hash)
+# New view:
+#   v_memory_body
+# Recreated:
+#   memories_fts (external content is now v_memory_body), memories_ai /
+#   memories_ad / memories_au (index inline bodies only)
+#
+# The index is rebuilt from the inline bodies first. Then memory bodies that
+# compress well move into text_blobs, as v1.7.0 did for imported markdown,
+# and the file is VACUUMed; the index already holds their text. That step
+# needs the sqlite3 shell's sqlar_compress() and sha3(); without them the
+# bodies stay inline, which v_memory_body handles just the same.
+#
+# Idempotent: safe to re-run.
+
+set -euo pipefail
+DB="${1:-.e2e-testing/e2e-tests.sqlite}"
+[[ -f "$DB" ]] || { echo "error: db not found: $DB" >&2; exit 1; }
+
+current="$(sqlite3 "$DB" 'SELECT version FROM schema_version ORDER BY applied_at DESC LIMIT 1;')"
+case "$current" in
+    1.9.0)  echo "Migrating $DB from v1.9.0 to v1.10.0..." ;;
+    1.10.0) echo "Already at v1.10.0; nothing to do."; exit 0 ;;
+    *)      echo "error: unexpected schema version: $current" >&2; exit 1 ;;
+esac
+
+mkdir -p "$(dirname "$DB")/_backups"
+cp "$DB" "$(dirname "$DB")/_backups/pre-v1.10-migration-$(date -u +%Y%m%dT%H%M%SZ).sqlite"
+
+column_exists() {
+    local table="$1" col="$2"
+    sqlite3 "$DB" "PRAGMA table_info('$table');" | awk -F'|' '{print $2}' | grep -qx "$col"
+}
+
+column_exists memories body_blob || sqlite3 "$DB" "ALTER TABLE memories ADD COLUMN body_blob BLOB;"
+
+sqlite3 "$DB" <<'SQL'
+BEGIN;
+
+DROP TRIGGER IF EXISTS memories_ai;
+DROP TRIGGER IF EXISTS memories_ad;
+DROP TRIGGER IF EXISTS memories_au;
+DROP TABLE IF EXISTS memories_fts;
+
+CREATE VIEW IF NOT EXISTS v_memory_body AS
+SELECT m.rowid AS rowid, m.id, m.title,
+       CASE WHEN m.body_blob IS NULL THEN m.body
+            ELSE CAST(sqlar_uncompress(b.data, b.size) AS TEXT) END AS body,
+       m.tags
+FROM memories m
+LEFT JOIN text_blobs b ON b.hash = m.body_blob;
+
+CREATE VIRTUAL TABLE memories_fts USING fts5(
+    title, body, tags, content='v_memory_body', content_rowid='rowid'
+);
+
+-- Not 'rebuild': that reads v_memory_body, which needs sqlar_uncompress().
+-- Every body is still inline here.
+INSERT INTO memories_fts(rowid, title, body, tags)
+SELECT rowid, title, body, tags FROM memories;
+
+CREATE TRIGGER memories_ai AFTER INSERT ON memories
+WHEN NEW.body_blob IS NULL
+BEGIN
+    INSERT INTO memories_fts(rowid, title, body, tags)
+    VALUES (NEW.rowid, NEW.title, NEW.body, NEW.tags);
+END;
+
+CREATE TRIGGER memories_ad AFTER DELETE ON memories
+WHEN OLD.body_blob IS NULL
+BEGIN
+    INSERT INTO memories_fts(memories_fts, rowid, title, body, tags)
+    VALUES('delete', OLD.rowid, OLD.title, OLD.body, OLD.tags);
+END;
+
+CREATE TRIGGER memories_au AFTER UPDATE ON memories
+WHEN OLD.body_blob IS NULL AND NEW.body_blob IS NULL
+BEGIN
+    INSERT INTO memories_fts(memories_fts, rowid, title, body, tags)
+    VALUES('delete', OLD.rowid, OLD.title, OLD.body, OLD.tags);
+    INSERT INTO memories_fts(rowid, title, body, tags)
+    VALUES (NEW.rowid, NEW.title, NEW.body, NEW.tags);
+END;
+
+COMMIT;
+SQL
+
+if sqlite3 "$DB" "SELECT sqlar_compress('x'), sha3('x', 256);" >/dev/null 2>&1; then
+    before="$(wc -c < "$DB")"
+    # Same rule as the importer: a body moves when compression saves more
+    # than the two 32-byte digests it costs. memories_au skips the move, so
+    # the index keeps the text it was built from.
+    sqlite3 "$DB" <<'SQL'
+BEGIN;
+
+INSERT OR IGNORE INTO text_blobs (hash, size, data)
+SELECT sha3(body, 256), length(CAST(body AS BLOB)), sqlar_compress(CAST(body AS BLOB))
+FROM memories WHERE body_blob IS NULL
+  AND length(sqlar_compress(CAST(body AS BLOB))) + 64 < length(CAST(body AS BLOB));
+
+UPDATE memories SET body_blob = sha3(body, 256), body = ''
+WHERE body_blob IS NULL AND sha3(body, 256) IN (SELECT hash FROM text_blobs);
+
+COMMIT;
+VACUUM;
+SQL
+    echo "Moved memory bodies into text_blobs: $before → $(wc -c < "$DB") bytes."
+else
+    echo "note: this sqlite3 shell lacks sqlar_compress()/sha3(); memory bodies stay inline."
+fi
+
+sqlite3 "$DB" <<'SQL'
+BEGIN;
+
+INSERT OR IGNORE INTO schema_version (version, applied_at)
+VALUES ('1.10.0', strftime('%Y-%m-%d %H:%M:%f', 'now'));
+
+COMMIT;
+SQL
+
+echo "Migration complete: $DB is now at v1.10.0."
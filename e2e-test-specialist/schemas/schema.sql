@@ -1,4 +1,4 @@
--- e2e-test-specialist schema v1.4.0
+-- e2e-test-specialist schema v1.11.0
 -- WAL + foreign keys are required for crash-safe checkpoints.
 
 PRAGMA foreign_keys = ON;
@@ -12,7 +12,7 @@ CREATE TABLE IF NOT EXISTS schema_version (
     version    TEXT PRIMARY KEY,
     applied_at TEXT DEFAULT (datetime('now'))
 );
-INSERT OR IGNORE INTO schema_version (version) VALUES ('1.4.0');
+INSERT OR IGNORE INTO schema_version (version) VALUES ('1.11.0');
 
 -- ============================================================================
 -- Directives — non-negotiable rules harvested from the source ledger
@@ -258,6 +258,24 @@ CREATE INDEX IF NOT EXISTS idx_sites_status ON sites(status);
 CREATE INDEX IF NOT EXISTS idx_sites_app ON sites(app_id);
 CREATE INDEX IF NOT EXISTS idx_sites_infra ON sites(infra_id);
 
+-- ============================================================================
+-- Text blobs (v1.7.0) — content-addressed, compressed markdown
+--
+-- Imported phase/test markdown, historical run summaries and (v1.10.0)
+-- imported memory bodies are stored once per distinct text, keyed by the sha3-256 digest of the UTF-8 bytes, when
+-- compression pays for the reference (short text stays inline). `data`
+-- follows the SQLite Archive convention: zlib-compressed, or the raw bytes
+-- when size = length(data). Read them through v_phase_markdown /
+-- v_test_markdown / v_run_final_state / v_memory_body. The importer deletes blobs nothing
+-- references any more.
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS text_blobs (
+    hash  BLOB PRIMARY KEY,                          -- sha3-256 digest of the text
+    size  INTEGER NOT NULL,                          -- uncompressed byte length
+    data  BLOB NOT NULL
+) WITHOUT ROWID;
+
 -- ============================================================================
 -- Phases — top-level groupings of tests (P00..PNN)
 -- ============================================================================
@@ -269,6 +287,10 @@ CREATE TABLE IF NOT EXISTS phases (
     phase_order          INTEGER NOT NULL,
     expected_test_count  INTEGER,
     raw_markdown         TEXT,                       -- preserved for re-parse / agent inspection
+    -- v1.5.0: importer fingerprint of the ledger subtree this row came from.
+    -- Re-imports skip phases/tests whose hash is unchanged. NULL = not imported.
+    content_hash         TEXT,
+    raw_blob             BLOB,                       -- v1.7.0: text_blobs.hash, set instead of raw_markdown
     created_at           TEXT DEFAULT (datetime('now')),
     updated_at           TEXT DEFAULT (datetime('now'))
 );
@@ -299,6 +321,8 @@ CREATE TABLE IF NOT EXISTS tests (
     -- Each ID is opaque; resolution maps to apps/infrastructure rows or to inline objects.
     -- Example: ["APP-001","APP-002","APP-003"] — same procedure runs once per app.
     applies_to                  TEXT NOT NULL DEFAULT '[]',
+    content_hash                TEXT,                 -- v1.5.0: see phases.content_hash
+    raw_blob                    BLOB,                 -- v1.7.0: see phases.raw_blob
     created_at                  TEXT DEFAULT (datetime('now')),
     updated_at                  TEXT DEFAULT (datetime('now'))
 );
@@ -328,6 +352,11 @@ CREATE TABLE IF NOT EXISTS test_steps (
     -- safe assumption for read-only checks). 0 = mutates state — fix-loop should rebuild
     -- preceding setup steps before retry, or surface "manual cleanup needed" first.
     idempotent        INTEGER NOT NULL DEFAULT 1 CHECK (idempotent IN (0,1)),
+    -- v1.8.0: ledger lines the step was imported from (1-based, inclusive), so a
+    -- step can be opened in the ledger without keeping tests.raw_markdown around.
+    -- NULL for hand-added steps; re-imports move them when the ledger shifts.
+    source_line       INTEGER,
+    source_line_end   INTEGER,
     created_at        TEXT DEFAULT (datetime('now'))
 );
 
@@ -444,6 +473,7 @@ CREATE TABLE IF NOT EXISTS tags (
 CREATE TABLE IF NOT EXISTS test_tags (
     test_id   TEXT NOT NULL REFERENCES tests(id) ON DELETE CASCADE,
     tag_name  TEXT NOT NULL REFERENCES tags(name) ON DELETE CASCADE,
+    auto      INTEGER NOT NULL DEFAULT 0,           -- v1.11.0: 1 if the importer linked it
     PRIMARY KEY (test_id, tag_name)
 );
 
@@ -466,6 +496,7 @@ CREATE TABLE IF NOT EXISTS test_runs (
     skip_tags       TEXT NOT NULL DEFAULT '[]',     -- JSON
     context         TEXT,                            -- markdown summary at start
     final_state     TEXT,                            -- markdown summary at end
+    final_state_blob BLOB,                           -- v1.7.0: text_blobs.hash (imported history)
     metrics         TEXT NOT NULL DEFAULT '{}',     -- JSON: counts, durations, coverage
     created_at      TEXT DEFAULT (datetime('now'))
 );
@@ -566,7 +597,8 @@ CREATE TABLE IF NOT EXISTS memories (
     title             TEXT NOT NULL,
     kind              TEXT NOT NULL
         CHECK (kind IN ('decision','workaround','gotcha','convention','environment','lesson-learned','bug-pattern','credential-note','other')),
-    body              TEXT NOT NULL,
+    body              TEXT NOT NULL,                 -- '' when body_blob is set
+    body_blob         BLOB,                          -- v1.10.0: text_blobs.hash (imported memories)
     why_important     TEXT,
     importance        INTEGER NOT NULL DEFAULT 3 CHECK (importance BETWEEN 1 AND 5),
     related_run_id    TEXT REFERENCES test_runs(id) ON DELETE SET NULL,
@@ -581,21 +613,43 @@ CREATE TABLE IF NOT EXISTS memories (
     updated_at        TEXT DEFAULT (datetime('now'))
 );
 
+-- v1.10.0 — a memory's body whether it is stored inline or in text_blobs.
+-- Also the external content of memories_fts, so 'rebuild', snippet() and
+-- 'integrity-check' see the decoded text (they need sqlar_uncompress()).
+CREATE VIEW IF NOT EXISTS v_memory_body AS
+SELECT m.rowid AS rowid, m.id, m.title,
+       CASE WHEN m.body_blob IS NULL THEN m.body
+            ELSE CAST(sqlar_uncompress(b.data, b.size) AS TEXT) END AS body,
+       m.tags
+FROM memories m
+LEFT JOIN text_blobs b ON b.hash = m.body_blob;
+
 CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5(
-    title, body, tags, content='memories', content_rowid='rowid'
+    title, body, tags, content='v_memory_body', content_rowid='rowid'
 );
 
-CREATE TRIGGER IF NOT EXISTS memories_ai AFTER INSERT ON memories BEGIN
+-- The triggers index inline bodies only, so writing a memory never needs
+-- sqlar_uncompress(). Rows with a body_blob are indexed by whoever stores
+-- the blob (import-ledger.py, migrate-v1.9-to-v1.10.sh); after editing the
+-- title, tags or body of one by hand, run
+-- INSERT INTO memories_fts(memories_fts) VALUES('rebuild').
+CREATE TRIGGER IF NOT EXISTS memories_ai AFTER INSERT ON memories
+WHEN NEW.body_blob IS NULL
+BEGIN
     INSERT INTO memories_fts(rowid, title, body, tags)
     VALUES (NEW.rowid, NEW.title, NEW.body, NEW.tags);
 END;
 
-CREATE TRIGGER IF NOT EXISTS memories_ad AFTER DELETE ON memories BEGIN
+CREATE TRIGGER IF NOT EXISTS memories_ad AFTER DELETE ON memories
+WHEN OLD.body_blob IS NULL
+BEGIN
     INSERT INTO memories_fts(memories_fts, rowid, title, body, tags)
     VALUES('delete', OLD.rowid, OLD.title, OLD.body, OLD.tags);
 END;
 
-CREATE TRIGGER IF NOT EXISTS memories_au AFTER UPDATE ON memories BEGIN
+CREATE TRIGGER IF NOT EXISTS memories_au AFTER UPDATE ON memories
+WHEN OLD.body_blob IS NULL AND NEW.body_blob IS NULL
+BEGIN
     INSERT INTO memories_fts(memories_fts, rowid, title, body, tags)
     VALUES('delete', OLD.rowid, OLD.title, OLD.body, OLD.tags);
     INSERT INTO memories_fts(rowid, title, body, tags)
@@ -634,11 +688,35 @@ CREATE TABLE IF NOT EXISTS state (
     active_run_id            TEXT REFERENCES test_runs(id) ON DELETE SET NULL,
     base_url                 TEXT,
     detected_environment     TEXT NOT NULL DEFAULT '{}',
-    last_update              TEXT DEFAULT (datetime('now'))
+    last_update              TEXT DEFAULT (datetime('now')),
+    import_cursor            TEXT,                -- v1.6.0: JSON {ledger sha256, byte_offset} of an unfinished chunked import
+    -- v1.9.0: random token replaced whenever a credential's name or fields
+    -- change (triggers below), so one single-row read tells e2e-daemon.py
+    -- and redact.py --tree whether the credentials they saw are current.
+    credentials_stamp        TEXT DEFAULT (lower(hex(randomblob(16))))
 );
 
 INSERT OR IGNORE INTO state (id) VALUES (1);
 
+CREATE TRIGGER IF NOT EXISTS trg_credentials_stamp_insert
+AFTER INSERT ON credentials
+BEGIN
+    UPDATE state SET credentials_stamp = lower(hex(randomblob(16))) WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_credentials_stamp_update
+AFTER UPDATE OF name, fields ON credentials
+WHEN OLD.name IS NOT NEW.name OR OLD.fields IS NOT NEW.fields
+BEGIN
+    UPDATE state SET credentials_stamp = lower(hex(randomblob(16))) WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_credentials_stamp_delete
+AFTER DELETE ON credentials
+BEGIN
+    UPDATE state SET credentials_stamp = lower(hex(randomblob(16))) WHERE id = 1;
+END;
+
 -- ============================================================================
 -- Convenience views
 -- ============================================================================
@@ -842,6 +920,25 @@ SELECT
 FROM v_latest_step_status
 GROUP BY run_id, test_id;
 
+-- v1.7.0 — the markdown of phases, tests and runs whether it is stored inline
+-- (rows written by /plan or the agent) or in text_blobs (imported rows).
+-- sqlar_uncompress() ships with the sqlite3 shell. Python callers register
+-- an equivalent function on their connection first.
+CREATE VIEW IF NOT EXISTS v_phase_markdown AS
+SELECT p.id, COALESCE(p.raw_markdown, CAST(sqlar_uncompress(b.data, b.size) AS TEXT)) AS raw_markdown
+FROM phases p
+LEFT JOIN text_blobs b ON b.hash = p.raw_blob;
+
+CREATE VIEW IF NOT EXISTS v_test_markdown AS
+SELECT t.id, COALESCE(t.raw_markdown, CAST(sqlar_uncompress(b.data, b.size) AS TEXT)) AS raw_markdown
+FROM tests t
+LEFT JOIN text_blobs b ON b.hash = t.raw_blob;
+
+CREATE VIEW IF NOT EXISTS v_run_final_state AS
+SELECT r.id, COALESCE(r.final_state, CAST(sqlar_uncompress(b.data, b.size) AS TEXT)) AS final_state
+FROM test_runs r
+LEFT JOIN text_blobs b ON b.hash = r.final_state_blob;
+
 -- ============================================================================
 -- v1.2 triggers: protect data integrity that CHECK constraints can't express
 -- ============================================================================
@@ -12,6 +12,7 @@ import json
 import os
 import sqlite3
 import sys
+import zlib
 from datetime import datetime
 
 
@@ -28,6 +29,13 @@ def fmt_dur(seconds: float | None) -> str:
     return f"{s}s"
 
 
+def sqlar_uncompress(data: bytes | None, size: int | None) -> bytes | None:
+    """Python twin of the sqlite3 shell function the v_*_markdown views use."""
+    if data is None or len(data) == size:
+        return data
+    return zlib.decompress(data)
+
+
 def main() -> int:
     p = argparse.ArgumentParser()
     p.add_argument("run_id")
@@ -40,8 +48,13 @@ def main() -> int:
         return 2
     conn = sqlite3.connect(args.db)
     conn.row_factory = sqlite3.Row
+    conn.create_function("sqlar_uncompress", 2, sqlar_uncompress, deterministic=True)
 
-    run = conn.execute("SELECT * FROM test_runs WHERE id = ?", (args.run_id,)).fetchone()
+    run = conn.execute(
+        """SELECT r.*, f.final_state AS final_text FROM test_runs r
+           JOIN v_run_final_state f ON f.id = r.id WHERE r.id = ?""",
+        (args.run_id,),
+    ).fetchone()
     if not run:
         print(f"error: run not found: {args.run_id}", file=sys.stderr)
         return 2
@@ -153,10 +166,10 @@ def main() -> int:
                     out.append(f"  - actual: `{f['actual_result'][:200]}`")
             out.append("")
 
-    if run["final_state"]:
+    if run["final_text"]:
         out.append("**Final state**:")
         out.append("")
-        out.append(run["final_state"])
+        out.append(run["final_text"])
         out.append("")
 
     print("\n".join(out))
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Thin client for e2e-daemon.py, with the plain scripts as fallback.
+
+Usage:
+    ... | python3 -S e2e-client.py [--db PATH] redact                     # = redact.py
+    ... | python3 -S e2e-client.py [--db PATH] detect [--quiet]           # = redact-screenshot.py
+    python3 -S e2e-client.py [--db PATH] render "<template>" "<json-context>"
+    python3 -S e2e-client.py [--db PATH] render "<template>" --subject <id>   # = render-template.py
+
+Output and exit status are those of the script named on the right. When no
+daemon listens on ``daemon.sock`` beside the DB, the client execs that
+script instead, so callers never need to know whether one is running.
+
+The client imports only built-in C modules (``_socket``, ``_thread``), and
+``-S`` skips ``site``, so it starts in about the time of a bare interpreter;
+the stdlib ``socket`` wrapper alone would cost more than the warm request.
+"""
+
+import _socket
+import _thread
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+USAGE = ("usage: e2e-client.py [--db PATH] (redact | detect [--quiet] | "
+         "render <template> (<json-context> | --subject <id>))")
+
+
+def parse(argv: list[str]) -> tuple[str, list[str], list[str]] | None:
+    """``(db, request fields, fallback argv)``, or None on bad usage."""
+    db = os.environ.get("E2E_DB", ".e2e-testing/e2e-tests.sqlite")
+    if argv[:1] == ["--db"] and len(argv) > 1:
+        db, argv = argv[1], argv[2:]
+    op, args = (argv[0], argv[1:]) if argv else ("", [])
+    if op == "redact" and not args:
+        return db, ["redact"], ["redact.py", db]
+    if op == "detect" and args in ([], ["--quiet"]):
+        return db, ["detect", "1" if args else ""], ["redact-screenshot.py", "--db", db, *args]
+    if op == "render" and len(args) == 2:
+        return db, ["render", args[0], "context", args[1]], ["render-template.py", *args]
+    if op == "render" and len(args) == 3 and args[1] == "--subject":
+        return db, ["render", args[0], "subject", args[2]], ["render-template.py", *args, "--db", db]
+    return None
+
+
+def write_all(fd: int, data: bytes):
+    while data:
+        data = data[os.write(fd, data):]
+
+
+def pump_stdin(sock, done):
+    """Copy stdin to the daemon as it arrives, then signal EOF."""
+    try:
+        while chunk := os.read(0, 65536):
+            sock.sendall(chunk)
+        sock.shutdown(_socket.SHUT_WR)
+    except OSError:
+        pass  # the daemon stopped reading; its reply says why
+    finally:
+        done.release()
+
+
+def main(argv: list[str]) -> int:
+    parsed = parse(argv[1:])
+    if parsed is None:
+        print(USAGE, file=sys.stderr)
+        return 2
+    db, fields, fallback = parsed
+
+    sock = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    try:
+        sock.connect(os.path.join(os.path.dirname(db) or ".", "daemon.sock"))
+    except OSError:
+        sock.close()
+        script = os.path.join(HERE, fallback[0])
+        os.execv(sys.executable, [sys.executable, script, *fallback[1:]])
+
+    head = "\0".join(fields).encode("utf-8", "surrogateescape")
+    sock.sendall(b"%d\n" % len(head) + head)
+    done = _thread.allocate_lock()
+    done.acquire()
+    if fields[0] == "render":
+        sock.shutdown(_socket.SHUT_WR)
+        done.release()
+    else:
+        _thread.start_new_thread(pump_stdin, (sock, done))
+
+    # Frames: "<n>\n" + n bytes of stdout, as many as the daemon streams,
+    # then "<exit> <n>\n" + n bytes of stderr.
+    data = b""
+    while True:
+        while b"\n" not in data and (chunk := sock.recv(65536)):
+            data += chunk
+        head, _, data = data.partition(b"\n")
+        try:
+            fields = [int(x) for x in head.split()]
+        except ValueError:
+            fields = []
+        size = fields[-1] if len(fields) in (1, 2) else -1
+        while len(data) < size and (chunk := sock.recv(65536)):
+            data += chunk
+        if size < 0 or len(data) < size:
+            print("e2e-client: the daemon closed the connection before its reply was complete",
+                  file=sys.stderr)
+            return 1
+        write_all(1 if len(fields) == 1 else 2, data[:size])
+        data = data[size:]
+        if len(fields) == 2:
+            break
+    done.acquire()
+    sock.close()
+    return fields[0]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
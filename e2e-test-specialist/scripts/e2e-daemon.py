@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""Opt-in local daemon that serves render, redact and detect requests warm.
+
+Every /test step otherwise starts a fresh python3 for render-template.py,
+redact.py and redact-screenshot.py, and each one opens the DB and prepares
+its state again. The daemon keeps one DB connection, the prepared
+``Redactor`` and the resolved subject contexts between requests. It listens
+on ``daemon.sock`` beside the DB (mode 0600). e2e-client.py talks to it and
+runs the original scripts instead when nothing is listening, so the daemon
+is never required.
+
+Usage:
+    python3 e2e-daemon.py start  [--db PATH] [--idle-timeout SECONDS]
+    python3 e2e-daemon.py stop   [--db PATH]
+    python3 e2e-daemon.py status [--db PATH]
+    python3 e2e-daemon.py serve  [--db PATH] [--idle-timeout SECONDS]   # foreground
+
+The idle timeout defaults to config ``daemon.idle_timeout_seconds``; an idle
+daemon exits on its own, 0 keeps it until ``stop``.
+
+Warm state is checked before every request: ``PRAGMA data_version`` on the
+kept connection changes whenever another connection commits, which drops
+the subject contexts and re-reads ``state.credentials_stamp`` (the Redactor
+is rebuilt only when the stamp moved). A DB file replaced on disk (restored
+from a backup) is reopened.
+
+Wire format (one request per connection, see e2e-client.py):
+    request   "<n>\\n" + n bytes of NUL-separated fields (op, args...) + body until EOF
+    response  any number of "<n>\\n" + n bytes of stdout,
+              then "<exit> <n>\\n" + n bytes of stderr
+
+The status comes last, so a redaction streamed back chunk by chunk can
+still fail with a non-zero exit.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from redact import Redactor, credentials_stamp
+
+HERE = Path(__file__).resolve().parent
+SOCKET_NAME = "daemon.sock"
+START_TIMEOUT = 10.0
+
+
+def _script(name: str):
+    """Import a hyphenated sibling script (render-template.py, ...) as a module."""
+    spec = importlib.util.spec_from_file_location(name.replace("-", "_"), HERE / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_config(db_path: str) -> dict:
+    """The project's config.json (E2E_CONFIG, else beside the DB), falling back
+    to the plugin defaults."""
+    for path in (os.environ.get("E2E_CONFIG"), Path(db_path).parent / "config.json",
+                 HERE.parent / "schemas" / "default-config.json"):
+        if path and Path(path).is_file():
+            try:
+                with open(path) as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                continue
+    return {}
+
+
+def log(db_path: str, level: str, message: str):
+    """One line in the activity log, as lib.sh's e2e_log writes it."""
+    path = Path(os.environ.get("E2E_LOG") or Path(db_path).parent / "logs" / "activity.log")
+    ts = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a") as f:
+            f.write(f"{ts} [{level}] [daemon] {message}\n")
+    except OSError:
+        pass
+
+
+class Warm:
+    """The connection, Redactor and subject contexts kept between requests.
+
+    ``refresh`` runs under ``lock`` before each request and returns the
+    Redactor to use; a request keeps that object even if a later refresh
+    replaces it.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.conn: sqlite3.Connection | None = None
+        self.ident: tuple[int, int] | None = None
+        self.version: int | None = None
+        self.redactor: Redactor | None = None
+        self.subjects: dict[str, dict] = {}
+        self.render = _script("render-template")
+        self.screenshot = _script("redact-screenshot")
+
+    def refresh(self) -> Redactor:
+        st = os.stat(self.db_path)
+        if self.conn is None or (st.st_dev, st.st_ino) != self.ident:
+            if self.conn is not None:
+                self.conn.close()
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self.ident = (st.st_dev, st.st_ino)
+            self.version = self.redactor = None
+        version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != self.version:
+            self.version = version
+            self.subjects.clear()
+            stamp = credentials_stamp(self.conn)
+            if self.redactor is None or stamp is None or stamp != self.redactor.stamp:
+                self.redactor = Redactor.from_conn(self.conn)
+        return self.redactor
+
+    def subject(self, subject_id: str) -> dict:
+        """Resolved fields of one subject; call with ``lock`` held."""
+        fields = self.subjects.get(subject_id)
+        if fields is None:
+            fields = self.subjects[subject_id] = self.render.subject_fields(self.conn, subject_id)
+        return fields
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+
+
+class _Frames:
+    """Text stream for ``redact_stream``: each write goes out as one stdout frame."""
+
+    def __init__(self, wfile):
+        self.wfile = wfile
+
+    def write(self, text: str) -> int:
+        data = text.encode("utf-8", "surrogateescape")
+        if data:
+            self.wfile.write(b"%d\n" % len(data) + data)
+        return len(text)
+
+    def flush(self):
+        self.wfile.flush()
+
+
+class Handler(socketserver.StreamRequestHandler):
+    server: "Daemon"
+
+    def handle(self):
+        self.server.begin()
+        try:
+            self.dispatch()
+        finally:
+            self.server.end()
+
+    def dispatch(self):
+        self.replied = False
+        try:
+            size = int(self.rfile.readline())
+            op, *args = self.rfile.read(size).decode("utf-8", "surrogateescape").split("\0")
+        except ValueError:
+            return
+        self.server.requests += 1
+        method = getattr(self, f"op_{op}", None)
+        if method is None:
+            self.reply(2, f"e2e-daemon: unknown request '{op}'\n")
+            return
+        try:
+            method(*args)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        except Exception as e:  # keep serving; the client sees the error
+            log(self.server.warm.db_path, "ERROR", f"{op}: {type(e).__name__}: {e}")
+            if not self.replied:
+                try:
+                    self.reply(1, f"e2e-daemon: {op} failed: {type(e).__name__}: {e}\n")
+                except OSError:
+                    pass
+
+    def reply(self, code: int, stderr: str = "", stdout: str = ""):
+        """Any ``stdout`` not streamed yet, then the exit status and stderr."""
+        self.replied = True
+        out = stdout.encode("utf-8", "surrogateescape")
+        err = stderr.encode("utf-8", "surrogateescape")
+        self.wfile.write((b"%d\n" % len(out) + out if out else b"") + b"%d %d\n" % (code, len(err)) + err)
+
+    def body(self) -> str:
+        return self.rfile.read().decode("utf-8", "surrogateescape")
+
+    def warm_redactor(self) -> Redactor:
+        warm = self.server.warm
+        with warm.lock:
+            return warm.refresh()
+
+    def op_redact(self):
+        """redact.py: stdin streamed through, written back chunk by chunk; the
+        status follows the last chunk, so a failure part way exits 1."""
+        redactor = self.warm_redactor()
+        # newline="": line endings pass through untouched, as with sys.stdin/stdout.
+        src = io.TextIOWrapper(self.rfile, encoding="utf-8", errors="surrogateescape", newline="")
+        redactor.redact_stream(src, _Frames(self.wfile))
+        self.reply(0)
+
+    def op_detect(self, quiet: str = ""):
+        """redact-screenshot.py [--quiet]."""
+        snapshot = self.body()
+        if not snapshot:
+            self.reply(0)
+            return
+        findings = self.warm_redactor().detect(snapshot, first=bool(quiet))
+        if not findings:
+            self.reply(0)
+        else:
+            self.reply(1, "" if quiet else self.server.warm.screenshot.warning(findings))
+
+    def op_render(self, template: str, kind: str, value: str):
+        """render-template.py with a JSON context or a subject id."""
+        warm = self.server.warm
+        if kind == "subject":
+            with warm.lock:
+                warm.refresh()
+                context = {"subject": warm.subject(value)}
+        else:
+            try:
+                context = json.loads(value)
+            except json.JSONDecodeError as e:
+                self.reply(2, f"error: invalid JSON context: {e}\n")
+                return
+        self.reply(0, stdout=warm.render.render(template, context))
+
+    def op_ping(self):
+        server = self.server
+        self.reply(0, stdout=f"pid={os.getpid()} db={server.warm.db_path} "
+                             f"uptime={time.monotonic() - server.started:.0f}s requests={server.requests}\n")
+
+    def op_stop(self):
+        self.reply(0)
+        threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+
+class Daemon(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, warm: Warm, idle_timeout: float):
+        self.warm = warm
+        self.idle_timeout = idle_timeout
+        self.started = self.last = time.monotonic()
+        self.requests = 0
+        self.in_flight = 0  # requests being served; the idle clock waits for them
+        self.in_flight_lock = threading.Lock()
+        old = os.umask(0o177)  # socket readable by the owner only
+        try:
+            super().__init__(SOCKET_NAME, Handler)
+        finally:
+            os.umask(old)
+
+    def begin(self):
+        with self.in_flight_lock:
+            self.in_flight += 1
+            self.last = time.monotonic()
+
+    def end(self):
+        with self.in_flight_lock:
+            self.in_flight -= 1
+            self.last = time.monotonic()
+
+    def service_actions(self):
+        """Exit once idle: no request in flight (a long streamed redaction
+        holds the daemon up) and none finished within the idle timeout."""
+        with self.in_flight_lock:
+            idle = not self.in_flight and time.monotonic() - self.last > self.idle_timeout
+        if self.idle_timeout and idle:
+            threading.Thread(target=self.shutdown, daemon=True).start()
+
+
+def socket_path(db_path: str) -> str:
+    return os.path.join(os.path.dirname(db_path) or ".", SOCKET_NAME)
+
+
+def request(db_path: str, *fields: str, timeout: float = 5.0) -> tuple[int, str] | None:
+    """Send one body-less request; ``(exit, stdout)``, or None when no daemon answers."""
+    try:
+        with socket.socket(socket.AF_UNIX) as s:
+            s.settimeout(timeout)
+            s.connect(socket_path(db_path))
+            head = "\0".join(fields).encode()
+            s.sendall(b"%d\n" % len(head) + head)
+            s.shutdown(socket.SHUT_WR)
+            data = b""
+            while chunk := s.recv(65536):
+                data += chunk
+        out = b""
+        while True:
+            head, _, data = data.partition(b"\n")
+            fields = [int(x) for x in head.split()]
+            if len(fields) == 2:
+                return fields[0], out.decode()
+            out, data = out + data[:fields[0]], data[fields[0]:]
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def serve(db_path: str, idle_timeout: float) -> int:
+    db_path = os.path.abspath(db_path)
+    if os.environ.get("E2E_LOG"):
+        os.environ["E2E_LOG"] = os.path.abspath(os.environ["E2E_LOG"])
+    if request(db_path, "ping") is not None:
+        print(f"e2e-daemon: already running for {db_path}", file=sys.stderr)
+        return 1
+    # Bind by a relative name from the DB directory: AF_UNIX paths are limited
+    # to ~100 bytes, project paths are not.
+    os.chdir(os.path.dirname(db_path))
+    try:
+        os.unlink(SOCKET_NAME)  # left behind by a daemon that was killed
+    except FileNotFoundError:
+        pass
+    warm = Warm(db_path)
+    warm.refresh()
+    server = Daemon(warm, idle_timeout)
+    stop = lambda *_: threading.Thread(target=server.shutdown, daemon=True).start()  # noqa: E731
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    log(db_path, "INFO", f"started pid={os.getpid()} idle_timeout={idle_timeout:g}s")
+    try:
+        server.serve_forever(poll_interval=1.0)
+    finally:
+        server.server_close()
+        try:
+            os.unlink(SOCKET_NAME)
+        except FileNotFoundError:
+            pass
+        warm.close()
+        log(db_path, "INFO", f"stopped pid={os.getpid()} requests={server.requests}")
+    return 0
+
+
+def start(db_path: str, idle_timeout: float) -> int:
+    found = request(db_path, "ping")
+    if found is not None:
+        print(f"already running: {found[1].strip()}")
+        return 0
+    proc = subprocess.Popen(
+        [sys.executable, str(Path(__file__).resolve()), "serve", "--db", db_path,
+         "--idle-timeout", str(idle_timeout)],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True)
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        found = request(db_path, "ping")
+        if found is not None:
+            print(f"started: {found[1].strip()}")
+            return 0
+        if proc.poll() is not None:
+            print(f"e2e-daemon: exited with status {proc.returncode} before listening", file=sys.stderr)
+            return 1
+        time.sleep(0.05)
+    print(f"e2e-daemon: not listening after {START_TIMEOUT:g}s", file=sys.stderr)
+    return 1
+
+
+def stop(db_path: str) -> int:
+    if request(db_path, "stop") is None:
+        print("not running")
+        return 0
+    deadline = time.monotonic() + START_TIMEOUT
+    while os.path.exists(socket_path(db_path)) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    print("stopped")
+    return 0
+
+
+def main(argv: list[str]) -> int:
+    p = argparse.ArgumentParser(prog="e2e-daemon.py")
+    p.add_argument("command", choices=("start", "stop", "status", "serve"))
+    p.add_argument("--db", default=os.environ.get("E2E_DB", ".e2e-testing/e2e-tests.sqlite"))
+    p.add_argument("--idle-timeout", type=float, default=None,
+                   help="exit after this many idle seconds, 0 = never "
+                        "(default: config daemon.idle_timeout_seconds)")
+    args = p.parse_args(argv[1:])
+
+    if args.command == "stop":
+        return stop(args.db)
+    if args.command == "status":
+        found = request(args.db, "ping")
+        print(f"running: {found[1].strip()}" if found else "not running")
+        return 0 if found else 1
+    if not os.path.exists(args.db):
+        print(f"e2e-daemon: no database at {args.db}", file=sys.stderr)
+        return 2
+    if args.idle_timeout is None:
+        args.idle_timeout = float(load_config(args.db).get("daemon", {}).get("idle_timeout_seconds", 900))
+    if args.command == "start":
+        return start(args.db, args.idle_timeout)
+    return serve(args.db, args.idle_timeout)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -12,6 +12,14 @@ import json
 import os
 import sqlite3
 import sys
+import zlib
+
+
+def sqlar_uncompress(data: bytes | None, size: int | None) -> bytes | None:
+    """Python twin of the sqlite3 shell function the v_*_markdown views use."""
+    if data is None or len(data) == size:
+        return data
+    return zlib.decompress(data)
 
 
 def main() -> int:
@@ -25,6 +33,7 @@ def main() -> int:
         return 2
     conn = sqlite3.connect(args.db)
     conn.row_factory = sqlite3.Row
+    conn.create_function("sqlar_uncompress", 2, sqlar_uncompress, deterministic=True)
 
     out: list[str] = []
     out.append("# E2E Testing Ledger (exported)")
@@ -123,7 +132,9 @@ def main() -> int:
     # Historical runs
     if args.include_history:
         runs = conn.execute(
-            "SELECT * FROM test_runs WHERE status='completed' ORDER BY started_at"
+            """SELECT r.*, f.final_state AS final_text FROM test_runs r
+               JOIN v_run_final_state f ON f.id = r.id
+               WHERE r.status='completed' ORDER BY r.started_at"""
         ).fetchall()
         if runs:
             out.append("## Test Results Log")
@@ -132,8 +143,8 @@ def main() -> int:
                 date = (r["started_at"] or "")[:10]
                 out.append(f"### {date} — {r['id']} — {r['label'] or ''}")
                 out.append("")
-                if r["final_state"]:
-                    out.append(r["final_state"])
+                if r["final_text"]:
+                    out.append(r["final_text"])
                     out.append("")
 
     print("\n".join(out))
@@ -13,28 +13,51 @@ Sections handled (any subset is fine — missing ones are skipped, not errors):
 Anything else under ## is preserved as a memory (kind='environment') so nothing is lost.
 
 Usage:
-    python3 import-ledger.py <ledger.md>
+    python3 import-ledger.py <ledger.md | dir | glob> [...]
         [--db .e2e-testing/e2e-tests.sqlite]
         [--taxonomy /path/to/tag-taxonomy.json]
         [--dry-run]                 # parse + print counts; do not write
         [--json-summary]            # output a machine-readable summary
+        [--deprecate-missing]       # soft-delete imported tests gone from the ledger
+        [--jobs N]                  # parse sections in N processes (0 = all CPUs)
+        [--no-cache]                # ignore and do not write the parse cache
+        [--profile]                 # add timings to the summary (also E2E_PROFILE=1)
+        [--chunk-runs N]            # commit the results log every N runs (0 = once)
+        [--resume]                  # continue an interrupted chunked import
+        [--watch [--interval S]]    # keep running; apply each saved change
+        [--progress ndjson]         # JSON progress events on stderr
+
+Re-imports are incremental: phases and tests store a content hash, and only
+subtrees whose hash changed are rewritten (see Writer). The parse itself is
+cached under .e2e-testing/cache/ keyed by the ledger and taxonomy hashes, so a
+--dry-run followed by the real import parses once (see ParseCache).
 
 The parser is intentionally tolerant: structure preservation matters more than
-exhaustive field extraction. Every test row keeps its `raw_markdown` so the
-agent or user can refine later without re-running the importer.
+exhaustive field extraction. Every phase and test keeps its source markdown
+(compressed in text_blobs, read through v_test_markdown) so the agent or user
+can refine later without re-running the importer.
 """
 
 from __future__ import annotations
 
 import argparse
+import glob
+import hashlib
 import json
 import os
 import re
+import resource
 import sqlite3
 import sys
-from dataclasses import dataclass, field
+import textwrap
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Iterator, NamedTuple
 
 # ---------------------------------------------------------------------------
 # Markdown chunking
@@ -55,12 +78,23 @@ BUG_NUMBERED_RE = re.compile(
     r"^(?P<num>\d+)\.\s+\*\*(?P<title>[^*]+?)\*\*\s*(?P<rest>.*)$",
     re.MULTILINE,
 )
-BULLET_KV = re.compile(r"^\s*[-*]\s+\*\*(?P<key>[^*]+?)\*\*[^:\n]*?:\s*(?P<val>.+?)\s*$")
-# Inline pairs on one line: "**IP**: x | **Port**: y"  → list of (key,val)
-INLINE_KV  = re.compile(r"\*\*(?P<key>[^*]+?)\*\*\s*:\s*(?P<val>[^|*]+?)(?=\s*\||$)")
-# Common credential value patterns
-PAT_RE      = re.compile(r"\b(ghp_[A-Za-z0-9_]{20,}|github_pat_[A-Za-z0-9_]{20,})\b")
-DO_TOKEN_RE = re.compile(r"\b(dop_v1_[a-f0-9]{40,})\b")
+# Key/value bullet lines, one alternation scanned over a whole block: a line
+# with pipes holds several pairs ("- **IP**: x | **SSH Port**: y", split by
+# INLINE_KV within the line), otherwise "- **Key** (note): value".
+# Every class excludes its own terminator, so a failed match has nothing to
+# backtrack into and a line is read once (plain quantifiers: possessive ones
+# need Python 3.11).
+KV_LINE = re.compile(
+    r"^(?P<indent>[ \t]*)(?:(?P<pairs>[-*][^|\n]*\|[^\n]*)"
+    r"|[-*][ \t]+\*\*(?P<key>[^*\n]+)\*\*[^:\n]*:(?P<val>[^\n]*))",
+    re.MULTILINE,
+)
+# Inline pairs on one line: "**IP**: x | **Port**: y"  → list of (key,val).
+# The value starts at a non-space, so "\s*" cannot give spaces back to it.
+INLINE_KV  = re.compile(r"\*\*(?P<key>[^*]+)\*\*\s*:\s*(?P<val>[^|*\s][^|*]*)(?=\||$)")
+# Keys whose value is a credential, address or port: never folded with the
+# lines under it, which are notes about the value rather than part of it.
+SINGLE_LINE_KEY = re.compile(r"password|passphrase|token|secret|\b(?:port|ip|user(?:name)?|url|domain)\b")
 TABLE_ROW = re.compile(r"^\s*\|(.+)\|\s*$")
 TABLE_DIVIDER = re.compile(r"^\s*\|?\s*[-:]+\s*(\|\s*[-:]+\s*)+\|?\s*$")
 
@@ -71,53 +105,152 @@ def slugify(s: str) -> str:
     return s.strip("-") or "section"
 
 
-def split_h2_sections(text: str) -> list[tuple[str, str]]:
-    """Return [(heading, body), ...] for top-level ## sections, in order."""
-    lines = text.splitlines()
-    sections: list[tuple[str, list[str]]] = []
-    current: tuple[str, list[str]] | None = None
-    for line in lines:
-        m = H2.match(line)
-        if m:
-            if current:
-                sections.append(current)
-            current = (m.group("title").strip(), [])
-        elif current:
-            current[1].append(line)
-    if current:
-        sections.append(current)
-    return [(t, "\n".join(b).strip()) for t, b in sections]
-
-
-def split_h3_sections(text: str) -> list[tuple[str, str]]:
-    lines = text.splitlines()
-    out: list[tuple[str, list[str]]] = []
-    current: tuple[str, list[str]] | None = None
-    for line in lines:
-        m = H3.match(line)
-        if m:
-            if current:
-                out.append(current)
-            current = (m.group("title").strip(), [])
-        elif current:
-            current[1].append(line)
-    if current:
-        out.append(current)
-    return [(t, "\n".join(b).strip()) for t, b in out]
-
-
-def parse_table(block: str) -> list[dict]:
+def content_hash(*parts) -> str:
+    """Stable fingerprint of JSON-serializable parts (phases/tests.content_hash)."""
+    return hashlib.sha256(
+        json.dumps(parts, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    ).hexdigest()[:32]
+
+
+# ---------------------------------------------------------------------------
+# Tokenizer — one pass over the ledger, typed line events
+# ---------------------------------------------------------------------------
+#
+# A single MULTILINE regex scan emits an Event for every structural line
+# (headings, bold markers, numbered items, table rows). Plain lines are not
+# materialized: they are whatever lies between events, and Block.lines()
+# slices them out on demand. Section parsers walk event ranges instead of
+# re-splitting strings; text is only copied when a row column needs it.
+
+TOK_H2    = "h2"
+TOK_H3    = "h3"
+TOK_H4    = "h4"
+TOK_BOLD  = "bold"     # standalone **Title** line (test-group marker)
+TOK_ITEM  = "item"     # "N. text" numbered list item
+TOK_ROW   = "row"      # | a | b | table row
+TOK_RULE  = "rule"     # |---|---| table divider
+
+# Same grammar as H2/H3/H4/BOLD_SECTION/NUMBERED/TABLE_* above, with `\s`
+# narrowed to "whitespace but not newline" so no match can cross a line.
+_WS = r"[^\S\n]"
+STRUCTURE = re.compile(
+    rf"^(?:##{_WS}+(?P<h2>.+?){_WS}*"
+    rf"|###{_WS}+(?P<h3>.+?){_WS}*"
+    rf"|####{_WS}+(?P<h4>.+?){_WS}*"
+    rf"|\*\*(?P<bold>[^*\n][^*\n]*?)\*\*{_WS}*"
+    rf"|\d+\.{_WS}+(?P<item>.+)"
+    rf"|(?P<rule>{_WS}*\|?{_WS}*[-:]+{_WS}*(?:\|{_WS}*[-:]+{_WS}*)+\|?{_WS}*)"
+    rf"|{_WS}*\|(?P<row>.+)\|{_WS}*"
+    rf")$",
+    re.MULTILINE,
+)
+_STRIPPED = {TOK_H2, TOK_H3, TOK_H4, TOK_BOLD}
+
+
+class Event(NamedTuple):
+    kind: str
+    line: int       # 0-based line number in the ledger
+    offset: int     # character offset of the line start
+    end: int        # character offset of the line end (terminator excluded)
+    value: str      # heading/marker title, item text or row cells
+    vstart: int     # character offset where `value` starts
+
+
+_new_event = tuple.__new__
+
+
+class Ledger:
+    """The ledger text plus its event stream. Line endings are normalized to
+    LF so every Block's text is a single slice of ``self.text``."""
+
+    def __init__(self, text: str):
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        self.text = text
+        events: list[Event] = []
+        line = 0
+        last = 0
+        count = text.count
+        for m in STRUCTURE.finditer(text):
+            kind = m.lastgroup
+            start = m.start()
+            line += count("\n", last, start)
+            last = start
+            vstart, vend = m.span(kind)
+            value = text[vstart:vend]
+            if kind in _STRIPPED:
+                value = value.strip()
+            events.append(_new_event(Event, (kind, line, start, m.end(), value, vstart)))
+        self.events = events
+
+    def block(self) -> "Block":
+        return Block(self, 0, len(self.text), 0, len(self.events))
+
+
+class Block:
+    """A character range [start, end) of a Ledger plus the events inside it."""
+
+    __slots__ = ("ledger", "start", "end", "lo", "hi")
+
+    def __init__(self, ledger: Ledger, start: int, end: int, lo: int, hi: int):
+        self.ledger = ledger
+        self.start = start
+        self.end = end
+        self.lo = lo
+        self.hi = hi
+
+    def events(self) -> list[Event]:
+        return self.ledger.events[self.lo:self.hi]
+
+    @property
+    def text(self) -> str:
+        """Stripped text of the block (what the old split/join helpers returned)."""
+        return self.ledger.text[self.start:self.end].strip()
+
+    def lines(self) -> list[str]:
+        return self.text.split("\n")
+
+    def content_end(self) -> int:
+        """Offset just past the last non-whitespace character (== start if blank)."""
+        return self.start + len(self.ledger.text[self.start:self.end].rstrip())
+
+    def sub(self, start: int, end: int, lo: int, hi: int) -> "Block":
+        return Block(self.ledger, start, end, lo, hi)
+
+    def sections(self, kind: str) -> list[tuple[str, "Block"]]:
+        """[(title, body), ...] for each ``kind`` heading in the block, in order.
+        Text before the first heading is dropped."""
+        evs = self.ledger.events
+        heads = [i for i in range(self.lo, self.hi) if evs[i].kind == kind]
+        out: list[tuple[str, Block]] = []
+        for n, i in enumerate(heads):
+            if n + 1 < len(heads):
+                nxt = heads[n + 1]
+                end, hi = evs[nxt].offset, nxt
+            else:
+                end, hi = self.end, self.hi
+            out.append((evs[i].value, Block(self.ledger, evs[i].end + 1, end, i + 1, hi)))
+        return out
+
+
+def tokenize(text: str) -> Ledger:
+    return Ledger(text)
+
+
+def parse_table(block: Block) -> list[dict]:
     """Parse the first markdown table found in the block. Returns list of dicts."""
     rows: list[list[str]] = []
-    for line in block.splitlines():
-        if TABLE_DIVIDER.match(line):
+    prev_end = -1
+    for ev in block.events():
+        if ev.kind not in (TOK_ROW, TOK_RULE):
+            if rows:
+                break
             continue
-        m = TABLE_ROW.match(line)
-        if m:
-            cells = [c.strip() for c in m.group(1).split("|")]
-            rows.append(cells)
-        elif rows:
-            break  # table ended
+        if rows and ev.offset != prev_end + 1:
+            break  # a plain line sat between this row and the last: table ended
+        prev_end = ev.end
+        if ev.kind == TOK_ROW:
+            rows.append([c.strip() for c in ev.value.split("|")])
     if len(rows) < 2:
         return []
     headers = [h.lower().strip().strip("*") for h in rows[0]]
@@ -129,27 +262,82 @@ def parse_table(block: str) -> list[dict]:
     return out
 
 
-def parse_kv_bullets(block: str) -> dict[str, str]:
-    out: dict[str, str] = {}
-    for line in block.splitlines():
-        # Multi-pair lines: "- **IP**: x | **SSH Port**: 6985"
-        if line.lstrip().startswith(("-", "*")) and "|" in line and "**" in line:
-            for m in INLINE_KV.finditer(line):
-                key = m.group("key").lower().strip()
-                val = m.group("val").strip().rstrip("|").strip()
-                if val.startswith("`") and val.endswith("`"):
-                    val = val[1:-1]
-                if key and val:
-                    out[key] = val
-            continue
-        m = BULLET_KV.match(line)
-        if m:
-            key = m.group("key").lower().strip()
-            val = m.group("val").strip()
-            if val.startswith("`") and val.endswith("`"):
-                val = val[1:-1]
-            out[key] = val
-    return out
+def _unquote(val: str) -> str:
+    return val[1:-1] if val.startswith("`") and val.endswith("`") else val
+
+
+def _continuation(text: str, pos: int, endpos: int, indent: int) -> int:
+    """End of the lines after the line ending at ``pos`` that are indented
+    deeper than ``indent`` — a value wrapped onto the next lines, or nested
+    plain bullets under a key. Stops at a blank line, a shallower line, or
+    ``endpos`` (where the next pair starts)."""
+    end = pos
+    while pos < endpos:
+        eol = text.find("\n", pos + 1, endpos)
+        eol = endpos if eol < 0 else eol
+        line = text[pos + 1:eol]
+        if not line.strip() or len(line) - len(line.lstrip(" \t")) <= indent:
+            break
+        end = pos = eol
+    return end
+
+
+def _settle(text: str, held: tuple, limit: int) -> tuple[str, str | None, tuple[int, int]]:
+    """Finish a line's last pair: fold in its continuation lines up to ``limit``
+    (not for a SINGLE_LINE_KEY). Its value is None for a key with nothing
+    after its colon."""
+    key, val, start, end, line_end, indent = held
+    if SINGLE_LINE_KEY.search(key):
+        return key, val, (start, end)
+    more = _continuation(text, line_end, limit, indent)
+    if more > line_end:
+        extra = textwrap.dedent(text[line_end + 1:more]).rstrip()
+        val, end = (f"{val}\n{extra}" if val else extra), more
+    return key, val, (start, end)
+
+
+def scan_kv_pairs(text: str, pos: int = 0, endpos: int | None = None) -> Iterator[tuple[str, str, tuple[int, int]]]:
+    """Yield ``(key, value, (start, end))`` for every bold-key bullet in
+    ``text[pos:endpos]`` in one pass. Keys are lowercased; a value wrapped
+    onto deeper-indented lines, or nested plain bullets under a key, joins
+    the line's last pair (dedented, one line per source line) unless that
+    key holds a credential, address or port. A nested bullet with its own
+    bold key is a pair of its own."""
+    endpos = len(text) if endpos is None else endpos
+    held = None  # the previous line's last pair when indented lines follow it
+    for m in KV_LINE.finditer(text, pos, endpos):
+        indent, pairs, key, val = m.group("indent", "pairs", "key", "val")
+        if pairs is None:
+            val = val.strip() if val else ""  # "- **Key**: " is as empty as "- **Key**:"
+            last = (key.lower().strip(), _unquote(val) if val else None, m.start(), m.end())
+            found = ()
+        else:
+            found = [(im.group("key").lower().strip(), _unquote(im.group("val").strip()) or None, *im.span())
+                     for im in INLINE_KV.finditer(text, m.start("pairs"), m.end()) if im.group("key").strip()]
+            if not found:
+                continue  # e.g. "  - a | b": may still continue the previous pair
+            last = found.pop()
+        if held:
+            key, val, span = _settle(text, held, m.start() - 1)
+            if val is not None:
+                yield key, val, span
+            held = None
+        for key, val, start, end in found:
+            if val is not None:
+                yield key, val, (start, end)
+        line_end = m.end()
+        if line_end + 1 < endpos and text[line_end + 1] in " \t":
+            held = (*last, line_end, len(indent))
+        elif last[1] is not None:
+            yield last[0], last[1], (last[2], last[3])
+    if held:
+        key, val, span = _settle(text, held, endpos)
+        if val is not None:
+            yield key, val, span
+
+
+def parse_kv_bullets(block: Block) -> dict[str, str]:
+    return {key: val for key, val, _ in scan_kv_pairs(block.ledger.text, block.start, block.end)}
 
 
 # ---------------------------------------------------------------------------
@@ -158,8 +346,14 @@ def parse_kv_bullets(block: str) -> dict[str, str]:
 
 @dataclass
 class ParsedStep:
+    """A numbered item, located rather than copied: ``start``/``end`` slice
+    its text out of the parent test's ``raw``, and ``step_action`` reads it
+    when the step is written. ``line``/``line_end`` are 1-based ledger lines."""
     order: int
-    action: str
+    start: int
+    end: int
+    line: int
+    line_end: int
     expected: str = ""
 
 
@@ -182,36 +376,55 @@ class ParsedPhase:
     round_added: int | None = None
 
 
-def extract_numbered_steps(block: str) -> list[ParsedStep]:
+# Two consecutive blank lines (or a blank item followed by a blank line).
+_BLANK_RUN = re.compile(r"(?:^|\n)[^\S\n]*\n[^\S\n]*(?:\n|$)")
+
+
+def _step_text(chunk: str) -> str:
+    """Materialize one step's action from its slice of the ledger.
+    Runs of blank lines collapse to a single blank line."""
+    if _BLANK_RUN.search(chunk):
+        kept: list[str] = []
+        for line in chunk.split("\n"):
+            if line.strip() == "" and kept and not kept[-1].strip():
+                continue
+            kept.append(line)
+        chunk = "\n".join(kept)
+    return chunk.strip()
+
+
+def step_action(raw: str, step: ParsedStep) -> str:
+    return _step_text(raw[step.start:step.end])
+
+
+def extract_numbered_steps(block: Block, base: int) -> list[ParsedStep]:
     """Pull `1. ...`, `2. ...` numbered list items from a block.
     Continuation lines (non-numbered, non-empty) merge into the previous item.
+    Steps carry offsets relative to ``base``, where the test's ``raw`` starts
+    in the ledger text; nothing is copied here.
     """
+    text = block.ledger.text
+    items = [ev for ev in block.events() if ev.kind == TOK_ITEM]
     steps: list[ParsedStep] = []
-    current: list[str] | None = None
-    for line in block.splitlines():
-        m = NUMBERED.match(line)
-        if m:
-            if current is not None and current:
-                steps.append(ParsedStep(order=len(steps) + 1, action="\n".join(current).strip()))
-            current = [m.group("text")]
-        elif current is not None:
-            if line.strip() == "" and (not current or not current[-1].strip()):
-                continue
-            # blank line + new section marker? we keep merging; section markers should end the block first
-            current.append(line)
-    if current is not None and current:
-        steps.append(ParsedStep(order=len(steps) + 1, action="\n".join(current).strip()))
+    for n, ev in enumerate(items):
+        end = items[n + 1].offset - 1 if n + 1 < len(items) else block.end
+        stop = end
+        while stop > ev.vstart and text[stop - 1].isspace():
+            stop -= 1
+        steps.append(ParsedStep(order=n + 1, start=ev.vstart - base, end=end - base,
+                                line=ev.line + 1, line_end=ev.line + 1 + text.count("\n", ev.offset, stop)))
     return steps
 
 
 # Patterns like "For each site:", "For every app", "Per-server", "for each of the 10 sites",
-# "For EACH user role:". Captures the subject noun.
-FOR_EACH_RE = re.compile(
-    r"\b(?:for\s+(?:each|every)|per[- ])\s+(?:the\s+)?(?:\d+\s+)?(?P<noun>[A-Za-z][A-Za-z0-9_-]+)",
+# "For EACH user role:", and plans phrasing it as "Test EVERY page" or "check all
+# roles" — one alternation, one scan. The noun sits in a lookahead so a match
+# only consumes its lead-in: "for each check all pages" still sees "check all".
+APPLIES_TO_RE = re.compile(
+    r"\b(?:(?:for\s+(?:each|every)|per[- ])\s+(?:the\s+)?(?:\d+\s+)?"
+    r"|(?:test|verify|check)\s+(?:every|all)\s+)(?=(?P<noun>[A-Za-z][A-Za-z0-9_-]+))",
     re.IGNORECASE,
 )
-# Some plans phrase it as "Test EVERY page" or "for ALL roles"
-ALL_RE = re.compile(r"\b(?:test|verify|check)\s+(?:every|all)\s+(?P<noun>[A-Za-z][A-Za-z0-9_-]+)", re.IGNORECASE)
 NOUN_TO_KIND = {
     "site":   "app",   "sites":   "app",
     "app":    "app",   "apps":    "app",
@@ -225,22 +438,29 @@ NOUN_TO_KIND = {
 }
 
 
+HINTS_MEMO_SIZE = 4096
+_hints_memo: dict[bytes, tuple[str, ...]] = {}
+
+
 def detect_applies_to_hints(text: str) -> list[str]:
     """Look at a test's title + body and return subject 'kinds' it parametrizes over.
     Returns kind strings ('app', 'infrastructure', 'role', etc.); resolution to
     actual subject IDs happens at write time using the apps/infrastructure tables.
+    Memoized by text digest: repeated phase preambles and copy-pasted test
+    blocks are scanned once per process.
     """
-    hints: set[str] = set()
-    for rx in (FOR_EACH_RE, ALL_RE):
-        for m in rx.finditer(text):
-            noun = m.group("noun").lower()
-            kind = NOUN_TO_KIND.get(noun)
-            if kind:
-                hints.add(kind)
-    return sorted(hints)
-
-
-def extract_tests_from_phase(phase_body: str, phase_title: str) -> list[ParsedTest]:
+    key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+    hit = _hints_memo.get(key)
+    if hit is None:
+        kinds = {NOUN_TO_KIND.get(m.group("noun").lower()) for m in APPLIES_TO_RE.finditer(text)}
+        kinds.discard(None)
+        if len(_hints_memo) >= HINTS_MEMO_SIZE:
+            _hints_memo.clear()
+        hit = _hints_memo[key] = tuple(sorted(kinds))
+    return list(hit)
+
+
+def extract_tests_from_phase(phase_body: Block, phase_title: str) -> list[ParsedTest]:
     """Within a phase body, identify test groups using these markers (in order of preference):
 
       1. Lines like ``**N.M Title**`` or ``**N.M.K Title**`` (most common in the reference)
@@ -249,60 +469,61 @@ def extract_tests_from_phase(phase_body: str, phase_title: str) -> list[ParsedTe
 
     Steps under each marker are the numbered list items that follow.
     """
-    lines = phase_body.splitlines()
-
-    # First pass — find marker positions
-    markers: list[tuple[int, str]] = []  # (line_index, title)
-    for i, line in enumerate(lines):
-        m = BOLD_SECTION.match(line)
-        if m:
-            t = m.group("title").strip()
-            # Heuristic: a "test group" marker tends to look like "1.2 Title" or "Verify X"
-            # We accept any **bold** standalone line.
-            markers.append((i, t))
-            continue
-        m = H4.match(line)
-        if m:
-            markers.append((i, m.group("title").strip()))
+    text = phase_body.ledger.text
+    evs = phase_body.ledger.events
+    # Heuristic: a "test group" marker tends to look like "1.2 Title" or "Verify X".
+    # We accept any **bold** standalone line, plus #### headings.
+    markers = [i for i in range(phase_body.lo, phase_body.hi) if evs[i].kind in (TOK_BOLD, TOK_H4)]
 
     if not markers:
-        body = phase_body
+        body = phase_body.text
+        lead = phase_body.start
+        while lead < phase_body.end and text[lead].isspace():
+            lead += 1
         return [ParsedTest(
             title=phase_title, raw=body,
-            steps=extract_numbered_steps(body),
+            steps=extract_numbered_steps(phase_body, lead),
             applies_to_hints=detect_applies_to_hints(phase_title + "\n" + body),
         )]
 
+    # The lines before the first marker often say "For each site, do:" — they
+    # feed every test's hints, so scan them once per phase and merge.
+    preamble = text[phase_body.start : max(phase_body.start, evs[markers[0]].offset - 1)]
+    preamble_hints = set(detect_applies_to_hints(preamble))
+    content_end = phase_body.content_end()
+
     tests: list[ParsedTest] = []
-    for idx, (line_no, title) in enumerate(markers):
-        end = markers[idx + 1][0] if idx + 1 < len(markers) else len(lines)
-        block = "\n".join(lines[line_no + 1 : end])
-        steps = extract_numbered_steps(block)
-        # Hints come from the test's own title+block, plus the phase preamble
-        # (the lines before the first marker often say "For each site, do:")
-        preamble = "\n".join(lines[: markers[0][0]])
-        hints = detect_applies_to_hints(title + "\n" + block + "\n" + preamble)
-        tests.append(ParsedTest(title=title, raw=block, steps=steps, applies_to_hints=hints))
+    for idx, i in enumerate(markers):
+        marker = evs[i]
+        start = marker.end + 1
+        if idx + 1 < len(markers):
+            nxt = markers[idx + 1]
+            end, hi = evs[nxt].offset - 1, nxt
+        else:
+            end, hi = content_end, phase_body.hi
+        block = text[start:end] if end > start else ""
+        steps = extract_numbered_steps(phase_body.sub(start, max(start, end), i + 1, hi), start)
+        hints = sorted(preamble_hints.union(detect_applies_to_hints(marker.value + "\n" + block)))
+        tests.append(ParsedTest(title=marker.value, raw=block, steps=steps, applies_to_hints=hints))
     return tests
 
 
-def split_phase_preamble(block: str) -> tuple[str, str]:
+def split_phase_preamble(block: Block) -> tuple[str, Block]:
     """Split a phase body into (preamble_paragraphs, rest).
     Preamble = text before the first marker (bold subsection or H4) or first numbered list.
     """
-    lines = block.splitlines()
-    cut = len(lines)
-    for i, line in enumerate(lines):
-        if BOLD_SECTION.match(line) or H4.match(line) or NUMBERED.match(line):
-            cut = i
-            break
-    return "\n".join(lines[:cut]).strip(), "\n".join(lines[cut:])
+    evs = block.ledger.events
+    for i in range(block.lo, block.hi):
+        if evs[i].kind in (TOK_BOLD, TOK_H4, TOK_ITEM):
+            cut = evs[i].offset
+            return (block.ledger.text[block.start:cut].strip(),
+                    block.sub(cut, block.end, i, block.hi))
+    return block.text, block.sub(block.end, block.end, block.hi, block.hi)
 
 
-def parse_phases_section(body: str) -> list[ParsedPhase]:
+def parse_phases_section(body: Block) -> list[ParsedPhase]:
     phases: list[ParsedPhase] = []
-    h3 = split_h3_sections(body)
-    for title, block in h3:
+    for title, block in body.sections(TOK_H3):
         m = PHASE_HEADING.match(title)
         if not m:
             continue
@@ -310,10 +531,10 @@ def parse_phases_section(body: str) -> list[ParsedPhase]:
         ptitle = m.group("title").strip()
         pid = f"P{num:02d}"
         preamble, rest = split_phase_preamble(block)
-        tests = extract_tests_from_phase(rest if rest.strip() else block, ptitle)
+        tests = extract_tests_from_phase(rest if rest.content_end() > rest.start else block, ptitle)
         phases.append(ParsedPhase(
             phase_id=pid, title=ptitle, order=num,
-            raw=block, tests=tests,
+            raw=block.text, tests=tests,
         ))
         # Stash preamble in a side channel: write_phase reads phase.description below
         phases[-1].description = preamble or None
@@ -327,22 +548,111 @@ def parse_phases_section(body: str) -> list[ParsedPhase]:
 # Tag taxonomy
 # ---------------------------------------------------------------------------
 
+TAGGER_CACHE_VERSION = 1
+
+
+def _trie_regex(words: Iterable[str]) -> str:
+    """Compile keywords into one trie-shaped alternation, e.g. log(?:in(?:s)?)?.
+    At any position the match is the longest keyword starting there."""
+    trie: dict = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node: dict) -> str:
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        alt = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{alt})?" if "" in node else alt
+
+    return emit(trie)
+
+
 class Tagger:
-    def __init__(self, taxonomy: dict):
-        self.flat: list[tuple[str, str]] = []  # (tag, keyword_lower)
+    """Keyword → tag matcher compiled from tag-taxonomy.json.
+
+    All keywords go into one trie regex. A keyword occurs in the text iff it is
+    a prefix of the longest keyword match at its start position, so one scan
+    (one regex hop per match start) yields the same tags as testing every
+    keyword with ``in``.
+    """
+
+    def __init__(self, taxonomy: dict | None = None, *, compiled: dict | None = None):
+        if compiled is None:
+            compiled = self.compile(taxonomy or {})
+        self.compiled = compiled
+        self.always: set[str] = set(compiled["always"])
+        self.prefix_tags: dict[str, frozenset[str]] = {
+            kw: frozenset(tags) for kw, tags in compiled["prefix_tags"].items()
+        }
+        self.all_tags: frozenset[str] = frozenset().union(self.always, *self.prefix_tags.values())
+        self.rx = re.compile(compiled["pattern"]) if compiled["pattern"] else None
+        self.fingerprint = content_hash(compiled["pattern"], compiled["prefix_tags"], compiled["always"])
+
+    @staticmethod
+    def compile(taxonomy: dict) -> dict:
+        by_kw: dict[str, set[str]] = {}
         for group, mapping in taxonomy.get("auto_tags", {}).items():
             if not isinstance(mapping, dict):
                 continue
             for tag, keywords in mapping.items():
                 for kw in keywords:
-                    self.flat.append((tag, kw.lower()))
+                    by_kw.setdefault(kw.lower(), set()).add(tag)
+        always = sorted(by_kw.pop("", set()))  # "" is in every string
+        prefix_tags: dict[str, list[str]] = {}
+        for kw in by_kw:
+            tags: set[str] = set()
+            for i in range(1, len(kw) + 1):
+                tags |= by_kw.get(kw[:i], set())
+            prefix_tags[kw] = sorted(tags)
+        return {
+            "version": TAGGER_CACHE_VERSION,
+            "pattern": _trie_regex(by_kw),
+            "prefix_tags": prefix_tags,
+            "always": always,
+        }
+
+    @classmethod
+    def load(cls, taxonomy_path: str | Path, cache_dir: Path | None = None) -> "Tagger":
+        """Build from a taxonomy file, reusing ``cache_dir/tagger-<sha>.json``
+        when the file's content hash has been compiled before."""
+        raw = Path(taxonomy_path).read_bytes()
+        cache = None
+        if cache_dir is not None:
+            cache = cache_dir / f"tagger-{hashlib.sha256(raw).hexdigest()[:16]}.json"
+            try:
+                compiled = json.loads(cache.read_text(encoding="utf-8"))
+                if compiled.get("version") == TAGGER_CACHE_VERSION:
+                    return cls(compiled=compiled)
+            except (OSError, ValueError):
+                pass
+        tagger = cls(json.loads(raw))
+        if cache is not None:
+            try:
+                cache_dir.mkdir(parents=True, exist_ok=True)
+                tmp = cache.with_suffix(".tmp")
+                tmp.write_text(json.dumps(tagger.compiled), encoding="utf-8")
+                os.replace(tmp, cache)
+            except OSError:
+                pass  # cache is best-effort
+        return tagger
 
     def for_text(self, *texts: str) -> set[str]:
         joined = " ".join(t for t in texts if t).lower()
-        out: set[str] = set()
-        for tag, kw in self.flat:
-            if kw in joined:
-                out.add(tag)
+        out = set(self.always)
+        if self.rx is None:
+            return out
+        search = self.rx.search
+        prefix_tags = self.prefix_tags
+        m = search(joined, 0)
+        while m:
+            out |= prefix_tags[m.group()]
+            if len(out) == len(self.all_tags):
+                break
+            m = search(joined, m.start() + 1)
         return out
 
 
@@ -359,21 +669,23 @@ def infer_enforcement(text: str) -> str:
     return "advisory"
 
 
-def parse_directives(body: str) -> list[dict]:
+def parse_directives(body: Block) -> list[dict]:
     out: list[dict] = []
-    for title, block in split_h3_sections(body):
-        if not block.strip():
+    for title, sub in body.sections(TOK_H3):
+        block = sub.text
+        if not block:
             continue
         out.append({
             "title": title,
-            "body": block.strip(),
+            "body": block,
             "category": slugify(title),
             "enforcement": infer_enforcement(block + " " + title),
         })
-    if not out and body.strip():
+    text = body.text
+    if not out and text:
         # fall back: one big directive
-        out.append({"title": "Directives", "body": body.strip(), "category": "general",
-                    "enforcement": infer_enforcement(body)})
+        out.append({"title": "Directives", "body": text, "category": "general",
+                    "enforcement": infer_enforcement(text)})
     return out
 
 
@@ -394,6 +706,78 @@ INFRA_KIND_HINTS = [
 ]
 
 
+# ---------------------------------------------------------------------------
+# Credential detectors
+# ---------------------------------------------------------------------------
+#
+# Secret formats recognized anywhere in an infrastructure / app matrix block,
+# whether or not they sit on a **key**: value bullet. Every detector is one
+# alternative of a single compiled regex, so a block is scanned once however
+# many formats are registered. To add one, append to CREDENTIAL_DETECTORS.
+
+
+class CredentialDetector(NamedTuple):
+    name: str                 # used in the credential's name: "<block>-<name>[-N]"
+    kind: str                 # credentials.kind
+    pattern: str              # no capturing groups; brings its own boundaries
+    provider: str | None = None
+    # (word, provider): the word on the token's line or in the block heading
+    # names the provider more precisely (e.g. a JWT next to "Forge").
+    context: tuple[tuple[str, str], ...] = ()
+    unique: bool = False      # at most one per block: no "-N" suffix
+
+
+class CredentialCandidate(NamedTuple):
+    detector: CredentialDetector
+    rank: int                 # the detector's position in the registry
+    value: str
+    start: int                # offsets into the scanned text
+    end: int
+    provider: str | None
+
+
+CREDENTIAL_DETECTORS = [
+    CredentialDetector("pat", "pat", r"\b(?:ghp_|github_pat_)[A-Za-z0-9_]{20,}\b"),
+    CredentialDetector("do-token", "api-token", r"\bdop_v1_[a-f0-9]{40,}\b", "digitalocean", unique=True),
+    CredentialDetector("aws-key", "api-token", r"\b(?:AKIA|ASIA)[A-Z0-9]{16}\b", "aws"),
+    CredentialDetector("stripe-key", "api-token", r"\b(?:sk|rk)_(?:live|test)_[A-Za-z0-9]{16,}\b", "stripe"),
+    CredentialDetector("jwt", "api-token",
+                       r"\beyJ[A-Za-z0-9_-]{10,}\.eyJ[A-Za-z0-9_-]{10,}\.[A-Za-z0-9_-]{10,}(?![A-Za-z0-9_-])",
+                       "jwt", context=(("forge", "forge"),)),
+]
+
+
+class CredentialScanner:
+    """All detectors compiled into one alternation; ``scan`` reads a text
+    range once and returns typed candidates in document order."""
+
+    def __init__(self, detectors: list[CredentialDetector]):
+        for d in detectors:
+            if re.compile(d.pattern).groups:
+                raise ValueError(f"credential detector {d.name!r}: pattern must not capture")
+        self.detectors = list(detectors)
+        self.regex = re.compile("|".join(f"(?P<d{i}>{d.pattern})" for i, d in enumerate(self.detectors)))
+
+    def scan(self, text: str, pos: int = 0, endpos: int | None = None,
+             heading: str = "") -> list[CredentialCandidate]:
+        out: list[CredentialCandidate] = []
+        heading = heading.lower()
+        for m in self.regex.finditer(text, pos, len(text) if endpos is None else endpos):
+            rank = int(m.lastgroup[1:])
+            d = self.detectors[rank]
+            provider = d.provider
+            if d.context:
+                line_start = text.rfind("\n", 0, m.start()) + 1
+                line_end = text.find("\n", m.end())
+                where = text[line_start:len(text) if line_end < 0 else line_end].lower()
+                provider = next((p for word, p in d.context if word in where or word in heading), provider)
+            out.append(CredentialCandidate(d, rank, m.group(), m.start(), m.end(), provider))
+        return out
+
+
+CREDENTIAL_SCANNER = CredentialScanner(CREDENTIAL_DETECTORS)
+
+
 def detect_infra_kind(heading: str) -> str:
     h = heading.lower()
     for needle, kind in INFRA_KIND_HINTS:
@@ -402,33 +786,31 @@ def detect_infra_kind(heading: str) -> str:
     return "other"
 
 
-def parse_infra_and_credentials(body: str) -> tuple[list[dict], list[dict]]:
+def parse_infra_and_credentials(body: Block) -> tuple[list[dict], list[dict]]:
     """Returns (infrastructure, credentials).
 
     Each ### subsection may yield: 0 or 1 infrastructure entries + 0..N credentials.
     The textual rules are pragmatic — we look for **IP**, **SSH**, **password**,
     **token**, **URL**, **wildcard domain** style bullet keys, and also scan the
-    raw text for known credential patterns (ghp_*, dop_v1_*).
+    raw text for known credential formats (CREDENTIAL_DETECTORS).
     """
     infra: list[dict] = []
     creds: list[dict] = []
+    text = body.ledger.text
 
-    for heading, block in split_h3_sections(body):
-        kv = parse_kv_bullets(block)
+    for heading, sub in body.sections(TOK_H3):
+        kv = parse_kv_bullets(sub)
 
-        # Pattern-matched credentials (work even if parse_kv_bullets fails on the line)
-        for m in PAT_RE.finditer(block):
+        # Pattern-matched credentials (work even if parse_kv_bullets fails on
+        # the line), written detector by detector in registry order.
+        found = CREDENTIAL_SCANNER.scan(text, sub.start, sub.end, heading)
+        for c in sorted(found, key=lambda c: c.rank):
+            d = c.detector
             creds.append({
-                "name": f"{slugify(heading)}-pat-{len(creds)+1}",
-                "kind": "pat",
-                "fields": json.dumps({"token": m.group(1)}),
-                "notes": heading,
-            })
-        for m in DO_TOKEN_RE.finditer(block):
-            creds.append({
-                "name": f"{slugify(heading)}-do-token",
-                "kind": "api-token",
-                "fields": json.dumps({"provider": "digitalocean", "token": m.group(1)}),
+                "name": f"{slugify(heading)}-{d.name}" if d.unique else f"{slugify(heading)}-{d.name}-{len(creds)+1}",
+                "kind": d.kind,
+                "fields": json.dumps({"provider": c.provider, "token": c.value} if c.provider
+                                     else {"token": c.value}),
                 "notes": heading,
             })
 
@@ -483,7 +865,7 @@ def parse_infra_and_credentials(body: str) -> tuple[list[dict], list[dict]]:
                 "name": heading,
                 "kind": detect_infra_kind(heading),
                 "ip": kv.get("ip"),
-                "ssh_port": int(kv.get("ssh port", "22") or 22) if (kv.get("ssh port", "22") or "22").isdigit() else 22,
+                "ssh_port": int(m.group()) if (m := re.match(r"\d+", kv.get("ssh port") or "")) else 22,
                 "wildcard_domain": kv.get("wildcard domain"),
                 "wireguard_ip": kv.get("wireguard ip"),
                 "metadata": json.dumps(metadata),
@@ -499,7 +881,7 @@ def parse_infra_and_credentials(body: str) -> tuple[list[dict], list[dict]]:
 SERVICE_KEYS = ["db", "redis", "horizon", "reverb", "scheduler", "s3"]
 
 
-def parse_app_matrix(body: str) -> list[dict]:
+def parse_app_matrix(body: Block) -> list[dict]:
     rows = parse_table(body)
     if not rows:
         return []
@@ -580,22 +962,38 @@ def extract_bugs_from_run_block(run_id: str, block: str) -> list[dict]:
     return bugs
 
 
-def parse_results_log(body: str) -> tuple[list[dict], list[dict], list[dict]]:
+def parse_results_log(body: Block) -> tuple[list[dict], list[dict], list[dict]]:
     """Returns (runs, memories, bugs)."""
     runs: list[dict] = []
     memories: list[dict] = []
     bugs: list[dict] = []
-    for heading, block in split_h3_sections(body):
+    for _, r, m, b in iter_results_log(body):
+        runs += r
+        memories += m
+        bugs += b
+    return runs, memories, bugs
+
+
+def iter_results_log(body: Block) -> Iterator[tuple[int, list[dict], list[dict], list[dict]]]:
+    """Yield ``(end_offset, runs, memories, bugs)`` for one ### block at a
+    time, so a multi-year log is written (and committed) as it is parsed.
+    ``end_offset`` is where the block ends in ``body.ledger.text``."""
+    for heading, sub in body.sections(TOK_H3):
+        runs: list[dict] = []
+        memories: list[dict] = []
+        bugs: list[dict] = []
+        block = sub.text
         m = RESULTS_LOG_HEADING.match(heading.replace("—", "-").replace("–", "-"))
         if not m:
             memories.append({
                 "title": heading[:200],
                 "kind": "lesson-learned",
-                "body": block.strip(),
+                "body": block,
                 "why_important": "Historical reference",
                 "importance": 3,
                 "tags": json.dumps(["historical"]),
             })
+            yield sub.end, runs, memories, bugs
             continue
         date = m.group("date")
         run_label = (m.group("run") or "").strip()
@@ -608,7 +1006,7 @@ def parse_results_log(body: str) -> tuple[list[dict], list[dict], list[dict]]:
             "ended_at":   f"{date}T23:59:59Z",
             "status": "completed",
             "context": heading,
-            "final_state": block.strip(),
+            "final_state": block,
         })
         # Extract structured bugs into the bugs table
         for b in extract_bugs_from_run_block(run_id, block):
@@ -618,69 +1016,514 @@ def parse_results_log(body: str) -> tuple[list[dict], list[dict], list[dict]]:
             memories.append({
                 "title": f"{run_id} — bugs noted",
                 "kind": "bug-pattern",
-                "body": block.strip(),
+                "body": block,
                 "why_important": "Bugs reported in this round",
                 "importance": 4,
                 "tags": json.dumps([run_id.lower(), "historical-bugs"]),
             })
-    return runs, memories, bugs
+        yield sub.end, runs, memories, bugs
 
 
 # ---------------------------------------------------------------------------
 # DB writers
 # ---------------------------------------------------------------------------
 
+class SubjectRegistry:
+    """Subject IDs that ``tests.applies_to`` may reference — apps,
+    infrastructure, sites and roles, the same union as ``v_subjects_resolved``.
+
+    Loaded with one query per table at the start of an import. The Writer
+    patches in apps/infrastructure rows as it buffers them; each patch drops
+    the memoized hint resolutions, which are otherwise shared by every test
+    with the same hints (one list and one JSON string per hint combination).
+    """
+
+    TABLES = ("apps", "infrastructure", "sites", "roles")
+
+    def __init__(self, conn: sqlite3.Connection | None):
+        self.by_name: dict[str, dict[str, str]] = {"apps": {}, "infrastructure": {}}
+        self.ids: dict[str, set[str]] = {t: set() for t in self.TABLES}
+        if conn:
+            for table in ("apps", "infrastructure"):
+                for sid, name in conn.execute(f"SELECT id, name FROM {table}"):
+                    self.by_name[table][name] = sid
+                    self.ids[table].add(sid)
+            self.ids["sites"] = {r[0] for r in conn.execute("SELECT id FROM sites")}
+            self.ids["roles"] = {r[0] for r in conn.execute("SELECT id FROM roles")}
+        self.known: set[str] = set().union(*self.ids.values())
+        self._sorted: dict[str, list[str]] = {}
+        self._fingerprint: str | None = None
+        self._resolved: dict[tuple[str, ...], tuple[list[str], str, list[str]]] = {}
+
+    def add(self, table: str, name: str, sid: str):
+        self.by_name[table][name] = sid
+        self.ids[table].add(sid)
+        self.known.add(sid)
+        self._sorted.pop(table, None)
+        self._fingerprint = None
+        self._resolved.clear()
+
+    def sorted_ids(self, table: str) -> list[str]:
+        ids = self._sorted.get(table)
+        if ids is None:
+            ids = self._sorted[table] = sorted(self.ids[table])
+        return ids
+
+    def fingerprint(self) -> str:
+        """Hash of the app and infrastructure IDs hints can expand to; part of
+        every phase hash, so it is computed once rather than per phase."""
+        if self._fingerprint is None:
+            self._fingerprint = content_hash(self.sorted_ids("apps"), self.sorted_ids("infrastructure"))
+        return self._fingerprint
+
+    def resolve(self, hints: list[str]) -> tuple[list[str], str, list[str]]:
+        """(subject ids, their JSON array, ids the applies_to trigger would reject).
+        The returned objects are shared — callers must not mutate them."""
+        key = tuple(hints)
+        hit = self._resolved.get(key)
+        if hit is None:
+            ids: list[str] = []
+            for kind in hints:
+                if kind == "app":
+                    ids.extend(self.sorted_ids("apps"))
+                elif kind == "infrastructure":
+                    ids.extend(self.sorted_ids("infrastructure"))
+                elif kind == "role":
+                    # Synthetic — user populates real role IDs later via /plan update-test.
+                    ids.extend(["ROLE-admin", "ROLE-user", "ROLE-guest"])
+                elif kind == "viewport":
+                    ids.extend(["VP-desktop", "VP-tablet", "VP-mobile"])
+                # 'page' / 'tab' aren't first-class tables; leave the test
+                # un-parametrized but tagged so /plan can suggest it later.
+            # Same rule as trg_tests_applies_to_validate_*: known id, or LIKE 'VP-%'.
+            unknown = [sid for sid in ids if sid not in self.known and sid[:3].upper() != "VP-"]
+            hit = self._resolved[key] = (ids, json.dumps(ids), unknown)
+        return hit
+
+
+# Row-level applies_to validation; suspended while the Writer bulk-loads tests
+# it has already validated through SubjectRegistry.
+APPLIES_TO_TRIGGERS = ("trg_tests_applies_to_validate_insert", "trg_tests_applies_to_validate_update")
+# Writer statements that never set a foreign key column: in-place updates of
+# other columns and deletes. A deferred FK check skips them.
+FK_NEUTRAL = ("phase_counts", "step_trim", "step_lines", "tag_trim", "deprecations", "phase_rehash")
+# Per-row FTS maintenance; a large memories batch rebuilds the index once instead.
+MEMORIES_FTS_TRIGGERS = ("memories_ai",)
+# Import connection only (PRAGMAs are per-connection): WAL makes NORMAL
+# crash-safe, and a bigger page cache keeps index pages from spilling mid-load.
+BULK_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -65536",
+    "PRAGMA temp_store = MEMORY",
+)
+
+# deprecated_reason for tests that vanished from the ledger (--deprecate-missing).
+# A later import that finds the test again un-deprecates it.
+REMOVED_REASON = "removed from ledger"
+# Bump when import semantics change so every phase is re-hashed and rewritten.
+HASH_VERSION = 1
+
+
+def sqlar_uncompress(data: bytes | None, size: int | None) -> bytes | None:
+    """Python twin of the sqlite3 shell function v_memory_body uses."""
+    if data is None or len(data) == size:
+        return data
+    return zlib.decompress(data)
+
+
 class Writer:
-    def __init__(self, db_path: str, dry: bool = False):
+    """Bulk loader: rows are buffered per table and written by ``flush()`` with
+    one ``executemany`` per table inside a single transaction.
+
+    ID high-water marks are read once per prefix and then allocated in memory,
+    so an import costs O(rows) rather than one ``MAX(id)`` scan per insert.
+    ``--dry-run`` runs the exact same code — it reads the database (if any)
+    read-only and simply never flushes — so both modes report the same counts.
+
+    Phases and tests carry a ``content_hash``. A phase whose hash matches the
+    stored one is skipped outright; inside a changed phase only tests whose own
+    hash moved are rewritten. ``changes`` tallies added/changed/unchanged/removed.
+    """
+
+    # Flush order respects foreign keys and the applies_to trigger
+    # (apps/infrastructure must exist before tests reference them).
+    INSERTS = {
+        "text_blobs": "INSERT OR IGNORE INTO text_blobs (hash,size,data) VALUES (?,?,?)",
+        "directives": "INSERT INTO directives (id,title,body,category,enforcement,active,source) VALUES (?,?,?,?,?,1,?)",
+        "credentials": "INSERT INTO credentials (id,name,kind,fields,notes) VALUES (?,?,?,?,?)",
+        "infrastructure": """INSERT INTO infrastructure
+               (id,name,kind,ip,ssh_port,wildcard_domain,wireguard_ip,credential_id,metadata)
+               VALUES (?,?,?,?,?,?,?,?,?)""",
+        "apps": "INSERT INTO apps (id,name,app_type,description,services) VALUES (?,?,?,?,?)",
+        # Upserts, not INSERT OR REPLACE: a REPLACE deletes the row first, which
+        # cascades to hand-curated columns/tags and trips step_executions' FK.
+        "phases": """INSERT INTO phases
+               (id,title,description,phase_order,raw_markdown,raw_blob,content_hash) VALUES (?,?,?,?,?,?,?)
+               ON CONFLICT(id) DO UPDATE SET
+                   title=excluded.title, description=excluded.description,
+                   phase_order=excluded.phase_order, raw_markdown=excluded.raw_markdown, raw_blob=excluded.raw_blob,
+                   content_hash=excluded.content_hash, updated_at=datetime('now')""",
+        "phase_counts": "UPDATE phases SET expected_test_count = ? WHERE id = ?",
+        "tests": f"""INSERT INTO tests
+                   (id,phase_id,title,test_order,raw_markdown,raw_blob,test_kind,is_critical,applies_to,content_hash)
+                   VALUES (?,?,?,?,?,?,?,1,?,?)
+                   ON CONFLICT(id) DO UPDATE SET
+                       phase_id=excluded.phase_id, title=excluded.title, test_order=excluded.test_order,
+                       raw_markdown=excluded.raw_markdown, raw_blob=excluded.raw_blob,
+                       test_kind=excluded.test_kind, applies_to=excluded.applies_to,
+                       content_hash=excluded.content_hash, updated_at=datetime('now'),
+                       deprecated_at=CASE WHEN deprecated_reason='{REMOVED_REASON}' THEN NULL ELSE deprecated_at END,
+                       deprecated_reason=NULLIF(deprecated_reason,'{REMOVED_REASON}')""",
+        # Steps past the new end of a rewritten test; executed steps stay as history.
+        "step_trim": """DELETE FROM test_steps WHERE test_id = ? AND step_order > ?
+                          AND NOT EXISTS (SELECT 1 FROM step_executions e WHERE e.step_id = test_steps.id)""",
+        "test_steps": """INSERT INTO test_steps
+                       (id,test_id,step_order,action,action_template,source_line,source_line_end)
+                       VALUES (?,?,?,?,?,?,?)
+                       ON CONFLICT(id) DO UPDATE SET
+                           step_order=excluded.step_order, action=excluded.action,
+                           action_template=excluded.action_template,
+                           source_line=excluded.source_line, source_line_end=excluded.source_line_end""",
+        # Unchanged steps whose text moved in the ledger (lines are not hashed).
+        "step_lines": "UPDATE test_steps SET source_line = ?, source_line_end = ? WHERE id = ?",
+        "tags": "INSERT OR IGNORE INTO tags (name,auto) VALUES (?,1)",
+        # A rewritten test loses the tag links the importer made that the ledger
+        # no longer produces (the JSON array is its new tag set). Links added
+        # by hand are auto = 0 and kept, whatever the tag's name.
+        "tag_trim": """DELETE FROM test_tags WHERE test_id = ? AND auto = 1
+                        AND tag_name NOT IN (SELECT value FROM json_each(?))""",
+        "test_tags": "INSERT OR IGNORE INTO test_tags (test_id,tag_name,auto) VALUES (?,?,1)",
+        "deprecations": f"""UPDATE tests SET deprecated_at=datetime('now'),
+                       deprecated_reason='{REMOVED_REASON}', content_hash=NULL WHERE id = ?""",
+        # ...and forget the parent phase's hash so the test is restored if it reappears.
+        "phase_rehash": "UPDATE phases SET content_hash = NULL WHERE id = (SELECT phase_id FROM tests WHERE id = ?)",
+        "test_runs": """INSERT OR REPLACE INTO test_runs
+               (id,label,started_at,ended_at,status,context,final_state,final_state_blob) VALUES (?,?,?,?,?,?,?,?)""",
+        "bugs": """INSERT INTO bugs
+               (id, discovered_in_run, severity, title, description, status)
+               VALUES (?,?,?,?,?,?)""",
+        "memories": """INSERT INTO memories (id,title,kind,body,body_blob,why_important,importance,tags)
+               VALUES (?,?,?,?,?,?,?,?)""",
+    }
+
+    def __init__(self, db_path: str, dry: bool = False, profiler: Profiler | None = None):
         self.dry = dry
+        self.profiler = profiler
         if not dry:
             self.conn = sqlite3.connect(db_path)
             self.conn.execute("PRAGMA foreign_keys = ON;")
+            # v_memory_body (memories_fts content) decodes text_blobs.
+            self.conn.create_function("sqlar_uncompress", 2, sqlar_uncompress, deterministic=True)
+            for pragma in BULK_PRAGMAS:
+                self.conn.execute(pragma)
+        elif Path(db_path).exists():
+            # Read-only: dry-run sees the same existing IDs/names a real run would.
+            self.conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
         else:
             self.conn = None
-
-    def _exec(self, sql: str, params: tuple = ()):
+        if profiler and self.conn:
+            self.conn = profiler.connection(self.conn)
+        self._seq: dict[tuple[str, str], int] = {}
+        self._names: dict[str, dict[str, str]] = {"credentials": {}}
+        self.subjects = SubjectRegistry(self.conn)
+        self._names.update(self.subjects.by_name)
+        self.invalid_subjects: list[tuple[str, list[str]]] = []
+        self.pending: dict[str, list[tuple]] = {t: [] for t in self.INSERTS}
+        # Phase-scoped rows, keyed by phase id: re-writing a phase within one
+        # import drops its earlier tests, as INSERT OR REPLACE's cascade would.
+        self._phases: dict[str, dict[str, list[tuple]]] = {}
+        # Tag names are interned; ``_tags`` holds the ones not yet in the
+        # tags table, so each distinct tag is upserted once per import.
+        self._tags: dict[str, None] = {}
+        self._known_tags: set[str] | None = None
+        self._blobs: set[bytes] = set()
+        self._stored: tuple[dict[str, str | None], dict[str, str | None], set[str]] | None = None
+        self._step_lines: dict[str, tuple[int | None, int | None]] | None = None
+        self._seen_phases: set[str] = set()
+        self._seen_tests: set[str] = set()
+        self.changes = {kind: dict.fromkeys(("added", "changed", "unchanged", "removed"), 0)
+                        for kind in ("phases", "tests")}
+
+    def flush(self):
+        """Write every buffered row. Runs inside the connection's open
+        transaction; ``commit()`` ends it. No-op for dry runs."""
         if self.dry or not self.conn:
             return
-        self.conn.execute(sql, params)
+        for pid, rows in self._phases.items():
+            for table, batch in rows.items():
+                self.pending[table].extend(batch)
+        self._phases.clear()
+        if self._tags:
+            self.pending["tags"].extend((t,) for t in self._tags)
+            self._known_tags.update(self._tags)
+            self._tags.clear()
+        if self.invalid_subjects:
+            raise ValueError("refusing to flush tests with unknown applies_to subjects")
+        loaded = [t for t, rows in self.pending.items() if rows]
+        if not loaded:
+            return
+        unchecked = self._defer_foreign_keys()
+        written: dict[str, set[tuple]] = {}
+        for table in loaded:
+            sql, rows = self.INSERTS[table], self.pending[table]
+            if table == "tests":
+                with self._suspended_triggers(APPLIES_TO_TRIGGERS):
+                    cur = self.conn.executemany(sql, rows)
+                self._check_applies_to([r[0] for r in rows])
+            elif table == "memories" and self._rebuild_fts(len(rows)):
+                with self._suspended_triggers(MEMORIES_FTS_TRIGGERS):
+                    cur = self.conn.executemany(sql, rows)
+                self.conn.execute("INSERT INTO memories_fts(memories_fts) VALUES('rebuild')")
+            elif table == "memories":
+                cur = self.conn.executemany(sql, rows)
+                self._index_blob_memories([r[0] for r in rows if r[4] is not None])
+            else:
+                cur = self.conn.executemany(sql, rows)
+            if self.profiler:
+                self.profiler.count_rows(table, cur.rowcount)
+            if unchecked and table not in FK_NEUTRAL:
+                n = len(self.ROW_KEYS.get(table, ("id",)))
+                written[table] = {r[:n] for r in rows}
+            rows.clear()
+        if unchecked:
+            self._check_foreign_keys(written)
+
+    def _defer_foreign_keys(self) -> bool:
+        """Switch per-row FK enforcement off for a load that only inserts and
+        updates in place; ``_check_foreign_keys`` then verifies the result in
+        one pass per table. Deletes keep enforcement on because they rely on
+        ON DELETE actions: trimmed steps, and INSERT OR REPLACE of a run that
+        already exists. The pragma is a no-op inside a transaction, so only
+        the first flush of a transaction can take this path."""
+        if self.conn.in_transaction or self.pending["step_trim"]:
+            return False
+        runs = [r[0] for r in self.pending["test_runs"]]
+        if runs and self.conn.execute(
+            "SELECT 1 FROM test_runs WHERE id IN (SELECT value FROM json_each(?)) LIMIT 1",
+            (json.dumps(runs),),
+        ).fetchone():
+            return False
+        self.conn.execute("PRAGMA foreign_keys = OFF")
+        return True
+
+    # Columns naming a written row (the leading values of its INSERTS tuple).
+    ROW_KEYS = {"tags": ("name",), "test_tags": ("test_id", "tag_name")}
+
+    def _check_foreign_keys(self, written: dict[str, set[tuple]]):
+        """One foreign_key_check pass per table loaded, failing only on rows
+        this load wrote. A violation the database already had (say, a
+        hand-deleted app a test still references) is not the import's to fix."""
+        for table, keys in written.items():
+            bad = self.conn.execute(f"PRAGMA foreign_key_check({table})").fetchall()
+            if not bad:
+                continue
+            cols = ",".join(self.ROW_KEYS.get(table, ("id",)))
+            rowids = json.dumps(sorted({rowid for _, rowid, _, _ in bad}))
+            ours = {rowid for rowid, *key in self.conn.execute(
+                f"SELECT rowid, {cols} FROM {table} WHERE rowid IN (SELECT value FROM json_each(?))", (rowids,))
+                if tuple(key) in keys}
+            bad = [v for v in bad if v[1] in ours]
+            if bad:
+                child, rowid, parent, _ = bad[0]
+                raise ValueError(f"{len(bad)} {child} row(s) reference missing {parent} rows "
+                                 f"(first: {child} rowid {rowid})")
+
+    def _check_applies_to(self, test_ids: list[str]):
+        """Set-based equivalent of trg_tests_applies_to_validate_*, run once
+        over the tests just written while those triggers were suspended."""
+        # Tests share a handful of distinct applies_to arrays; expand those only.
+        bad = self.conn.execute("""
+            SELECT DISTINCT j.value
+              FROM (SELECT DISTINCT applies_to FROM tests
+                     WHERE id IN (SELECT value FROM json_each(?))) t,
+                   json_each(t.applies_to) j
+             WHERE j.value NOT LIKE 'VP-%'
+               AND j.value NOT IN (SELECT id FROM v_subjects_resolved)
+        """, (json.dumps(test_ids),)).fetchall()
+        if bad:
+            raise ValueError("tests.applies_to references unknown subject ids: "
+                             + ", ".join(sid for (sid,) in bad[:20]))
+
+    def _index_blob_memories(self, memory_ids: list[str]):
+        """memories_ai indexes inline bodies only (it must not depend on
+        sqlar_uncompress()); add the ones just stored in text_blobs."""
+        if memory_ids:
+            self.conn.execute("""
+                INSERT INTO memories_fts(rowid, title, body, tags)
+                SELECT rowid, title, body, tags FROM v_memory_body
+                 WHERE id IN (SELECT value FROM json_each(?))
+            """, (json.dumps(memory_ids),))
+
+    def _rebuild_fts(self, n: int) -> bool:
+        """Rebuilding memories_fts reads every memory, so it only beats the
+        per-row trigger when the batch is at least as large as the table."""
+        return n >= self.conn.execute("SELECT COUNT(*) FROM memories").fetchone()[0]
+
+    @contextmanager
+    def _suspended_triggers(self, names: tuple[str, ...]):
+        """Drop the named triggers for the duration of the block and recreate
+        them verbatim. DDL is transactional in SQLite, so other connections
+        never observe the gap and a failed import restores them on rollback."""
+        saved = self.conn.execute(
+            f"SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name IN ({','.join('?' * len(names))})",
+            names,
+        ).fetchall()
+        if not self.conn.in_transaction:
+            self.conn.execute("BEGIN")
+        for name in names:
+            self.conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+        try:
+            yield
+        finally:
+            for (sql,) in saved:
+                self.conn.execute(sql)
 
     def commit(self):
         if self.conn:
+            self.flush()
             self.conn.commit()
+            if not self.dry:
+                self.conn.execute("PRAGMA foreign_keys = ON")
+
+    # The newest column each table the importer writes gained.
+    REQUIRED_COLUMNS = {"tests": "raw_blob", "test_runs": "final_state_blob", "state": "import_cursor",
+                        "test_steps": "source_line", "memories": "body_blob", "test_tags": "auto"}
+
+    def schema_supported(self) -> bool:
+        """False on a pre-v1.11 database (no text blobs / import cursor /
+        step lines / memory body blobs / tag link provenance)."""
+        if not self.conn:
+            return True
+        return all(col in {r[1] for r in self.conn.execute(f"PRAGMA table_info({table})")}
+                   for table, col in self.REQUIRED_COLUMNS.items())
+
+    def store_text(self, text: str | None) -> tuple[str | None, bytes | None]:
+        """``(inline text, text_blobs hash)`` for a markdown column, one of
+        them None. Text goes to text_blobs — once per distinct text, zlib
+        compressed — when compression saves more than the two digests it
+        costs (row reference + blob key); short text stays inline."""
+        if text is None or self.dry:
+            return text, None
+        raw = text.encode("utf-8")
+        key = hashlib.sha3_256(raw).digest()
+        if key in self._blobs:
+            return None, key
+        packed = zlib.compress(raw)
+        if len(packed) + 2 * len(key) >= len(raw):
+            return text, None
+        self._blobs.add(key)
+        self.pending["text_blobs"].append((key, len(raw), packed))
+        return None, key
+
+    def prune_blobs(self) -> int:
+        """Delete text blobs no phase, test, run or memory references any more
+        (rewritten or removed rows leave their old text behind)."""
+        if self.dry or not self.conn:
+            return 0
+        self.flush()
+        return self.conn.execute("""
+            DELETE FROM text_blobs WHERE hash NOT IN (
+                SELECT raw_blob FROM phases WHERE raw_blob IS NOT NULL
+                UNION ALL SELECT raw_blob FROM tests WHERE raw_blob IS NOT NULL
+                UNION ALL SELECT final_state_blob FROM test_runs WHERE final_state_blob IS NOT NULL
+                UNION ALL SELECT body_blob FROM memories WHERE body_blob IS NOT NULL)
+        """).rowcount
+
+    def stored_cursor(self) -> dict | None:
+        """The resume cursor an interrupted chunked import left in ``state``."""
+        if not self.conn:
+            return None
+        row = self.conn.execute("SELECT import_cursor FROM state WHERE id = 1").fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+
+    def save_cursor(self, cursor: dict | None):
+        """Record (or clear) the resume cursor inside the open transaction, so
+        it commits atomically with the rows it describes."""
+        if self.dry or not self.conn:
+            return
+        self.conn.execute("UPDATE state SET import_cursor = ?, last_update = datetime('now') WHERE id = 1",
+                          (json.dumps(cursor) if cursor else None,))
+
+    def checkpoint(self, cursor: dict) -> bool:
+        """Flush, record ``cursor`` and commit, so everything before it
+        survives a crash or Ctrl-C. Skipped for dry runs and while tests with
+        unknown subjects are buffered (that import fails as a whole)."""
+        if self.dry or not self.conn or self.invalid_subjects:
+            return False
+        self.flush()
+        self.save_cursor(cursor)
+        self.commit()
+        return True
+
+    def _stored_hashes(self) -> tuple[dict[str, str | None], dict[str, str | None], set[str]]:
+        """(phase id → hash, test id → hash, active test ids), read once."""
+        if self._stored is None:
+            phases: dict[str, str | None] = {}
+            tests: dict[str, str | None] = {}
+            active: set[str] = set()
+            if self.conn:
+                phases = dict(self.conn.execute("SELECT id, content_hash FROM phases"))
+                for tid, h, live in self.conn.execute(
+                        "SELECT id, content_hash, deprecated_at IS NULL FROM tests"):
+                    tests[tid] = h
+                    if live:
+                        active.add(tid)
+            self._stored = (phases, tests, active)
+        return self._stored
+
+    def _moved_steps(self, tid: str, steps: list[ParsedStep]) -> list[tuple]:
+        """``step_lines`` rows for an unchanged test whose steps now sit on
+        other ledger lines. Stored lines are read once per import."""
+        if self._step_lines is None:
+            self._step_lines = {sid: (a, b) for sid, a, b in self.conn.execute(
+                "SELECT id, source_line, source_line_end FROM test_steps")} if self.conn else {}
+        moved = []
+        for s in steps:
+            sid = f"S-{tid[2:]}.{s.order:03d}"
+            if self._step_lines.get(sid, (s.line, s.line_end)) != (s.line, s.line_end):
+                moved.append((s.line, s.line_end, sid))
+        return moved
 
     def next_id(self, table: str, prefix: str) -> str:
-        if self.dry or not self.conn:
-            n = getattr(self, f"_dry_{table}_{prefix}", 0) + 1
-            setattr(self, f"_dry_{table}_{prefix}", n)
-            return f"{prefix}-{n:03d}"
-        cur = self.conn.execute(
-            f"SELECT COALESCE(MAX(CAST(SUBSTR(id, ?+2) AS INTEGER)), 0)+1 FROM {table} WHERE id LIKE ?;",
-            (len(prefix), f"{prefix}-%"),
-        )
-        n = cur.fetchone()[0]
+        key = (table, prefix)
+        n = self._seq.get(key)
+        if n is None:
+            n = 0
+            if self.conn:
+                n = self.conn.execute(
+                    f"SELECT COALESCE(MAX(CAST(SUBSTR(id, ?+2) AS INTEGER)), 0) FROM {table} WHERE id LIKE ?;",
+                    (len(prefix), f"{prefix}-%"),
+                ).fetchone()[0]
+        n += 1
+        self._seq[key] = n
         return f"{prefix}-{n:03d}"
 
+    def _existing_id(self, table: str, name: str) -> str | None:
+        """ID of the row with this UNIQUE name — buffered this import or already stored.
+        apps/infrastructure come from the SubjectRegistry; credentials are looked up."""
+        hit = self._names[table].get(name)
+        if hit is None and table == "credentials" and self.conn:
+            row = self.conn.execute("SELECT id FROM credentials WHERE name = ?", (name,)).fetchone()
+            if row:
+                hit = self._names[table][name] = row[0]
+        return hit
+
     # ---- specific writers ----
 
     def write_directive(self, d: dict):
         did = self.next_id("directives", "DIR")
-        self._exec(
-            "INSERT INTO directives (id,title,body,category,enforcement,active,source) VALUES (?,?,?,?,?,1,?)",
+        self.pending["directives"].append(
             (did, d["title"], d["body"], d.get("category", "general"), d["enforcement"], "import"),
         )
 
     def write_credential(self, c: dict) -> str:
         # Credentials have UNIQUE(name); a re-import of the same ledger should
         # be a no-op rather than crash. Look up the existing row first.
-        if not self.dry and self.conn:
-            existing = self.conn.execute(
-                "SELECT id FROM credentials WHERE name = ?", (c["name"],)
-            ).fetchone()
-            if existing:
-                return existing[0]
-        cid = self.next_id("credentials", "CRED")
-        self._exec(
-            "INSERT INTO credentials (id,name,kind,fields,notes) VALUES (?,?,?,?,?)",
+        existing = self._existing_id("credentials", c["name"])
+        if existing:
+            return existing
+        cid = self._names["credentials"][c["name"]] = self.next_id("credentials", "CRED")
+        self.pending["credentials"].append(
             (cid, c["name"], c["kind"], c["fields"], c.get("notes", "")),
         )
         return cid
@@ -688,34 +1531,24 @@ class Writer:
     def write_infra(self, i: dict, cred_lookup: dict[str, str]):
         # infrastructure.name is UNIQUE — a re-import of the same ledger row
         # should be a no-op.
-        if not self.dry and self.conn:
-            existing = self.conn.execute(
-                "SELECT id FROM infrastructure WHERE name = ?", (i["name"],)
-            ).fetchone()
-            if existing:
-                return
+        if self._existing_id("infrastructure", i["name"]):
+            return
         iid = self.next_id("infrastructure", "INF")
+        self.subjects.add("infrastructure", i["name"], iid)
         link = i.pop("credential_link_to", None)
         cred_id = cred_lookup.get(link) if link else None
-        self._exec(
-            """INSERT INTO infrastructure
-               (id,name,kind,ip,ssh_port,wildcard_domain,wireguard_ip,credential_id,metadata)
-               VALUES (?,?,?,?,?,?,?,?,?)""",
+        self.pending["infrastructure"].append(
             (iid, i["name"], i["kind"], i.get("ip"), i.get("ssh_port", 22),
              i.get("wildcard_domain"), i.get("wireguard_ip"), cred_id, i.get("metadata", "{}")),
         )
 
     def write_app(self, a: dict):
         # apps.name is UNIQUE — re-import of the same row is a no-op.
-        if not self.dry and self.conn:
-            existing = self.conn.execute(
-                "SELECT id FROM apps WHERE name = ?", (a["name"],)
-            ).fetchone()
-            if existing:
-                return
+        if self._existing_id("apps", a["name"]):
+            return
         aid = self.next_id("apps", "APP")
-        self._exec(
-            "INSERT INTO apps (id,name,app_type,description,services) VALUES (?,?,?,?,?)",
+        self.subjects.add("apps", a["name"], aid)
+        self.pending["apps"].append(
             (aid, a["name"], a.get("app_type", ""), a.get("description", ""), a.get("services", "{}")),
         )
 
@@ -725,63 +1558,58 @@ class Writer:
         backing tables yet — they emit synthetic IDs the executor can pattern-match
         on, so the test still expands and the user can curate later.
         """
-        out: list[str] = []
-        for kind in hints:
-            if kind == "app":
-                if self.dry or not self.conn:
-                    n = getattr(self, "_dry_apps_APP", 0)
-                    out.extend(f"APP-{i:03d}" for i in range(1, n + 1))
-                else:
-                    out.extend(r[0] for r in self.conn.execute("SELECT id FROM apps ORDER BY id"))
-            elif kind == "infrastructure":
-                if not (self.dry or not self.conn):
-                    out.extend(r[0] for r in self.conn.execute("SELECT id FROM infrastructure ORDER BY id"))
-            elif kind == "role":
-                # Synthetic — user populates real role IDs later via /plan update-test.
-                out.extend(["ROLE-admin", "ROLE-user", "ROLE-guest"])
-            elif kind == "viewport":
-                out.extend(["VP-desktop", "VP-tablet", "VP-mobile"])
-            elif kind == "page":
-                # Pages aren't a first-class table; leave the test un-parametrized
-                # but tag it so /plan can suggest parametrization later.
-                pass
-            elif kind == "tab":
-                pass
-        return out
+        return self.subjects.resolve(hints)[0]
 
     def write_phase(self, p: ParsedPhase, tagger: Tagger, with_raw: bool = True) -> dict:
-        # Insert phase
-        self._exec(
-            "INSERT OR REPLACE INTO phases (id,title,description,phase_order,raw_markdown) VALUES (?,?,?,?,?)",
-            (p.phase_id, p.title, getattr(p, "description", None), p.order,
-             p.raw if with_raw else None),
+        stored_phases, stored_tests, _ = self._stored_hashes()
+        tids = [f"T-{p.phase_id[1:]}.{tidx:02d}" for tidx in range(1, len(p.tests) + 1)]
+        self._seen_phases.add(p.phase_id)
+        self._seen_tests.update(tids)
+        stats = {
+            "phase": p.phase_id,
+            "tests": len(p.tests),
+            "steps": sum(len(t.steps) for t in p.tests),
+            "expansions": 0,
+        }
+        # Everything a phase's rows derive from: its markdown, the tag taxonomy
+        # and the subjects that applies_to hints expand to.
+        raw = p.raw if with_raw else None
+        phase_hash = content_hash(
+            HASH_VERSION, p.phase_id, p.title, p.description, p.order, raw, p.round_added,
+            tagger.fingerprint, self.subjects.fingerprint(),
         )
-        # Insert tests + steps + tags
-        expansions = 0
-        for tidx, t in enumerate(p.tests, start=1):
-            tid = f"T-{p.phase_id[1:]}.{tidx:02d}"
-            applies_to = self._resolve_hints_to_subject_ids(t.applies_to_hints)
-            applies_to_json = json.dumps(applies_to)
-            expansions += max(len(applies_to), 1)
-
-            self._exec(
-                """INSERT OR REPLACE INTO tests
-                   (id,phase_id,title,test_order,raw_markdown,test_kind,is_critical,applies_to)
-                   VALUES (?,?,?,?,?,?,1,?)""",
-                (tid, p.phase_id, t.title[:500], tidx, t.raw if with_raw else None,
-                 infer_test_kind(t.raw), applies_to_json),
+        if stored_phases.get(p.phase_id) == phase_hash:
+            self.changes["phases"]["unchanged"] += 1
+            self.changes["tests"]["unchanged"] += len(tids)
+            stats["expansions"] = sum(
+                max(len(self._resolve_hints_to_subject_ids(t.applies_to_hints)), 1) for t in p.tests
             )
+            for tid, t in zip(tids, p.tests):
+                self.pending["step_lines"].extend(self._moved_steps(tid, t.steps))
+            return stats
+        self.changes["phases"]["changed" if p.phase_id in stored_phases else "added"] += 1
+
+        # Insert phase
+        self._phases.pop(p.phase_id, None)
+        rows = self._phases[p.phase_id] = {
+            "phases": [(p.phase_id, p.title, getattr(p, "description", None), p.order,
+                        *self.store_text(raw), phase_hash)],
+            "tests": [], "step_trim": [], "test_steps": [], "step_lines": [], "tag_trim": [], "test_tags": [],
+        }
+        # Insert tests + steps + tags
+        for tidx, (tid, t) in enumerate(zip(tids, p.tests), start=1):
+            applies_to, applies_to_json, unknown = self.subjects.resolve(t.applies_to_hints)
+            stats["expansions"] += max(len(applies_to), 1)
+
+            test_row = (tid, p.phase_id, t.title[:500], tidx, t.raw if with_raw else None,
+                        infer_test_kind(t.raw), applies_to_json)
+            step_rows = []
             for s in t.steps:
                 sid = f"S-{tid[2:]}.{s.order:03d}"
                 # If the test is parametrized, also store the action as an
                 # action_template — the executor uses the template column when subject is non-null.
-                action_template = s.action if applies_to else None
-                self._exec(
-                    """INSERT OR REPLACE INTO test_steps
-                       (id,test_id,step_order,action,action_template)
-                       VALUES (?,?,?,?,?)""",
-                    (sid, tid, s.order, s.action[:8000], action_template[:8000] if action_template else None),
-                )
+                action = step_action(t.raw, s)[:8000]
+                step_rows.append((sid, tid, s.order, action, action if applies_to and action else None))
             tags = tagger.for_text(t.title, t.raw)
             tags.add(p.phase_id.lower())
             tk = infer_test_kind(t.raw)
@@ -794,40 +1622,108 @@ class Writer:
             # Round-added tag (when phase title has "(R31+)" suffix)
             if getattr(p, "round_added", None):
                 tags.add(f"round-{p.round_added}-added")
+
+            tag_names = sorted(tags)
+            test_hash = content_hash(HASH_VERSION, test_row, step_rows, tag_names)
+            if stored_tests.get(tid) == test_hash:
+                self.changes["tests"]["unchanged"] += 1
+                rows["step_lines"].extend(self._moved_steps(tid, t.steps))
+                continue
+            if unknown:
+                self.invalid_subjects.append((tid, unknown))
+            rows["tests"].append((*test_row[:4], *self.store_text(test_row[4]), *test_row[5:], test_hash))
+            if tid in stored_tests:
+                self.changes["tests"]["changed"] += 1
+                rows["step_trim"].append((tid, len(step_rows)))
+                rows["tag_trim"].append((tid, json.dumps(tag_names)))
+            else:
+                self.changes["tests"]["added"] += 1
+            rows["test_steps"].extend((*row, s.line, s.line_end) for row, s in zip(step_rows, t.steps))
+            known = self._stored_tags()
             for tag in tags:
-                self._exec("INSERT OR IGNORE INTO tags (name,auto) VALUES (?,1)", (tag,))
-                self._exec("INSERT OR IGNORE INTO test_tags (test_id,tag_name) VALUES (?,?)", (tid, tag))
-        return {
-            "phase": p.phase_id,
-            "tests": len(p.tests),
-            "steps": sum(len(t.steps) for t in p.tests),
-            "expansions": expansions,
-        }
+                tag = sys.intern(tag)
+                if tag not in known:
+                    self._tags[tag] = None
+                rows["test_tags"].append((tid, tag))
+        return stats
+
+    def _stored_tags(self) -> set[str]:
+        """Tag names already in the tags table, read once."""
+        if self._known_tags is None:
+            self._known_tags = {sys.intern(name) for (name,) in self.conn.execute("SELECT name FROM tags")} \
+                if self.conn else set()
+        return self._known_tags
+
+    def prune_tags(self) -> int:
+        """Delete auto tags no test carries any more (their last test was
+        rewritten without them). Manual tags are never touched."""
+        if self.dry or not self.conn:
+            return 0
+        self.flush()
+        return self.conn.execute("""
+            DELETE FROM tags WHERE auto = 1
+               AND NOT EXISTS (SELECT 1 FROM test_tags WHERE test_tags.tag_name = tags.name)
+        """).rowcount
+
+    def finish_phases(self, deprecate_missing: bool = False) -> list[str]:
+        """Count stored phases/tests this import no longer produced; optionally
+        soft-delete the tests. Only rows that carry a content_hash (i.e. came
+        from an import) are considered — hand-added tests are never touched."""
+        stored_phases, stored_tests, active = self._stored_hashes()
+        self.changes["phases"]["removed"] = sum(
+            1 for pid, h in stored_phases.items() if h and pid not in self._seen_phases
+        )
+        removed = sorted(tid for tid in active
+                         if stored_tests[tid] and tid not in self._seen_tests)
+        self.changes["tests"]["removed"] = len(removed)
+        if deprecate_missing:
+            self.pending["deprecations"].extend((tid,) for tid in removed)
+            self.pending["phase_rehash"].extend((tid,) for tid in removed)
+        return removed
+
+    def keep_phases(self, phase_ids: list[str]):
+        """Count stored phases, and their tests, as seen without re-parsing
+        them (``--watch`` parses only the phase blocks that changed)."""
+        self._seen_phases.update(phase_ids)
+        if self.conn and phase_ids:
+            marks = ",".join("?" * len(phase_ids))
+            self._seen_tests.update(tid for (tid,) in self.conn.execute(
+                f"SELECT id FROM tests WHERE phase_id IN ({marks})", phase_ids))
+
+    def shift_step_lines(self, moved: list[tuple[int, str]]):
+        """Move the stored step lines of phases whose block shifted by a
+        number of lines in the ledger (``(delta, phase id)`` pairs) without
+        re-parsing them."""
+        if self.conn and moved:
+            self.conn.executemany(
+                "UPDATE test_steps SET source_line = source_line + ?1, source_line_end = source_line_end + ?1 "
+                "WHERE test_id IN (SELECT id FROM tests WHERE phase_id = ?2)", moved)
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+
+    def write_expected_count(self, phase_id: str, n: int):
+        self.pending["phase_counts"].append((n, phase_id))
 
     def write_run(self, r: dict):
-        self._exec(
-            """INSERT OR REPLACE INTO test_runs
-               (id,label,started_at,ended_at,status,context,final_state) VALUES (?,?,?,?,?,?,?)""",
+        self.pending["test_runs"].append(
             (r["id"], r.get("label", ""), r["started_at"], r["ended_at"],
-             r["status"], r.get("context", ""), r.get("final_state", "")),
+             r["status"], r.get("context", ""), *self.store_text(r.get("final_state", ""))),
         )
 
     def write_bug(self, b: dict):
         bid = self.next_id("bugs", "BUG")
-        self._exec(
-            """INSERT INTO bugs
-               (id, discovered_in_run, severity, title, description, status)
-               VALUES (?,?,?,?,?,?)""",
+        self.pending["bugs"].append(
             (bid, b["discovered_in_run"], b.get("severity", "medium"),
              b["title"], b.get("description", ""), b.get("status", "open")),
         )
 
     def write_memory(self, m: dict):
         mid = self.next_id("memories", "M")
-        self._exec(
-            """INSERT INTO memories (id,title,kind,body,why_important,importance,tags)
-               VALUES (?,?,?,?,?,?,?)""",
-            (mid, m["title"], m.get("kind", "lesson-learned"), m["body"],
+        body, body_blob = self.store_text(m["body"])
+        self.pending["memories"].append(
+            (mid, m["title"], m.get("kind", "lesson-learned"), body if body_blob is None else "", body_blob,
              m.get("why_important", ""), m.get("importance", 3), m.get("tags", "[]")),
         )
 
@@ -863,125 +1759,592 @@ def detect_section(heading: str) -> str:
     return "other"
 
 
-def main(argv: list[str] | None = None) -> int:
-    p = argparse.ArgumentParser()
-    p.add_argument("ledger", help="path to the markdown ledger file")
-    p.add_argument("--db", default=os.environ.get("E2E_DB", ".e2e-testing/e2e-tests.sqlite"))
-    p.add_argument("--taxonomy", default=None,
-                   help="path to tag-taxonomy.json (defaults to plugin's schemas/tag-taxonomy.json)")
-    p.add_argument("--dry-run", action="store_true")
-    p.add_argument("--json-summary", action="store_true")
-    args = p.parse_args(argv)
+def parse_section(kind: str, body: Block):
+    """Parse one H2 section body. Pure CPU work — no DB, no shared state — so
+    it can run in a worker process."""
+    if kind == "directives":
+        return parse_directives(body)
+    if kind in ("infra", "distribution"):
+        return parse_infra_and_credentials(body)
+    if kind == "apps":
+        # GitHub PATs and Composer creds typically live under H3 subsections of "Test App Matrix"
+        return parse_app_matrix(body), parse_infra_and_credentials(body)
+    if kind == "phases":
+        return parse_phases_section(body)
+    if kind == "counts":
+        return parse_table(body)
+    if kind == "results":
+        return parse_results_log(body)
+    return None
+
+
+def _parse_task(task: tuple[str, str, int]):
+    kind, text, line0 = task
+    result = parse_section(kind, tokenize(text).block())
+    if kind == "phases" and line0:
+        for ph in result:  # step lines count from the chunk: make them ledger lines
+            for t in ph.tests:
+                for s in t.steps:
+                    s.line += line0
+                    s.line_end += line0
+    return result
+
+
+# Sections whose parsers work H3 by H3; they are split across workers. The
+# results log is split too, but parsed while it is written (iter_results_pooled).
+SPLIT_BY_H3 = ("phases",)
+
+
+def _h3_chunks(body: Block, parts: int) -> list[tuple[str, int, int]]:
+    """Split a section into about ``parts`` runs of whole H3 subsections,
+    each with the number of ledger lines above it and its offset in the
+    section text."""
+    text = body.ledger.text
+    evs = body.ledger.events
+    h3 = [evs[i] for i in range(body.lo, body.hi) if evs[i].kind == TOK_H3]
+    if not h3:
+        return []
+    bounds = [ev.offset for ev in h3] + [body.end]
+    target = max((body.end - bounds[0]) // parts, 1)
+    chunks: list[tuple[str, int, int]] = []
+    a = 0
+    for b in range(1, len(bounds)):
+        if bounds[b] - bounds[a] >= target or b == len(bounds) - 1:
+            chunks.append((text[bounds[a]:bounds[b]], h3[a].line, bounds[a] - body.start))
+            a = b
+    return chunks
+
+
+def _results_task(task: tuple[str, int]) -> list[tuple[int, list[dict], list[dict], list[dict]]]:
+    text, offset = task
+    return [(end + offset, runs, mems, bugs) for end, runs, mems, bugs in iter_results_log(tokenize(text).block())]
+
+
+def iter_results_pooled(body: Block, jobs: int = 1, resume_from: int = 0
+                        ) -> Iterator[tuple[int, list[dict], list[dict], list[dict]]]:
+    """``iter_results_log`` with the H3 blocks parsed in ``jobs`` worker
+    processes, still yielded one block at a time in document order so the
+    writer can checkpoint between them. Only ``2 * jobs`` chunks are in
+    flight at once, which keeps a multi-year log out of memory; chunks that
+    end before ``resume_from`` (an offset into the section text) are not
+    parsed at all."""
+    chunks = [(text, offset) for text, _, offset in _h3_chunks(body, jobs * 16)] if jobs > 1 else []
+    ends = [offset for _, offset in chunks[1:]] + [body.end - body.start]
+    chunks = [c for c, end in zip(chunks, ends) if end > resume_from]
+    if len(chunks) < 2:
+        yield from iter_results_log(body)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = deque(pool.submit(_results_task, c) for c in chunks[:2 * jobs])
+        for c in chunks[2 * jobs:] + [None] * len(pending):
+            blocks = pending.popleft().result()
+            if c is not None:
+                pending.append(pool.submit(_results_task, c))
+            yield from blocks
+
+
+def parse_sections(sections: list[tuple[str, Block]], jobs: int = 1) -> list:
+    """Parse every section, returning results in document order.
+
+    With ``jobs > 1`` sections — and H3 runs of the phases section — are
+    parsed in a process pool. Results are reassembled in
+    document order, so the writer (and therefore every allocated ID) sees
+    exactly what a serial run would.
+    """
+    kinds = [detect_section(h) for h, _ in sections]
+    if jobs <= 1:
+        return [parse_section(k, body) for k, (_, body) in zip(kinds, sections)]
+
+    tasks: list[tuple[str, str]] = []
+    owner: list[int] = []
+    for i, (kind, (_, body)) in enumerate(zip(kinds, sections)):
+        if kind == "other":
+            continue
+        texts = (_h3_chunks(body, jobs * 4) if kind in SPLIT_BY_H3
+                 else [(body.ledger.text[body.start:body.end], 0, 0)])
+        for t, line0, _ in texts:
+            tasks.append((kind, t, line0))
+            owner.append(i)
+    if len(tasks) < 2:
+        return [parse_section(k, body) for k, (_, body) in zip(kinds, sections)]
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        outs = list(pool.map(_parse_task, tasks))
+    grouped: dict[int, list] = {}
+    for i, out in zip(owner, outs):
+        grouped.setdefault(i, []).append(out)
+    results: list = []
+    for i, kind in enumerate(kinds):
+        if kind in SPLIT_BY_H3:
+            results.append([ph for part in grouped.get(i, []) for ph in part])
+        else:
+            results.append(grouped[i][0] if i in grouped else None)
+    return results
+
+
+def parse_ledger(text: str, jobs: int = 1) -> list[tuple[str, tuple[int, int], object]]:
+    """Tokenize and parse a whole ledger into one ``(heading, (start, end),
+    result)`` per H2 section; the span locates the section body in ``text``.
+    The results log is left unparsed (``None``): main() streams it block by
+    block with ``iter_results_pooled``."""
+    return parse_ledgers([text], jobs)[0]
+
+
+def parse_ledgers(texts: list[str], jobs: int = 1) -> list[list[tuple[str, tuple[int, int], object]]]:
+    """``parse_ledger`` for several ledgers at once: the sections of all of
+    them go through one ``parse_sections`` call, so a batch of small ledgers
+    shares a single process pool."""
+    per_ledger = [tokenize(text).block().sections(TOK_H2) for text in texts]
+    eager = iter(parse_sections([s for sections in per_ledger for s in sections
+                                 if detect_section(s[0]) != "results"], jobs))
+    return [
+        [(heading, (body.start, body.end), None if detect_section(heading) == "results" else next(eager))
+         for heading, body in sections]
+        for sections in per_ledger
+    ]
+
+
+# Bump when parser output changes shape; the importer's own source hash is part
+# of every key too, so parser edits never serve stale trees.
+PARSE_CACHE_VERSION = 3
+
+
+class ParseCache:
+    """``parse_ledger`` output stored as zlib-compressed JSON under
+    ``cache_dir/parsed-<key>.json.z``.
+
+    The key covers the ledger text, the taxonomy fingerprint and this script,
+    so a ``--dry-run`` followed by the real import, or a re-import of an
+    unchanged ledger, skips tokenizing and parsing (all but the results log,
+    which is always streamed from the ledger text). Every write prunes its
+    own ``parsed-*`` entries (the directory also holds the tagger and
+    redaction caches): those older than ``max_age_days`` go first, then the
+    least recently used until they fit in ``max_mb``.
+    """
 
-    ledger_path = Path(args.ledger)
-    if not ledger_path.exists():
-        print(f"error: ledger not found: {ledger_path}", file=sys.stderr)
-        return 2
+    def __init__(self, cache_dir: Path, max_age_days: float = 14, max_mb: float = 64):
+        self.dir = cache_dir
+        self.max_age = max_age_days * 86400
+        self.max_bytes = int(max_mb * 1024 * 1024)
+
+    @staticmethod
+    def key(ledger_hash: str, tagger: Tagger) -> str:
+        source = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+        return content_hash(PARSE_CACHE_VERSION, source, tagger.fingerprint, ledger_hash)
+
+    def _path(self, key: str) -> Path:
+        return self.dir / f"parsed-{key}.json.z"
+
+    def get(self, key: str) -> list[tuple[str, tuple[int, int], object]] | None:
+        path = self._path(key)
+        try:
+            data = json.loads(zlib.decompress(path.read_bytes()))
+            os.utime(path)  # recency for pruning
+        except (OSError, ValueError, zlib.error):
+            return None
+        return [(heading, tuple(span), self._decode(detect_section(heading), result))
+                for heading, span, result in data]
+
+    @staticmethod
+    def _decode(kind: str, result):
+        if kind != "phases":
+            return result  # dicts and lists; tuples come back as lists, which unpack the same
+        return [
+            ParsedPhase(**{**ph, "tests": [
+                ParsedTest(**{**t, "steps": [ParsedStep(**st) for st in t["steps"]]})
+                for t in ph["tests"]
+            ]})
+            for ph in result
+        ]
+
+    def put(self, key: str, entries: list[tuple[str, tuple[int, int], object]]):
+        blob = zlib.compress(json.dumps(entries, default=vars, separators=(",", ":")).encode("utf-8"), 1)
+        path = self._path(key)
+        try:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(blob)
+            os.replace(tmp, path)
+            self.prune()
+        except OSError:
+            pass  # cache is best-effort
+
+    def prune(self):
+        now = time.time()
+        files = []
+        for f in self.dir.glob("parsed-*"):
+            st = f.stat()
+            if now - st.st_mtime > self.max_age:
+                f.unlink(missing_ok=True)
+            else:
+                files.append((st.st_mtime, st.st_size, f))
+        total = sum(size for _, size, _ in files)
+        for _, size, f in sorted(files, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            f.unlink(missing_ok=True)
+            total -= size
 
-    if not args.taxonomy:
-        plugin_root = Path(os.environ.get("CLAUDE_PLUGIN_ROOT", str(Path(__file__).resolve().parent.parent)))
-        args.taxonomy = str(plugin_root / "schemas" / "tag-taxonomy.json")
 
-    with open(args.taxonomy) as f:
-        taxonomy = json.load(f)
-    tagger = Tagger(taxonomy)
+# ---------------------------------------------------------------------------
+# --profile
+# ---------------------------------------------------------------------------
 
-    raw = ledger_path.read_text(encoding="utf-8")
-    sections = split_h2_sections(raw)
+def _sql_shape(sql: str) -> str:
+    return " ".join(sql.split())[:80]
 
-    summary = {
-        "ledger": str(ledger_path),
-        "h2_sections": [s[0] for s in sections],
-        "directives": 0,
-        "credentials": 0,
-        "infrastructure": 0,
-        "apps": 0,
-        "phases": 0,
-        "tests": 0,
-        "steps": 0,
-        "expansions": 0,
-        "runs": 0,
-        "memories": 0,
-        "bugs": 0,
-        "coverage_targets": 0,
-        "count_warnings": [],
-        "skipped_sections": [],
-    }
 
-    if not args.dry_run:
-        if not Path(args.db).exists():
-            print(f"error: db not found: {args.db}. Run /e2e-test-specialist:init first.", file=sys.stderr)
-            return 2
+class _ProfiledConnection:
+    """sqlite3 connection proxy that times every statement by its SQL text
+    (all importer SQL is parameterized, so the text is the shape). SELECTs
+    are timed up to their first row; fetches happen in the caller."""
+
+    def __init__(self, conn: sqlite3.Connection, stats: dict[str, list]):
+        self._conn = conn
+        self._stats = stats
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def _timed(self, shape: str, fn, *args):
+        t0 = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            st = self._stats.setdefault(shape, [0, 0.0])
+            st[0] += 1
+            st[1] += time.perf_counter() - t0
+
+    def execute(self, sql: str, params=()):
+        return self._timed(_sql_shape(sql), self._conn.execute, sql, params)
+
+    def executemany(self, sql: str, rows):
+        return self._timed(_sql_shape(sql), self._conn.executemany, sql, rows)
+
+    def commit(self):
+        return self._timed("COMMIT", self._conn.commit)
+
+
+class Profiler:
+    """Where an import's time goes, for ``--profile`` / ``E2E_PROFILE=1``.
+
+    Wraps the parser functions below (inclusive wall time and call counts),
+    times SQLite statements by shape through ``_ProfiledConnection``, counts
+    rows the Writer's statements changed per INSERTS entry, and laps the main
+    stages. With ``--jobs N`` the parsers run in worker processes and only the
+    in-process calls are counted.
+    """
+
+    FUNCTIONS = (
+        "tokenize", "parse_sections", "parse_section", "parse_directives",
+        "parse_infra_and_credentials", "parse_app_matrix", "parse_table", "parse_kv_bullets",
+        "parse_phases_section", "split_phase_preamble", "extract_tests_from_phase",
+        "extract_numbered_steps", "detect_applies_to_hints", "infer_test_kind",
+        "parse_results_log", "extract_bugs_from_run_block",
+    )
+
+    def __init__(self):
+        self.functions: dict[str, list] = {}
+        self.sql: dict[str, list] = {}
+        self.rows: dict[str, int] = {}
+        self.stages: dict[str, float] = {}
+        self._start = self._last = time.perf_counter()
+
+    def _wrap(self, name: str, fn):
+        def timed(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                st = self.functions.setdefault(name, [0, 0.0])
+                st[0] += 1
+                st[1] += time.perf_counter() - t0
+        timed.__wrapped__ = fn
+        return timed
+
+    def instrument(self, namespace: dict):
+        for name in self.FUNCTIONS:
+            namespace[name] = self._wrap(name, namespace[name])
+        Tagger.for_text = self._wrap("Tagger.for_text", Tagger.for_text)
+        Tagger.load = staticmethod(self._wrap("Tagger.load", Tagger.load))
+
+    def connection(self, conn: sqlite3.Connection) -> _ProfiledConnection:
+        return _ProfiledConnection(conn, self.sql)
+
+    def count_rows(self, table: str, n: int):
+        self.rows[table] = self.rows.get(table, 0) + max(n, 0)
+
+    def lap(self, stage: str):
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + now - self._last
+        self._last = now
+
+    def report(self) -> dict:
+        ms = lambda sec: round(sec * 1000, 3)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return {
+            "total_ms": ms(time.perf_counter() - self._start),
+            "stages_ms": {k: ms(v) for k, v in self.stages.items()},
+            "functions": {name: {"calls": n, "ms": ms(sec)} for name, (n, sec)
+                          in sorted(self.functions.items(), key=lambda kv: -kv[1][1])},
+            "sql": [{"statement": shape, "calls": n, "ms": ms(sec)} for shape, (n, sec)
+                    in sorted(self.sql.items(), key=lambda kv: -kv[1][1])],
+            "rows": dict(sorted(self.rows.items())),
+            # ru_maxrss is KiB on Linux, bytes on macOS.
+            "peak_rss_mb": round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1),
+        }
+
+
+# ---------------------------------------------------------------------------
+# --progress ndjson
+# ---------------------------------------------------------------------------
+
+# A results-log progress event every this many runs.
+PROGRESS_RUNS = 100
+
 
-    w = Writer(args.db, dry=args.dry_run)
+class Progress:
+    """Machine-readable progress for callers such as /autopilot and /wizard.
 
+    Writes one JSON object per line to stderr, flushed at once: a stage
+    starting (parse, write, flush, commit), each phase and section written,
+    every PROGRESS_RUNS historical runs, and ``done``. Every event carries the
+    summary counts so far and ``elapsed_ms``. Write-stage events add ``done``
+    (share of the ledger text written) and ``eta_ms``, extrapolated from the
+    time the write stage has taken so far. The ETA covers the write loop;
+    the flush and commit stages that follow report on their own.
+    """
+
+    def __init__(self, total_chars: int, stream=None):
+        self.total = max(total_chars, 1)
+        self.base = 0                    # offset of the current ledger in the batch
+        self.summary: dict | None = None
+        self.stream = stream or sys.stderr
+        self._start = time.perf_counter()
+        self._write_start: float | None = None
+
+    def _emit(self, event: dict):
+        counts = {k: self.summary[k] for k in SUMMARY_COUNTS if self.summary[k]} if self.summary else {}
+        event.update(counts=counts, elapsed_ms=round((time.perf_counter() - self._start) * 1000, 1))
+        self.stream.write(json.dumps(event) + "\n")
+        self.stream.flush()
+
+    def stage(self, name: str):
+        if name == "write":
+            self._write_start = time.perf_counter()
+        self._emit({"event": "stage", "stage": name})
+
+    def at(self, event: str, offset: int, section: str, **fields):
+        """``event`` reached ``offset`` in the current ledger's text."""
+        done = min((self.base + offset) / self.total, 1.0)
+        eta = None
+        if self._write_start is not None and done > 0:
+            eta = round((time.perf_counter() - self._write_start) * (1 - done) / done * 1000, 1)
+        self._emit({"event": event, "section": section, **fields, "done": round(done, 4), "eta_ms": eta})
+
+    def finish(self):
+        self._emit({"event": "done", "done": 1.0, "eta_ms": 0})
+
+
+def resolve_ledgers(specs: list[str]) -> list[Path]:
+    """Expand ledger arguments — files, directories (their ``*.md``) and
+    globs — in the order given, each directory / glob sorted by path."""
+    out: dict[Path, None] = {}
+    for spec in specs:
+        path = Path(spec)
+        if path.is_dir():
+            out.update(dict.fromkeys(sorted(p for p in path.glob("*.md") if p.is_file())))
+        elif glob.has_magic(spec):
+            out.update(dict.fromkeys(sorted(Path(p) for p in glob.glob(spec) if Path(p).is_file())))
+        else:
+            out[path] = None
+    return list(out)
+
+
+def renumber_phase_collisions(ledgers: list[tuple[str, list]]) -> tuple[list[dict[str, str]], list[dict]]:
+    """Give phases that several ledgers number alike distinct IDs.
+
+    ``ledgers`` is ``(name, entries)`` in import order. The first ledger to
+    use a phase number keeps it; a later ledger's phase with that number
+    moves to the next number above every phase number in the batch. The
+    phases in ``entries`` are replaced in place. Returns one ``{old id: new
+    id}`` map per ledger (for its Test Count Summary) and the collisions."""
+    phase_lists = [[result for heading, _, result in entries if detect_section(heading) == "phases"]
+                   for _, entries in ledgers]
+    owner: dict[int, str] = {}
+    for (name, _), lists in zip(ledgers, phase_lists):
+        for ph in (ph for result in lists for ph in result):
+            owner.setdefault(ph.order, name)
+    next_free = max(owner, default=0) + 1
+    maps: list[dict[str, str]] = []
+    collisions: list[dict] = []
+    for (name, _), lists in zip(ledgers, phase_lists):
+        renamed: dict[str, str] = {}
+        for result in lists:
+            for i, ph in enumerate(result):
+                if owner[ph.order] == name:
+                    continue
+                if ph.phase_id not in renamed:
+                    renamed[ph.phase_id] = f"P{next_free:02d}"
+                    collisions.append({"ledger": name, "phase": ph.phase_id, "kept_by": owner[ph.order],
+                                       "renumbered_to": renamed[ph.phase_id]})
+                    next_free += 1
+                new_id = renamed[ph.phase_id]
+                result[i] = replace(ph, phase_id=new_id, order=int(new_id[1:]))
+        maps.append(renamed)
+    return maps, collisions
+
+
+class FileOffsets:
+    """Byte offsets in a ledger file for offsets into its text, and back.
+    The parser works on the decoded text with line endings normalized to LF
+    (see Ledger), so the two differ by the UTF-8 width of every non-ASCII
+    character and by one byte per CRLF. The resume cursor stores the byte
+    offset, which means the same thing to any tool reading the file."""
+
+    def __init__(self, raw: bytes):
+        self.sha256 = hashlib.sha256(raw).hexdigest()
+        # Without CRs the text encodes back to the file; only CRLFs need it.
+        self._raw = raw if b"\r" in raw else None
+        self._at = (0, 0)  # (text offset, byte offset) of the last to_bytes
+
+    def to_bytes(self, text: str, offset: int) -> int:
+        """Byte offset of ``text[offset]``. Offsets must not decrease between
+        calls: each one only encodes the text since the previous one."""
+        start, pos = self._at if offset >= self._at[0] else (0, 0)
+        if self._raw is None:
+            pos += len(text[start:offset].encode("utf-8"))
+        else:
+            *lines, last = text[start:offset].split("\n")
+            for line in lines:
+                pos += len(line.encode("utf-8"))
+                pos += 2 if self._raw[pos:pos + 2] == b"\r\n" else 1
+            pos += len(last.encode("utf-8"))
+        self._at = (offset, pos)
+        return pos
+
+    def to_text(self, text: str, byte_offset: int) -> int:
+        """Offset into ``text`` of the file's ``byte_offset``."""
+        if self._raw is None:
+            return len(text.encode("utf-8")[:byte_offset].decode("utf-8"))
+        head = self._raw[:byte_offset].decode("utf-8")
+        return len(head.replace("\r\n", "\n").replace("\r", "\n"))
+
+    def cursor(self, text: str, offset: int) -> dict:
+        return {"ledger": self.sha256, "byte_offset": self.to_bytes(text, offset)}
+
+
+def apply_sections(w: Writer, text: str, entries: list, tagger: Tagger, summary: dict, *,
+                   resume_from: int = 0, chunk_runs: int = 0, offsets: FileOffsets | None = None,
+                   known_runs: set[str] | frozenset = frozenset(),
+                   phase_map: dict[str, str] | None = None, progress: Progress | None = None,
+                   jobs: int = 1) -> bool:
+    """Buffer the rows of parsed ``entries`` (``parse_ledger`` output for
+    ``text``) in ``w`` and add them to ``summary``. Returns whether a phases
+    section was applied (the caller then runs ``finish_phases``).
+
+    Runs in ``known_runs`` are already stored: only their row is rewritten,
+    their bugs and memories are not appended again. ``chunk_runs`` /
+    ``offsets`` (of ``text``'s file) checkpoint the results log; a failed checkpoint raises
+    ValueError with everything since the last one rolled back.
+    ``phase_map`` renames phase IDs in the Test Count Summary (see
+    ``renumber_phase_collisions``). ``progress`` gets an event per phase,
+    per PROGRESS_RUNS runs and per section. ``jobs`` parses the results log
+    in that many processes ahead of the writer."""
     cred_lookup: dict[str, str] = {}
+    phases_seen = False
 
-    for heading, body in sections:
+    for heading, (start, end), result in entries:
         kind = detect_section(heading)
+        body_text = text[start:end].strip()
+        # Sections before the resume offset are already committed. Idempotent
+        # ones (name / content-hash upserts) are replayed so credential links
+        # and the removed-tests count see the whole ledger; appended rows
+        # (directives, memories, runs, bugs) are not written twice.
+        if end <= resume_from and kind not in ("infra", "apps", "phases", "counts", "distribution"):
+            continue
 
         if kind == "directives":
-            for d in parse_directives(body):
+            for d in result:
                 w.write_directive(d)
                 summary["directives"] += 1
 
         elif kind == "infra":
-            infra, creds = parse_infra_and_credentials(body)
+            infra, creds = result
             for c in creds:
-                cred_lookup[c["name"]] = w.write_credential(c) if not args.dry_run else c["name"]
+                cred_lookup[c["name"]] = w.write_credential(c)
                 summary["credentials"] += 1
             for i in infra:
                 w.write_infra(i, cred_lookup)
                 summary["infrastructure"] += 1
 
         elif kind == "apps":
-            for a in parse_app_matrix(body):
+            apps, (extra_infra, extra_creds) = result
+            for a in apps:
                 w.write_app(a)
                 summary["apps"] += 1
-            # GitHub PATs and Composer creds typically live under H3 subsections of "Test App Matrix"
-            extra_infra, extra_creds = parse_infra_and_credentials(body)
             for c in extra_creds:
-                cred_lookup[c["name"]] = w.write_credential(c) if not args.dry_run else c["name"]
+                cred_lookup[c["name"]] = w.write_credential(c)
                 summary["credentials"] += 1
             for i in extra_infra:
                 w.write_infra(i, cred_lookup)
                 summary["infrastructure"] += 1
 
         elif kind == "phases":
-            phases = parse_phases_section(body)
-            for ph in phases:
+            phases_seen = True
+            for n, ph in enumerate(result, 1):
                 stats = w.write_phase(ph, tagger)
                 summary["phases"] += 1
                 summary["tests"] += stats["tests"]
                 summary["steps"] += stats["steps"]
                 summary["expansions"] += stats.get("expansions", stats["tests"])
+                if progress:
+                    # Phases carry no offsets: place them evenly across the section.
+                    progress.at("phase", start + (end - start) * n // len(result), heading,
+                                phase=ph.phase_id)
 
         elif kind == "results":
-            runs, mems, bugs_extracted = parse_results_log(body)
-            for r in runs:
-                w.write_run(r)
-                summary["runs"] += 1
-            for m in mems:
-                w.write_memory(m)
-                summary["memories"] += 1
-            for b in bugs_extracted:
-                w.write_bug(b)
-                summary["bugs"] = summary.get("bugs", 0) + 1
+            in_chunk = 0
+            blocks = iter_results_pooled(tokenize(text[start:end]).block(), jobs, max(resume_from - start, 0))
+            for block_end, runs, mems, bugs_extracted in blocks:
+                block_end += start
+                if block_end <= resume_from:
+                    continue
+                for r in runs:
+                    w.write_run(r)
+                    summary["runs"] += 1
+                    if progress and summary["runs"] % PROGRESS_RUNS == 0:
+                        progress.at("runs", block_end, heading)
+                if runs and all(r["id"] in known_runs for r in runs):
+                    continue
+                for m in mems:
+                    w.write_memory(m)
+                    summary["memories"] += 1
+                for b in bugs_extracted:
+                    w.write_bug(b)
+                    summary["bugs"] = summary.get("bugs", 0) + 1
+                in_chunk += len(runs)
+                if chunk_runs > 0 and in_chunk >= chunk_runs:
+                    in_chunk = 0
+                    if offsets and w.checkpoint(offsets.cursor(text, block_end)):
+                        summary["checkpoints"] += 1
 
         elif kind == "distribution":
             # Distribution may include DO API tokens and droplet inventories.
-            extra_infra, extra_creds = parse_infra_and_credentials(body)
+            extra_infra, extra_creds = result
             for c in extra_creds:
-                cred_lookup[c["name"]] = w.write_credential(c) if not args.dry_run else c["name"]
+                cred_lookup[c["name"]] = w.write_credential(c)
                 summary["credentials"] += 1
             for i in extra_infra:
                 w.write_infra(i, cred_lookup)
                 summary["infrastructure"] += 1
             # And preserve the textual plan — the agent uses it to map app→server.
+            if end <= resume_from:
+                continue
             w.write_memory({
                 "title": "Server Distribution Plan",
                 "kind": "environment",
-                "body": body.strip(),
+                "body": body_text,
                 "why_important": "Maps which apps live on which servers; used to plan deploys.",
                 "importance": 4,
                 "tags": json.dumps(["distribution", "infrastructure"]),
@@ -990,18 +2353,19 @@ def main(argv: list[str] | None = None) -> int:
 
         elif kind == "counts":
             # Try to extract the table and update phases.expected_test_count
-            for row in parse_table(body):
+            for row in result:
                 phase_field = (row.get("phase") or row.get("what") or "").strip()
                 tests_field = (row.get("tests") or "").strip().replace("~", "").replace(",", "")
                 m = re.search(r"\d+", phase_field)
                 if not m:
                     continue
                 pid = f"P{int(m.group()):02d}"
+                pid = (phase_map or {}).get(pid, pid)
                 try:
                     n = int(tests_field)
                 except ValueError:
                     continue
-                w._exec("UPDATE phases SET expected_test_count = ? WHERE id = ?", (n, pid))
+                w.write_expected_count(pid, n)
 
         else:
             summary["skipped_sections"].append(heading)
@@ -1009,13 +2373,443 @@ def main(argv: list[str] | None = None) -> int:
             w.write_memory({
                 "title": f"Unparsed section: {heading}",
                 "kind": "environment",
-                "body": body.strip()[:8000],
+                "body": body_text[:8000],
                 "why_important": "Preserved from import; importer didn't recognize this section.",
                 "importance": 2,
                 "tags": json.dumps(["import-residual", slugify(heading)]),
             })
             summary["memories"] += 1
 
+        if progress:
+            progress.at("section", end, heading, kind=kind)
+
+    return phases_seen
+
+
+# ---------------------------------------------------------------------------
+# Watch mode
+# ---------------------------------------------------------------------------
+#
+# ``--watch`` keeps the importer running after the first import and polls the
+# ledger's mtime/size. Once a change has settled (same stat on two polls), the
+# new text is fingerprinted per H2 section, and per ### block inside the
+# phases, directives and results-log sections. Only what changed is re-parsed,
+# and each changed section is written by its own Writer in its own short
+# transaction, so a running executor is never locked out for long.
+#
+#   phases            changed/new phase blocks are parsed; the others are kept
+#                     (counted as seen, so removed phases/tests are still found)
+#   directives, results log
+#                     new blocks are appended; a run already stored only gets
+#                     its row rewritten, not its bugs and memories again
+#   anything else     the whole section is re-applied, as a re-import would
+
+WATCH_BY_H3 = ("phases", "directives", "results")
+
+# The per-section counters in the summary (what apply_sections adds up).
+SUMMARY_COUNTS = ("directives", "credentials", "infrastructure", "apps", "phases", "tests",
+                  "steps", "expansions", "runs", "memories", "bugs", "coverage_targets")
+
+
+class WatchedSection(NamedTuple):
+    heading: str
+    kind: str
+    digest: str             # hash of the whole section body
+    body: str
+    blocks: dict[str, str]  # ### block hash → block text (WATCH_BY_H3 kinds only)
+    lines: dict[str, int]   # ### block hash → 1-based line of its heading
+
+
+def watched_sections(text: str) -> dict[tuple[str, int], WatchedSection]:
+    """Fingerprint every H2 section, keyed by (heading, occurrence)."""
+    ledger = tokenize(text)
+    evs = ledger.events
+    out: dict[tuple[str, int], WatchedSection] = {}
+    seen: dict[str, int] = {}
+    for heading, body in ledger.block().sections(TOK_H2):
+        n = seen[heading] = seen.get(heading, 0) + 1
+        kind = detect_section(heading)
+        raw = ledger.text[body.start:body.end]
+        blocks: dict[str, str] = {}
+        lines: dict[str, int] = {}
+        if kind in WATCH_BY_H3:
+            h3 = [evs[i] for i in range(body.lo, body.hi) if evs[i].kind == TOK_H3]
+            ends = [ev.offset for ev in h3[1:]] + [body.end]
+            for ev, b in zip(h3, ends):
+                block = ledger.text[ev.offset:b].strip()
+                digest = content_hash(block)
+                if digest not in blocks:
+                    blocks[digest] = block
+                    lines[digest] = ev.line + 1
+        out[(heading, n)] = WatchedSection(heading, kind, content_hash(raw.strip()), raw, blocks, lines)
+    return out
+
+
+def _block_phase_id(block: str) -> str | None:
+    m = PHASE_HEADING.match(block.split("\n", 1)[0].lstrip("#").strip())
+    return f"P{int(m.group('num')):02d}" if m else None
+
+
+def plan_changes(old: dict, new: dict) -> Iterator[tuple[tuple[str, int], WatchedSection, str | None,
+                                                          list[str], list[tuple[int, str]]]]:
+    """``(key, section, text to apply, phase ids kept, moved phases)`` for
+    each section of ``new`` that differs from ``old`` or whose phase blocks
+    moved, in document order. The text is a one-section ledger (None when
+    the change needs no writes, e.g. a block was only deleted from an
+    append-only section or lines were added above it), its fresh blocks
+    padded onto the lines they sit on in the file. Moved phases are
+    ``(line delta, phase id)`` for kept blocks that shifted."""
+    for key, sec in new.items():
+        prev = old.get(key)
+        moved: list[tuple[int, str]] = []
+        if prev and sec.kind == "phases":
+            moved = [(sec.lines[h] - prev.lines[h], pid) for h, b in sec.blocks.items()
+                     if h in prev.lines and sec.lines[h] != prev.lines[h] and (pid := _block_phase_id(b))]
+        if prev and prev.digest == sec.digest:
+            if moved:
+                yield key, sec, None, [], moved
+            continue
+        kept: list[str] = []
+        if sec.kind in WATCH_BY_H3:
+            fresh = [h for h in sec.blocks if not prev or h not in prev.blocks]
+            if sec.kind == "phases":
+                kept = [pid for h, b in sec.blocks.items()
+                        if prev and h in prev.blocks and (pid := _block_phase_id(b))]
+            elif not fresh:
+                yield key, sec, None, kept, moved
+                continue
+            parts, line = [f"## {sec.heading}\n"], 2
+            for h in fresh:
+                block = sec.blocks[h]
+                parts.append("\n" * (sec.lines[h] - line) + block + "\n")
+                line = sec.lines[h] + block.count("\n") + 1
+            yield key, sec, "".join(parts), kept, moved
+        else:
+            yield key, sec, f"## {sec.heading}\n\n{sec.body.strip()}\n", kept, moved
+
+
+def apply_change(args, tagger: Tagger, sec: WatchedSection, section_text: str | None, kept: list[str],
+                 moved: list[tuple[int, str]]) -> dict:
+    """Write one changed section in its own transaction. Raises ValueError
+    (nothing written) when the rows fail validation."""
+    summary = {**dict.fromkeys(SUMMARY_COUNTS, 0), "deprecated": 0, "skipped_sections": [],
+               "checkpoints": 0, "blobs_pruned": 0, "tags_pruned": 0}
+    w = Writer(args.db)
+    try:
+        w.shift_step_lines(moved)
+        if section_text is None:
+            w.commit()
+            return summary
+        known_runs = frozenset()
+        if sec.kind == "results":
+            known_runs = {rid for (rid,) in w.conn.execute("SELECT id FROM test_runs")}
+        w.keep_phases(kept)
+        if apply_sections(w, section_text, parse_ledger(section_text), tagger, summary,
+                          known_runs=known_runs):
+            removed = w.finish_phases(deprecate_missing=args.deprecate_missing)
+            if args.deprecate_missing:
+                summary["deprecated"] = len(removed)
+            summary["changes"] = w.changes
+        if w.invalid_subjects:
+            raise ValueError("tests.applies_to references unknown subject ids: " + "; ".join(
+                f"{tid}: {', '.join(unknown)}" for tid, unknown in w.invalid_subjects[:5]))
+        w.flush()
+        if sec.kind in ("phases", "results"):
+            summary["blobs_pruned"] = w.prune_blobs()
+        if sec.kind == "phases":
+            summary["tags_pruned"] = w.prune_tags()
+        w.commit()
+    finally:
+        w.close()
+    return summary
+
+
+def report_change(args, sec: WatchedSection, summary: dict, apply_ms: float, latency_ms: float):
+    """One log line per applied section: what was written, how long the
+    transaction took and how long after the save it was committed."""
+    counts = {k: summary[k] for k in SUMMARY_COUNTS if summary[k]}
+    if args.json_summary:
+        event = {"event": "applied", "section": sec.heading, "kind": sec.kind, "counts": counts,
+                 "apply_ms": round(apply_ms, 1), "latency_ms": round(latency_ms, 1)}
+        if "changes" in summary:
+            event["changes"] = summary["changes"]
+            event["deprecated"] = summary["deprecated"]
+        print(json.dumps(event), flush=True)
+        return
+    what = ", ".join(f"{k} {v}" for k, v in counts.items()) or "no new rows"
+    if "changes" in summary:
+        c = summary["changes"]["tests"]
+        what += f"; tests added/changed/removed {c['added']}/{c['changed']}/{c['removed']}"
+    print(f"[watch] {sec.heading}: {what} — applied in {apply_ms:.0f} ms, "
+          f"{latency_ms:.0f} ms after save", flush=True)
+
+
+def watch(args, ledger_path: Path, tagger: Tagger, text: str, stat: os.stat_result) -> int:
+    """Poll the ledger until Ctrl-C, applying each settled change section by
+    section. ``text``/``stat`` describe what the initial import applied."""
+    sections = watched_sections(text)
+    applied = pending = (stat.st_mtime_ns, stat.st_size)
+    print(f"[watch] watching {ledger_path} every {args.interval:g}s (Ctrl-C to stop)",
+          file=sys.stderr, flush=True)
+    try:
+        while True:
+            time.sleep(args.interval)
+            try:
+                st = ledger_path.stat()
+            except FileNotFoundError:
+                continue  # editors that save by rename briefly remove the file
+            sig = (st.st_mtime_ns, st.st_size)
+            if sig == applied:
+                continue
+            if sig != pending:
+                pending = sig  # still being written: wait for it to settle
+                continue
+            try:
+                new = watched_sections(ledger_path.read_text(encoding="utf-8"))
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"[watch] cannot read {ledger_path}: {e}", file=sys.stderr, flush=True)
+                applied = sig
+                continue
+            retry = False
+            for key, sec, section_text, kept, moved in plan_changes(sections, new):
+                if section_text is None and not moved:
+                    sections[key] = sec
+                    continue
+                t0 = time.perf_counter()
+                try:
+                    summary = apply_change(args, tagger, sec, section_text, kept, moved)
+                except sqlite3.OperationalError as e:
+                    # e.g. still locked after the busy timeout: try again next poll.
+                    print(f"[watch] {sec.heading}: {e}; retrying", file=sys.stderr, flush=True)
+                    retry = True
+                    continue
+                except ValueError as e:
+                    print(f"[watch] {sec.heading}: not applied: {e}", file=sys.stderr, flush=True)
+                    continue
+                sections[key] = sec
+                if section_text is None:
+                    continue  # only moved: nothing to report
+                report_change(args, sec, summary, (time.perf_counter() - t0) * 1000,
+                              (time.time_ns() - st.st_mtime_ns) / 1e6)
+            for key in set(sections) - set(new):
+                del sections[key]
+            applied = None if retry else sig
+    except KeyboardInterrupt:
+        return 0
+
+
+def load_config(db_path: str, plugin_root: Path) -> dict:
+    """The project's config.json (E2E_CONFIG, else beside the DB), falling back
+    to the plugin defaults."""
+    for path in (os.environ.get("E2E_CONFIG"), Path(db_path).parent / "config.json",
+                 plugin_root / "schemas" / "default-config.json"):
+        if path and Path(path).is_file():
+            try:
+                with open(path) as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                continue
+    return {}
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser()
+    p.add_argument("ledger", nargs="+",
+                   help="markdown ledger file(s); a directory or glob imports every ledger in it")
+    p.add_argument("--db", default=os.environ.get("E2E_DB", ".e2e-testing/e2e-tests.sqlite"))
+    p.add_argument("--taxonomy", default=None,
+                   help="path to tag-taxonomy.json (defaults to plugin's schemas/tag-taxonomy.json)")
+    p.add_argument("--dry-run", action="store_true")
+    p.add_argument("--json-summary", action="store_true")
+    p.add_argument("--deprecate-missing", action="store_true", default=None,
+                   help="soft-delete imported tests no longer in the ledger "
+                        "(default: config import.deprecate_missing_tests)")
+    p.add_argument("--jobs", type=int, default=None,
+                   help="parse sections in N worker processes (0 = one per CPU; "
+                        "default 1, or one per CPU when importing several ledgers)")
+    p.add_argument("--no-cache", action="store_true",
+                   help="parse from scratch and leave .e2e-testing/cache/ untouched")
+    p.add_argument("--profile", action="store_true", default=os.environ.get("E2E_PROFILE") == "1",
+                   help="add per-function, per-statement and per-table timings to the summary")
+    p.add_argument("--chunk-runs", type=int, default=None,
+                   help="commit the Test Results Log every N runs, with a resume cursor "
+                        "(default: config import.results_chunk_runs; 0 = one transaction)")
+    p.add_argument("--resume", action="store_true",
+                   help="continue an import that stopped after a results-log checkpoint")
+    p.add_argument("--watch", action="store_true",
+                   help="after importing, keep polling the ledger and apply each changed section")
+    p.add_argument("--progress", choices=("none", "ndjson"), default="none",
+                   help="ndjson: one JSON progress event per stage, section and phase on stderr")
+    p.add_argument("--interval", type=float, default=None,
+                   help="--watch poll interval in seconds (default: config import.watch_interval_seconds)")
+    args = p.parse_args(argv)
+    if args.watch and args.dry_run:
+        p.error("--watch writes each change as it is saved; it cannot be combined with --dry-run")
+
+    ledger_paths = resolve_ledgers(args.ledger)
+    for path in ledger_paths:
+        if not path.exists():
+            print(f"error: ledger not found: {path}", file=sys.stderr)
+            return 2
+    if not ledger_paths:
+        print(f"error: no ledgers match {' '.join(args.ledger)}", file=sys.stderr)
+        return 2
+    multi = len(ledger_paths) > 1
+    if multi and (args.watch or args.resume):
+        p.error(f"{'--watch' if args.watch else '--resume'} takes a single ledger")
+    if args.jobs is None:
+        args.jobs = 0 if multi else 1
+    if args.jobs <= 0:
+        args.jobs = os.cpu_count() or 1
+    profiler = None
+    if args.profile:
+        profiler = Profiler()
+        profiler.instrument(globals())
+    ledger_path = ledger_paths[0]
+
+    plugin_root = Path(os.environ.get("CLAUDE_PLUGIN_ROOT", str(Path(__file__).resolve().parent.parent)))
+    if not args.taxonomy:
+        args.taxonomy = str(plugin_root / "schemas" / "tag-taxonomy.json")
+    config = load_config(args.db, plugin_root)
+    if args.deprecate_missing is None:
+        args.deprecate_missing = bool(config.get("import", {}).get("deprecate_missing_tests", False))
+    if multi:
+        args.chunk_runs = 0  # several ledgers merge in one transaction
+    elif args.chunk_runs is None:
+        args.chunk_runs = int(config.get("import", {}).get("results_chunk_runs", 500))
+    if args.interval is None:
+        args.interval = float(config.get("import", {}).get("watch_interval_seconds", 1.0))
+
+    db_dir = Path(args.db).parent
+    tagger = Tagger.load(args.taxonomy, cache_dir=db_dir / "cache" if db_dir.is_dir() else None)
+    if profiler:
+        profiler.lap("setup")
+
+    ledger_stat = ledger_path.stat()
+    texts, files = [], []
+    for path in ledger_paths:
+        raw = path.read_bytes()
+        files.append(FileOffsets(raw))
+        texts.append(raw.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n"))
+    hashes = [hashlib.sha256(text.encode("utf-8")).hexdigest() for text in texts]
+    progress = Progress(sum(map(len, texts))) if args.progress == "ndjson" else None
+    if progress:
+        progress.stage("parse")
+    cache = None
+    if db_dir.is_dir() and not args.no_cache:
+        limits = config.get("import", {})
+        cache = ParseCache(db_dir / "cache", limits.get("cache_max_age_days", 14), limits.get("cache_max_mb", 64))
+    keys = [ParseCache.key(h, tagger) for h in hashes] if cache else []
+    parsed = [cache.get(key) for key in keys] if cache else [None] * len(texts)
+    misses = [i for i, entries in enumerate(parsed) if entries is None]
+    # Every ledger that missed the cache is parsed in one batch (one pool).
+    for i, entries in zip(misses, parse_ledgers([texts[i] for i in misses], args.jobs) if misses else []):
+        parsed[i] = entries
+        if cache:
+            cache.put(keys[i], entries)
+    cache_state = ("off" if cache is None else "miss" if len(misses) == len(texts)
+                   else "hit" if not misses else "partial")
+    text, entries = texts[0], parsed[0]
+    names = [str(path) for path in ledger_paths]
+    phase_maps, collisions = renumber_phase_collisions(list(zip(names, parsed)))
+    if profiler:
+        profiler.lap("parse")
+
+    summary = {
+        "ledger": " ".join(args.ledger) if multi else str(ledger_path),
+        **({"ledgers": names} if multi else {}),
+        "h2_sections": [e[0] for entries in parsed for e in entries],
+        "parse_cache": cache_state,
+        **dict.fromkeys(SUMMARY_COUNTS, 0),
+        "changes": {},
+        "deprecated": 0,
+        "count_warnings": [],
+        "skipped_sections": [],
+        "checkpoints": 0,
+        "resumed_from": None,
+        "blobs_pruned": 0,
+        "tags_pruned": 0,
+        "phase_collisions": collisions,
+    }
+
+    if not args.dry_run:
+        if not Path(args.db).exists():
+            print(f"error: db not found: {args.db}. Run /e2e-test-specialist:init first.", file=sys.stderr)
+            return 2
+
+    w = Writer(args.db, dry=args.dry_run, profiler=profiler)
+    if not w.schema_supported():
+        print(f"error: {args.db} predates schema v1.11.0. Run /e2e-test-specialist:init to migrate.",
+              file=sys.stderr)
+        return 2
+
+    # Chunked results-log imports commit as they go and leave a cursor
+    # {sha256 of the ledger file, byte offset into it} in state.import_cursor.
+    # Everything before the offset is already in the DB, so --resume skips it.
+    stored_cursor = w.stored_cursor()
+    resume_from = 0
+    if args.resume:
+        if not stored_cursor:
+            print("error: no interrupted import to resume.", file=sys.stderr)
+            return 2
+        if "byte_offset" not in stored_cursor:
+            print("error: the interrupted import was recorded by an older importer; "
+                  "re-run without --resume to import it from the start.", file=sys.stderr)
+            return 2
+        if stored_cursor.get("ledger") != files[0].sha256:
+            print("error: the ledger changed since the interrupted import; "
+                  "re-run without --resume to import it from the start.", file=sys.stderr)
+            return 2
+        summary["resumed_from"] = int(stored_cursor["byte_offset"])
+        resume_from = files[0].to_text(text, summary["resumed_from"])
+    elif stored_cursor:
+        print(f"warning: an earlier import stopped at byte {stored_cursor.get('byte_offset')}; "
+              "importing from the start (use --resume to continue it instead).", file=sys.stderr)
+
+    if progress:
+        progress.summary = summary
+        progress.stage("write")
+    phases_seen = False
+    try:
+        # Several ledgers: one Writer (one ID high-water scan) and one
+        # transaction, written in the order the ledgers were given.
+        for text, offsets, entries, phase_map in zip(texts, files, parsed, phase_maps):
+            phases_seen |= apply_sections(w, text, entries, tagger, summary, resume_from=resume_from,
+                                          chunk_runs=args.chunk_runs, offsets=offsets,
+                                          phase_map=phase_map, progress=progress, jobs=args.jobs)
+            if progress:
+                progress.base += len(text)
+    except ValueError as e:
+        # The connection closes with everything since the last checkpoint rolled back.
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    if phases_seen:
+        removed = w.finish_phases(deprecate_missing=args.deprecate_missing)
+        if args.deprecate_missing:
+            summary["deprecated"] = len(removed)
+    summary["changes"] = w.changes
+
+    if w.invalid_subjects:
+        print("error: tests.applies_to references unknown subject ids "
+              "(add the rows, e.g. roles, before importing):", file=sys.stderr)
+        for tid, unknown in w.invalid_subjects[:20]:
+            print(f"  {tid}: {', '.join(unknown)}", file=sys.stderr)
+        if len(w.invalid_subjects) > 20:
+            print(f"  ... and {len(w.invalid_subjects) - 20} more tests", file=sys.stderr)
+        return 2
+
+    if profiler:
+        profiler.lap("write")
+    if progress:
+        progress.stage("flush")
+    try:
+        w.flush()
+    except ValueError as e:
+        # The connection closes with everything since the last checkpoint rolled back.
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
     # Validate expected vs imported test counts (warn loudly on big mismatches)
     if not args.dry_run:
         for pid, expected, actual in w.conn.execute("""
@@ -1029,12 +2823,27 @@ def main(argv: list[str] | None = None) -> int:
                     "phase": pid, "expected": expected, "actual": actual,
                 })
 
+    if profiler:
+        profiler.lap("flush")
+    summary["blobs_pruned"] = w.prune_blobs()
+    summary["tags_pruned"] = w.prune_tags()
+    if stored_cursor or summary["checkpoints"]:
+        w.save_cursor(None)  # finished: nothing left to resume
+    if progress:
+        progress.stage("commit")
     w.commit()
+    if progress:
+        progress.finish()
+    if profiler:
+        profiler.lap("commit")
+        summary["profile"] = profiler.report()
 
     if args.json_summary:
         print(json.dumps(summary, indent=2))
     else:
-        print(f"Imported from {ledger_path.name}{' (DRY RUN — nothing written)' if args.dry_run else ''}")
+        source = (f"{len(ledger_paths)} ledgers ({', '.join(p.name for p in ledger_paths)})"
+                  if multi else ledger_path.name)
+        print(f"Imported from {source}{' (DRY RUN — nothing written)' if args.dry_run else ''}")
         print(f"  H2 sections seen        : {len(summary['h2_sections'])}")
         print(f"  directives              : {summary['directives']}")
         print(f"  credentials             : {summary['credentials']}")
@@ -1044,6 +2853,12 @@ def main(argv: list[str] | None = None) -> int:
         print(f"  tests                   : {summary['tests']}")
         print(f"  parametrized expansions : {summary['expansions']}  (test × subject pairs the executor will run)")
         print(f"  steps                   : {summary['steps']}")
+        for kind in ("phases", "tests"):
+            c = summary["changes"][kind]
+            print(f"  {kind:<6} added/changed/unchanged/removed : "
+                  f"{c['added']}/{c['changed']}/{c['unchanged']}/{c['removed']}")
+        if summary["deprecated"]:
+            print(f"  deprecated (not in ledger) : {summary['deprecated']}")
         print(f"  historical runs         : {summary['runs']}")
         print(f"  bugs (extracted)        : {summary.get('bugs', 0)}")
         print(f"  memories                : {summary['memories']}")
@@ -1053,6 +2868,21 @@ def main(argv: list[str] | None = None) -> int:
                 print(f"    {w_['phase']}: expected ~{w_['expected']}, imported {w_['actual']}")
         if summary["skipped_sections"]:
             print(f"  preserved-as-memory     : {', '.join(summary['skipped_sections'])}")
+        for c in collisions:
+            print(f"  phase collision         : {c['phase']} in {c['ledger']} (taken by {c['kept_by']}) "
+                  f"imported as {c['renumbered_to']}")
+        if profiler:
+            prof = summary["profile"]
+            print(f"  profile                 : {prof['total_ms']:.0f} ms total, peak RSS {prof['peak_rss_mb']} MB")
+            print("    stages   " + ", ".join(f"{k} {v:.0f} ms" for k, v in prof["stages_ms"].items()))
+            for name, st in list(prof["functions"].items())[:8]:
+                print(f"    {st['ms']:>9.1f} ms {st['calls']:>7}x  {name}")
+            for st in prof["sql"][:8]:
+                print(f"    {st['ms']:>9.1f} ms {st['calls']:>7}x  {st['statement']}")
+    if args.watch:
+        w.close()
+        sys.stdout.flush()
+        return watch(args, ledger_path, tagger, text, ledger_stat)
     return 0
 
 
@@ -12,34 +12,118 @@ E2E_COMPONENT=init
 if [[ -f "$E2E_DB" ]]; then
     existing="$(sqlite3 "$E2E_DB" 'SELECT version FROM schema_version ORDER BY applied_at DESC LIMIT 1;' 2>/dev/null || true)"
     case "$existing" in
-        1.4.0)
+        1.11.0)
             echo "e2e-test-specialist already initialized at $E2E_ROOT_DIR (schema v$existing)."
             exit 0
             ;;
+        1.10.0)
+            echo "Found schema v1.10.0; migrating to v1.11.0 (provenance of imported tag links)..."
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.10-to-v1.11.sh" "$E2E_DB"
+            exit 0
+            ;;
+        1.9.0)
+            echo "Found schema v1.9.0; migrating to v1.11.0..."
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.9-to-v1.10.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.10-to-v1.11.sh" "$E2E_DB"
+            exit 0
+            ;;
+        1.8.0)
+            echo "Found schema v1.8.0; migrating to v1.11.0..."
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.8-to-v1.9.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.9-to-v1.10.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.10-to-v1.11.sh" "$E2E_DB"
+            exit 0
+            ;;
+        1.7.0)
+            echo "Found schema v1.7.0; migrating to v1.11.0..."
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.7-to-v1.8.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.8-to-v1.9.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.9-to-v1.10.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.10-to-v1.11.sh" "$E2E_DB"
+            exit 0
+            ;;
+        1.6.0)
+            echo "Found schema v1.6.0; migrating to v1.11.0..."
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.6-to-v1.7.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.7-to-v1.8.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.8-to-v1.9.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.9-to-v1.10.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.10-to-v1.11.sh" "$E2E_DB"
+            exit 0
+            ;;
+        1.5.0)
+            echo "Found schema v1.5.0; migrating to v1.11.0..."
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.5-to-v1.6.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.6-to-v1.7.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.7-to-v1.8.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.8-to-v1.9.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.9-to-v1.10.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.10-to-v1.11.sh" "$E2E_DB"
+            exit 0
+            ;;
+        1.4.0)
+            echo "Found schema v1.4.0; migrating to v1.11.0..."
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.4-to-v1.5.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.5-to-v1.6.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.6-to-v1.7.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.7-to-v1.8.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.8-to-v1.9.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.9-to-v1.10.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.10-to-v1.11.sh" "$E2E_DB"
+            exit 0
+            ;;
         1.3.0)
-            echo "Found schema v1.3.0; migrating to v1.4.0 (skip_reason + fix_attempt_index + idempotent + affected_tests + coverage_links + notifications + resource_ledger)..."
+            echo "Found schema v1.3.0; migrating to v1.11.0..."
             bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.3-to-v1.4.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.4-to-v1.5.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.5-to-v1.6.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.6-to-v1.7.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.7-to-v1.8.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.8-to-v1.9.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.9-to-v1.10.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.10-to-v1.11.sh" "$E2E_DB"
             exit 0
             ;;
         1.2.0)
-            echo "Found schema v1.2.0; migrating to v1.4.0..."
+            echo "Found schema v1.2.0; migrating to v1.11.0..."
             bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.2-to-v1.3.sh" "$E2E_DB"
             bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.3-to-v1.4.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.4-to-v1.5.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.5-to-v1.6.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.6-to-v1.7.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.7-to-v1.8.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.8-to-v1.9.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.9-to-v1.10.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.10-to-v1.11.sh" "$E2E_DB"
             exit 0
             ;;
         1.1.0)
-            echo "Found schema v1.1.0; migrating to v1.4.0..."
+            echo "Found schema v1.1.0; migrating to v1.11.0..."
             bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.1-to-v1.2.sh" "$E2E_DB"
             bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.2-to-v1.3.sh" "$E2E_DB"
             bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.3-to-v1.4.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.4-to-v1.5.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.5-to-v1.6.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.6-to-v1.7.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.7-to-v1.8.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.8-to-v1.9.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.9-to-v1.10.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.10-to-v1.11.sh" "$E2E_DB"
             exit 0
             ;;
         1.0.0)
-            echo "Found schema v1.0.0; migrating to v1.4.0..."
+            echo "Found schema v1.0.0; migrating to v1.11.0..."
             bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.0-to-v1.1.sh" "$E2E_DB"
             bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.1-to-v1.2.sh" "$E2E_DB"
             bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.2-to-v1.3.sh" "$E2E_DB"
             bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.3-to-v1.4.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.4-to-v1.5.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.5-to-v1.6.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.6-to-v1.7.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.7-to-v1.8.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.8-to-v1.9.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.9-to-v1.10.sh" "$E2E_DB"
+            bash "${CLAUDE_PLUGIN_ROOT}/schemas/migrate-v1.10-to-v1.11.sh" "$E2E_DB"
             exit 0
             ;;
         "")
@@ -62,7 +146,7 @@ fi
 
 # Verify
 version="$(sqlite3 "$E2E_DB" 'SELECT version FROM schema_version ORDER BY applied_at DESC LIMIT 1;')"
-[[ "$version" == "1.4.0" ]] || e2e_die "schema version mismatch: $version"
+[[ "$version" == "1.11.0" ]] || e2e_die "schema version mismatch: $version"
 
 e2e_log INFO init "initialized $E2E_ROOT_DIR (schema v$version)"
 
@@ -139,12 +139,46 @@ e2e_next_run_id() {
 # Redaction — never let credential values leak into logs / reports
 # ---------------------------------------------------------------------------
 
+# True when scripts/e2e-daemon.py is listening beside the DB. The helpers
+# below then send their request through the thin client (python3 -S, no
+# imports) instead of starting the script; output is the same either way.
+e2e_daemon_up() {
+    [[ -S "$(dirname "$E2E_DB")/daemon.sock" ]]
+}
+
 # Replace any known credential VALUE in a string with [redacted:{name}:{key}].
 # Reads stdin, writes to stdout. Delegates to scripts/redact.py so the python
-# script can read the caller's stdin (a heredoc would shadow it).
+# script can read the caller's stdin (a heredoc would shadow it). The input is
+# streamed in chunks, so whole SSH logs can be piped through in bounded memory.
 e2e_redact() {
     e2e_require_db
-    python3 "${CLAUDE_PLUGIN_ROOT}/scripts/redact.py" "$E2E_DB"
+    if e2e_daemon_up; then
+        python3 -S "${CLAUDE_PLUGIN_ROOT}/scripts/e2e-client.py" --db "$E2E_DB" redact
+    else
+        python3 "${CLAUDE_PLUGIN_ROOT}/scripts/redact.py" "$E2E_DB"
+    fi
+}
+
+# Exit 1 (with a warning on stderr) when a stored credential value appears in
+# the text on stdin — scripts/redact-screenshot.py. Args: [--quiet]
+e2e_detect_credentials() {
+    e2e_require_db
+    if e2e_daemon_up; then
+        python3 -S "${CLAUDE_PLUGIN_ROOT}/scripts/e2e-client.py" --db "$E2E_DB" detect "$@"
+    else
+        python3 "${CLAUDE_PLUGIN_ROOT}/scripts/redact-screenshot.py" --db "$E2E_DB" "$@"
+    fi
+}
+
+# Render a {{subject.*}} template against one subject's resolved fields —
+# scripts/render-template.py --subject. Args: <template> <subject_id>
+e2e_render() {
+    e2e_require_db
+    if e2e_daemon_up; then
+        python3 -S "${CLAUDE_PLUGIN_ROOT}/scripts/e2e-client.py" --db "$E2E_DB" render "$1" --subject "$2"
+    else
+        python3 "${CLAUDE_PLUGIN_ROOT}/scripts/render-template.py" "$1" --subject "$2" --db "$E2E_DB"
+    fi
 }
 
 # ---------------------------------------------------------------------------
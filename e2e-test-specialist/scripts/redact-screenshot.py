@@ -7,7 +7,10 @@ isn't shipped here. Instead, we check the most recent browser_snapshot text
 calling command can surface to the user.
 
 Usage:
-    cat snapshot.txt | python3 redact-screenshot.py [--db PATH]
+    cat snapshot.txt | python3 redact-screenshot.py [--db PATH] [--quiet]
+
+The check runs redact.py's Redactor in detection mode; with --quiet it prints
+nothing and stops at the first visible value.
 
 Exit codes:
     0  no credential strings found in snapshot
@@ -17,16 +20,26 @@ Exit codes:
 from __future__ import annotations
 
 import argparse
-import json
 import os
-import sqlite3
 import sys
 
+from redact import Redactor
+
+
+def warning(findings: list[tuple[str, str]]) -> str:
+    """The stderr text for visible ``(cred_name, field_name)`` findings."""
+    lines = ["WARNING: credential values appear in the current page snapshot:"]
+    lines += [f"  - credential '{name}' field '{field}' is visible" for name, field in findings]
+    lines.append("Consider scrolling/dismissing before capturing the screenshot.")
+    return "\n".join(lines) + "\n"
+
 
 def main() -> int:
     p = argparse.ArgumentParser()
     p.add_argument("--db", default=os.environ.get(
         "E2E_DB", ".e2e-testing/e2e-tests.sqlite"))
+    p.add_argument("--quiet", action="store_true",
+                   help="exit status only; stop at the first visible value")
     args = p.parse_args()
 
     snapshot = sys.stdin.read()
@@ -36,27 +49,13 @@ def main() -> int:
     if not os.path.exists(args.db):
         return 0  # no creds to check against
 
-    conn = sqlite3.connect(args.db)
-    findings: list[tuple[str, str]] = []   # (cred_name, field_name)
-
-    for name, fields_json in conn.execute("SELECT name, fields FROM credentials"):
-        try:
-            fields = json.loads(fields_json or "{}")
-        except Exception:
-            continue
-        for k, v in fields.items():
-            if not isinstance(v, str) or len(v) < 6:
-                continue
-            if k in ("host", "port", "user", "username", "provider", "url"):
-                continue
-            if v in snapshot:
-                findings.append((name, k))
+    # (cred_name, field_name) of every visible value
+    redactor = Redactor.from_db(args.db)
+    findings = redactor.detect(snapshot, first=args.quiet)
 
     if findings:
-        print("WARNING: credential values appear in the current page snapshot:", file=sys.stderr)
-        for name, field in findings:
-            print(f"  - credential '{name}' field '{field}' is visible", file=sys.stderr)
-        print("Consider scrolling/dismissing before capturing the screenshot.", file=sys.stderr)
+        if not args.quiet:
+            sys.stderr.write(warning(findings))
         return 1
     return 0
 
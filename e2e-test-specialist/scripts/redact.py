@@ -3,49 +3,433 @@
 text stream. Reads stdin, writes redacted text to stdout.
 
 Usage:
-    cat report.md | python3 redact.py <db-path>
+    cat report.md | python3 redact.py <db-path> [--chunk-size N]
+    python3 redact.py <db-path> --tree <dir> [--out <mirror-dir>] [--jobs N]
+
+Input is redacted in chunks of N characters (default 65536) and each chunk
+is written out as soon as it is done, so memory stays bounded however large
+the input and output starts before EOF.
+
+--tree redacts every file under a directory (a run directory before it is
+shared) in place, or into a mirror directory with --out, and records which
+credential keys were found in which file in ``.redact-manifest.json``. See
+``TreeRedactor``.
 
 Heuristics:
     - Skip very short values (< 6 chars) — likely not secrets.
     - Skip values whose key is in NON_SECRET_KEYS (host/port/user/etc).
-    - Replace longer values first (avoid substring shadowing).
+    - Where values overlap, the longer one wins (avoid substring shadowing).
+
+``Redactor`` locates every value without copying the text and writes the
+output in one pass; redact-screenshot.py imports it for detection.
 """
 
 from __future__ import annotations
 
+import argparse
+import bisect
+import hashlib
 import json
+import mmap
+import os
+import shutil
 import sqlite3
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import TextIO
 
 NON_SECRET_KEYS = {"host", "port", "user", "username", "provider", "url", "region"}
+# redact-screenshot.py has always warned about a visible region too.
+DETECT_SKIP_KEYS = NON_SECRET_KEYS - {"region"}
+MIN_SECRET_LENGTH = 6
+CHUNK_SIZE = 64 * 1024
+MMAP_THRESHOLD = 1024 * 1024  # --tree maps files this large instead of reading them
+MANIFEST_NAME = ".redact-manifest.json"
 
 
-def main(argv: list[str]) -> int:
-    if len(argv) < 2:
-        print("usage: redact.py <db-path>", file=sys.stderr)
-        return 2
-    db_path = argv[1]
-    text = sys.stdin.read()
-
-    conn = sqlite3.connect(db_path)
-    patterns: list[tuple[str, str, str]] = []  # (value, name, key)
+def load_secrets(conn: sqlite3.Connection) -> list[tuple[str, str, str]]:
+    """``(value, credential name, field key)`` for every stored field worth
+    masking or detecting, in table order."""
+    secrets: list[tuple[str, str, str]] = []
     for name, fields_json in conn.execute("SELECT name, fields FROM credentials"):
         try:
             fields = json.loads(fields_json or "{}")
         except Exception:
             continue
         for k, v in fields.items():
-            if not isinstance(v, str) or len(v) < 6:
+            if not isinstance(v, str) or len(v) < MIN_SECRET_LENGTH:
                 continue
-            if k in NON_SECRET_KEYS:
+            if k in DETECT_SKIP_KEYS:
                 continue
-            patterns.append((v, name, k))
+            secrets.append((v, name, k))
+    return secrets
+
+
+def credentials_stamp(conn: sqlite3.Connection) -> str | None:
+    """``state.credentials_stamp``: replaced by triggers whenever a
+    credential's name or fields change. None before schema v1.9.0."""
+    try:
+        row = conn.execute("SELECT credentials_stamp FROM state WHERE id = 1").fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
+
+class Redactor:
+    """Every secret prepared once: ``redact`` replaces all of them and copies
+    the text once, ``detect`` reports which are present and can stop at the
+    first one.
+
+    Each distinct value is located with ``str.find`` (a C-speed scan, no
+    copy), longest value first; an occurrence overlapping a span a longer
+    value already claimed is skipped, exactly as if the longer value had
+    been replaced first. The output is then assembled in one pass.
+
+    A single-pass matcher (one alternation, or a prefix trie) is not used:
+    it is leftmost-first, so a shorter value starting just before a longer
+    one it overlaps would win and leave the rest of the longer secret in
+    clear, and in CPython it is slower up to about a thousand values (see
+    tests/bench/bench-redact.py).
+    """
+
+    def __init__(self, secrets: list[tuple[str, str, str]]):
+        self.secrets = secrets
+        self.stamp: str | None = None
+        # value → the (name, key) pairs holding it; the first names the marker.
+        self.owners: dict[str, list[tuple[str, str]]] = {}
+        for value, name, key in sorted(secrets, key=lambda s: -len(s[0])):
+            if key not in NON_SECRET_KEYS:
+                self.owners.setdefault(value, []).append((name, key))
+        self.values = list(self.owners)  # longest first
+        self.longest = len(self.values[0]) if self.values else 0
+        self.markers = {v: f"[redacted:{o[0][0]}:{o[0][1]}]" for v, o in self.owners.items()}
+
+    @classmethod
+    def from_db(cls, db_path: str) -> "Redactor":
+        """Build from the credentials table. Nothing is written to disk: the
+        values are secrets, and any key to a cache of them would sit in the
+        same database."""
+        conn = sqlite3.connect(db_path)
+        try:
+            return cls.from_conn(conn)
+        finally:
+            conn.close()
+
+    @classmethod
+    def from_conn(cls, conn: sqlite3.Connection) -> "Redactor":
+        """``from_db`` on an open connection (e2e-daemon.py keeps one and
+        rebuilds only when the stamp moves). The stamp the secrets were read
+        at is kept as ``stamp``."""
+        conn.execute("BEGIN")  # stamp and rows from one snapshot
+        try:
+            stamp = credentials_stamp(conn)
+            secrets = load_secrets(conn)
+        finally:
+            conn.rollback()
+        redactor = cls(secrets)
+        redactor.stamp = stamp
+        return redactor
+
+    def spans(self, text: str) -> list[tuple[int, int, str]]:
+        """``(start, end, value)`` of every occurrence to mask, in text order."""
+        claimed: list[tuple[int, int, str]] = []
+        starts: list[int] = []
+        for value in self.values:
+            n = len(value)
+            hits: list[tuple[int, int, str]] = []
+            i = text.find(value)
+            while i != -1:
+                k = bisect.bisect_right(starts, i)
+                if (k and claimed[k - 1][1] > i) or (k < len(starts) and starts[k] < i + n):
+                    i = text.find(value, i + 1)  # inside a longer value's span
+                    continue
+                hits.append((i, i + n, value))  # never overlaps this value's earlier hits
+                i = text.find(value, i + n)
+            if hits:
+                # Two sorted runs: one merge, not an insert per hit.
+                claimed = sorted(claimed + hits)
+                starts = [start for start, _, _ in claimed]
+        return claimed
+
+    def redact(self, text: str) -> str:
+        return self._redact(text, len(text))[0]
+
+    def _redact(self, text: str, cut: int) -> tuple[str, int]:
+        """Redact ``text`` up to ``cut``: the output plus where it stopped —
+        ``cut``, or past it when a value starting before ``cut`` ends later."""
+        parts: list[str] = []
+        pos = 0
+        for start, end, value in self.spans(text):
+            if start >= cut:
+                break
+            parts.append(text[pos:start])
+            parts.append(self.markers[value])
+            pos = end
+        stop = max(pos, cut)
+        if not parts:
+            return text[:stop], stop
+        parts.append(text[pos:stop])
+        return "".join(parts), stop
+
+    def _settled(self, text: str) -> int:
+        """How much of ``text`` redacts the same whatever follows it.
+
+        A value not yet whole starts in the last ``longest - 1`` characters
+        and may outrank an occurrence crossing into them; displacing that one
+        may in turn unblock a lower-ranked occurrence crossing its start, and
+        so on. Each step goes to a lower-ranked value, so the chain is short.
+        """
+        settled = len(text) - self.longest + 1
+        if settled <= 0:
+            return 0
+        work = [(settled, 0)]  # an unseen value may be the top-ranked one
+        seen = set(work)
+        while work:
+            pos, rank = work.pop()
+            for r in range(rank + 1, len(self.values)):
+                value = self.values[r]
+                hi = pos + len(value) - 1
+                i = text.find(value, max(pos - len(value) + 1, 0), hi)
+                while i != -1:  # every occurrence crossing pos
+                    if (i, r) not in seen:
+                        seen.add((i, r))
+                        work.append((i, r))
+                        settled = min(settled, i)
+                    i = text.find(value, i + 1, hi)
+        return settled
+
+    def redact_stream(self, src: TextIO, dst: TextIO, chunk_size: int = CHUNK_SIZE):
+        """Redact ``src`` into ``dst`` chunk by chunk, flushing each one.
+
+        Each chunk is written up to ``_settled``, and the rest is carried
+        into the next. A value straddling a chunk boundary is still seen
+        whole, and an occurrence it could displace is held back with it, so
+        the output is exactly ``redact`` of the whole input. The carry-over
+        is ``longest - 1`` characters plus any chain of overlapping values.
+        """
+        if not self.values:
+            shutil.copyfileobj(src, dst, chunk_size)
+            dst.flush()
+            return
+        carry = ""
+        while True:
+            chunk = src.read(chunk_size)
+            buf = carry + chunk
+            cut = self._settled(buf) if chunk else len(buf)
+            out, stop = self._redact(buf, cut)
+            if out:
+                dst.write(out)
+                dst.flush()
+            carry = buf[stop:]
+            if not chunk:
+                return
+
+    def detect(self, text: str, first: bool = False) -> list[tuple[str, str]]:
+        """``(name, key)`` of every stored value present in ``text``, in table
+        order. ``first`` stops at the first value found (enough for a yes/no)."""
+        found: set[str] = set()
+        for value in dict.fromkeys(value for value, _, _ in self.secrets):
+            if value in text:
+                found.add(value)
+                if first:
+                    break
+        return [(name, key) for value, name, key in self.secrets if value in found]
+
+
+class TreeRedactor:
+    """``--tree``: redact every regular file under ``root``, in place or into
+    the mirror directory ``out``, from one prepared Redactor.
+
+    Each file is hashed and searched for every stored value (as UTF-8 bytes)
+    straight from a memory map when it is large, so clean files — most of a
+    run directory — are never decoded or copied in memory. A file with a hit
+    is streamed through ``redact_stream`` into a temporary file beside its
+    destination, which then replaces it. Files with a NUL byte in their
+    first 8 KiB (screenshots, archives) are never rewritten: they are copied
+    to the mirror as they are, and listed with whatever values they contain.
 
-    patterns.sort(key=lambda p: -len(p[0]))
-    for value, name, key in patterns:
-        text = text.replace(value, f"[redacted:{name}:{key}]")
+    The manifest records, per file, the hash it had and the hash it was left
+    with, and the credential keys found in it. ``matcher`` identifies the
+    credentials it was made with (a one-way digest of the credentials stamp),
+    so when it still matches, a file whose hash equals the recorded output is
+    already clean and is not searched again. Symlinks are not followed.
+    """
+
+    SNIFF = 8192
+
+    def __init__(self, redactor: Redactor, root: Path, out: Path | None):
+        self.redactor = redactor
+        self.root = root
+        self.out = out
+        self.encoded = [(v, v.encode("utf-8", "surrogateescape")) for v in redactor.values]
+        self.matcher = (hashlib.blake2b(redactor.stamp.encode(), digest_size=16,
+                                        person=b"e2e-redact-tree").hexdigest()
+                        if redactor.stamp else None)
+
+    @property
+    def manifest_path(self) -> Path:
+        return (self.out or self.root) / MANIFEST_NAME
+
+    def files(self) -> list[str]:
+        """Relative paths of the regular files to process, sorted."""
+        skip = self.out.resolve() if self.out else None
+        found: list[str] = []
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            here = Path(dirpath)
+            dirnames[:] = sorted(d for d in dirnames
+                                 if not (here / d).is_symlink() and (here / d).resolve() != skip)
+            for name in filenames:
+                path = here / name
+                if path.is_symlink() or not path.is_file() or name.endswith(".redact-tmp"):
+                    continue
+                rel = path.relative_to(self.root).as_posix()
+                if rel != MANIFEST_NAME:
+                    found.append(rel)
+        return sorted(found)
+
+    def previous(self) -> dict[str, dict]:
+        """Entries of the last manifest, if it was made with the same credentials."""
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not self.matcher or manifest.get("matcher") != self.matcher:
+            return {}
+        return manifest.get("files") or {}
+
+    def process(self, rel: str, prev: dict | None) -> dict:
+        src = self.root / rel
+        dst = self.out / rel if self.out else src
+        with open(src, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size >= MMAP_THRESHOLD else f.read()
+            try:
+                digest = hashlib.sha256(data).hexdigest()
+                if prev and self._unchanged(digest, dst, prev):
+                    # Still reported as binary: its findings were not redacted.
+                    return {**prev, "action": "binary" if prev["action"] == "binary" else "unchanged"}
+                found = {v for v, b in self.encoded if data.find(b) != -1}
+                binary = data.find(b"\0", 0, self.SNIFF) != -1
+                if not found or binary:
+                    if self.out:
+                        _atomic_write(dst, src, lambda tmp: tmp.write(data))
+                    action = "binary" if binary else "clean"
+                    return self._entry(action, digest, digest, found)
+            finally:
+                if isinstance(data, mmap.mmap):
+                    data.close()
+
+        def rewrite(tmp):
+            with open(src, encoding="utf-8", errors="surrogateescape", newline="") as fin, \
+                    open(tmp.fileno(), "w", encoding="utf-8", errors="surrogateescape",
+                         newline="", closefd=False) as fout:
+                self.redactor.redact_stream(fin, fout)
+        return self._entry("redacted", digest, _atomic_write(dst, src, rewrite), found)
+
+    def _unchanged(self, digest: str, dst: Path, prev: dict) -> bool:
+        if not self.out:
+            return digest == prev.get("output")
+        return digest == prev.get("source") and dst.is_file() and _sha256_file(dst) == prev.get("output")
+
+    def _entry(self, action: str, source: str, output: str, found: set[str]) -> dict:
+        keys = [[name, key] for value, name, key in self.redactor.secrets if value in found]
+        return {"action": action, "source": source, "output": output, "found": keys}
+
+    def run(self, jobs: int) -> dict:
+        files = self.files()
+        prev = self.previous()
+        tasks = [(rel, prev.get(rel)) for rel in files]
+        if jobs <= 1 or len(tasks) < 2:
+            entries = [self.process(rel, p) for rel, p in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=jobs, initializer=_tree_init, initargs=(self,)) as pool:
+                entries = list(pool.map(_tree_task, tasks, chunksize=max(1, len(tasks) // (jobs * 4))))
+        manifest = {"matcher": self.matcher, "files": dict(zip(files, entries))}
+        text = json.dumps(manifest, indent=1, sort_keys=True) + "\n"
+        _atomic_write(self.manifest_path, None, lambda tmp: tmp.write(text.encode()))
+        return manifest
+
+
+_TREE: TreeRedactor | None = None
+
+
+def _tree_init(tree: TreeRedactor):
+    global _TREE
+    _TREE = tree
+
+
+def _tree_task(task: tuple[str, dict | None]) -> dict:
+    return _TREE.process(*task)
+
+
+def _sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE * 16):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _atomic_write(dst: Path, mode_from: Path | None, write) -> str:
+    """Run ``write(file)`` on a temporary file beside ``dst`` (with the mode
+    bits of ``mode_from``), then move it over ``dst``; the new file's hash."""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(f".{dst.name}.{os.getpid()}.redact-tmp")
+    try:
+        with open(tmp, "wb") as f:
+            write(f)
+        if mode_from is not None:
+            shutil.copymode(mode_from, tmp)
+        digest = _sha256_file(tmp)
+        os.replace(tmp, dst)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return digest
+
+
+def redact_tree(redactor: Redactor, root: Path, out: Path | None, jobs: int) -> int:
+    """``--tree``: one summary line on stdout; exit 1 when a binary file holds
+    a stored value (it cannot be redacted, so the tree is not safe to share)."""
+    tree = TreeRedactor(redactor, root, out)
+    entries = tree.run(jobs)["files"]
+    counts: dict[str, int] = {}
+    for entry in entries.values():
+        counts[entry["action"]] = counts.get(entry["action"], 0) + 1
+    summary = ", ".join(f"{counts.get(a, 0)} {a}" for a in ("redacted", "clean", "unchanged", "binary"))
+    print(f"{len(entries)} files: {summary}; manifest {tree.manifest_path}")
+    leaks = [rel for rel, e in entries.items() if e["action"] == "binary" and e["found"]]
+    for rel in leaks:
+        keys = ", ".join(f"{name}:{key}" for name, key in entries[rel]["found"])
+        print(f"WARNING: binary file {rel} contains credential values ({keys}); it was not rewritten",
+              file=sys.stderr)
+    return 1 if leaks else 0
+
+
+def main(argv: list[str]) -> int:
+    p = argparse.ArgumentParser(prog="redact.py")
+    p.add_argument("db_path")
+    p.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                   help="characters read and written at a time (default %(default)s)")
+    p.add_argument("--tree", type=Path, metavar="DIR",
+                   help="redact every file under DIR instead of stdin (in place unless --out)")
+    p.add_argument("--out", type=Path, metavar="DIR",
+                   help="with --tree: write the redacted copy of the tree here")
+    p.add_argument("--jobs", type=int, default=0,
+                   help="with --tree: worker processes (default 0 = one per CPU)")
+    args = p.parse_args(argv[1:])
+    if args.out and not args.tree:
+        p.error("--out requires --tree")
+    if args.tree and not args.tree.is_dir():
+        p.error(f"--tree: not a directory: {args.tree}")
 
-    sys.stdout.write(text)
+    redactor = Redactor.from_db(args.db_path)
+    if args.tree:
+        out = args.out if args.out and args.out.resolve() != args.tree.resolve() else None
+        return redact_tree(redactor, args.tree, out, args.jobs if args.jobs > 0 else os.cpu_count() or 1)
+    redactor.redact_stream(sys.stdin, sys.stdout, max(args.chunk_size, 1))
     return 0
 
 
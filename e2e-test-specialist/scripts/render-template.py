@@ -3,19 +3,26 @@
 
 Usage:
     python3 render-template.py "<template>" "<json-context>"
+    python3 render-template.py "<template>" --subject <subject-id> [--db PATH]
 
 Examples:
     $ render-template.py 'Navigate to https://{{subject.target_domain}}/admin' \\
         '{"subject":{"target_domain":"todo.secnote.com.br"}}'
     Navigate to https://todo.secnote.com.br/admin
 
+With --subject the context is ``{"subject": <fields>}`` from
+v_subjects_resolved (an unknown id renders against ``{}``), read straight
+from the DB instead of through sqlite3 and a JSON one-liner.
+
 Missing keys render as empty strings (safe — no errors).
 """
 
 from __future__ import annotations
 
 import json
+import os
 import re
+import sqlite3
 import sys
 
 TPL = re.compile(r"\{\{\s*([\w.\[\]\-]+)\s*\}\}")
@@ -45,16 +52,41 @@ def render(template: str, ctx: dict) -> str:
     return TPL.sub(lambda m: lookup(ctx, m.group(1)), template)
 
 
+def subject_fields(conn: sqlite3.Connection, subject_id: str) -> dict:
+    """The resolved fields of one subject; ``{}`` when it is unknown."""
+    row = conn.execute("SELECT fields FROM v_subjects_resolved WHERE id = ?", (subject_id,)).fetchone()
+    try:
+        fields = json.loads(row[0]) if row and row[0] else {}
+    except json.JSONDecodeError:
+        return {}
+    return fields if isinstance(fields, dict) else {}
+
+
 def main(argv: list[str]) -> int:
     if len(argv) < 3:
-        print("usage: render-template.py <template> <json-context>", file=sys.stderr)
+        print("usage: render-template.py <template> (<json-context> | --subject <id> [--db PATH])",
+              file=sys.stderr)
         return 2
     template = argv[1]
-    try:
-        context = json.loads(argv[2])
-    except json.JSONDecodeError as e:
-        print(f"error: invalid JSON context: {e}", file=sys.stderr)
-        return 2
+    if argv[2] == "--subject":
+        if len(argv) not in (4, 6) or (len(argv) == 6 and argv[4] != "--db"):
+            print("usage: render-template.py <template> --subject <id> [--db PATH]", file=sys.stderr)
+            return 2
+        db = argv[5] if len(argv) == 6 else os.environ.get("E2E_DB", ".e2e-testing/e2e-tests.sqlite")
+        if not os.path.exists(db):
+            print(f"error: no database at {db}", file=sys.stderr)
+            return 2
+        conn = sqlite3.connect(db)
+        try:
+            context = {"subject": subject_fields(conn, argv[3])}
+        finally:
+            conn.close()
+    else:
+        try:
+            context = json.loads(argv[2])
+        except json.JSONDecodeError as e:
+            print(f"error: invalid JSON context: {e}", file=sys.stderr)
+            return 2
     sys.stdout.write(render(template, context))
     return 0
 
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Per-step helper overhead in /test, with and without scripts/e2e-daemon.py.
+
+A parametrized step renders its action template against a subject, passes
+its evidence through the redactor and checks the page snapshot for visible
+credentials. This times those three calls, each as the separate process
+/test runs, three ways:
+
+    before   sqlite3 -json | python3 -c json.load, render-template.py <json>,
+             redact.py, redact-screenshot.py --quiet (the pre-daemon flow)
+    scripts  the lib.sh helpers with no daemon: render-template.py --subject,
+             redact.py, redact-screenshot.py --quiet
+    daemon   the same helpers through ``python3 -S e2e-client.py``
+
+Each stage is reported as the median over --steps calls, in ms.
+
+Usage:
+    python3 tests/bench/bench-daemon.py [--steps 30] [--credentials 50] [--evidence-kb 16]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import statistics
+import string
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+SCRIPTS = ROOT / "scripts"
+PY = sys.executable
+TEMPLATE = "Navigate to https://{{subject.target_domain}}/admin (redis {{subject.services.redis}})"
+
+
+def make_db(path: Path, credentials: int, rng: random.Random) -> list[str]:
+    """A fresh schema with ``credentials`` credentials and ten apps; returns
+    the stored secret values."""
+    conn = sqlite3.connect(path)
+    conn.executescript((ROOT / "schemas" / "schema.sql").read_text())
+    rand = lambda k: "".join(rng.choice(string.ascii_letters) for _ in range(k))  # noqa: E731
+    secrets = [rand(24) for _ in range(credentials)]
+    conn.executemany("INSERT INTO credentials (id, name, kind, fields) VALUES (?, ?, 'other', ?)",
+                     [(f"CRED-{i:04d}", f"cred-{i}", json.dumps({"host": "h.test", "password": v}))
+                      for i, v in enumerate(secrets)])
+    conn.executemany("INSERT INTO apps (id, name, app_type, target_domain, services) VALUES (?, ?, 'laravel', ?, ?)",
+                     [(f"APP-{i:03d}", f"app{i}", f"app{i}.test", json.dumps({"redis": "7.2"}))
+                      for i in range(1, 11)])
+    conn.commit()
+    conn.close()
+    return secrets
+
+
+def stages(mode: str, db: str, subject: str) -> list[tuple[str, list[str] | str, bool]]:
+    """``(name, argv or shell command, takes stdin)`` for one step."""
+    if mode == "before":
+        lookup = (f"sqlite3 -bail -json '{db}' \"SELECT fields FROM v_subjects_resolved WHERE id='{subject}';\""
+                  " | python3 -c 'import json,sys; d=json.load(sys.stdin); print(d[0][\"fields\"] if d else \"{}\")'")
+        return [("subject", lookup, False),
+                ("render", [PY, str(SCRIPTS / "render-template.py"), TEMPLATE, '{"subject":%s}'], False),
+                ("redact", [PY, str(SCRIPTS / "redact.py"), db], True),
+                ("detect", [PY, str(SCRIPTS / "redact-screenshot.py"), "--db", db, "--quiet"], True)]
+    if mode == "scripts":
+        return [("render", [PY, str(SCRIPTS / "render-template.py"), TEMPLATE, "--subject", subject, "--db", db], False),
+                ("redact", [PY, str(SCRIPTS / "redact.py"), db], True),
+                ("detect", [PY, str(SCRIPTS / "redact-screenshot.py"), "--db", db, "--quiet"], True)]
+    client = [PY, "-S", str(SCRIPTS / "e2e-client.py"), "--db", db]
+    return [("render", client + ["render", TEMPLATE, "--subject", subject], False),
+            ("redact", client + ["redact"], True),
+            ("detect", client + ["detect", "--quiet"], True)]
+
+
+def run_step(mode: str, db: str, subject: str, evidence: bytes, snapshot: bytes,
+             times: dict[str, list[float]]) -> str:
+    subject_json = "{}"
+    rendered = ""
+    for name, cmd, stdin in stages(mode, db, subject):
+        if name == "render" and mode == "before":
+            cmd = cmd[:-1] + [cmd[-1] % subject_json]
+        t0 = time.perf_counter()
+        out = subprocess.run(cmd, shell=isinstance(cmd, str), capture_output=True,
+                             input=(evidence if name == "redact" else snapshot) if stdin else None).stdout
+        times.setdefault(name, []).append(time.perf_counter() - t0)
+        if name == "subject":
+            subject_json = out.decode().strip()
+        elif name == "render":
+            rendered = out.decode()
+    return rendered
+
+
+def main() -> int:
+    p = argparse.ArgumentParser()
+    p.add_argument("--steps", type=int, default=30)
+    p.add_argument("--credentials", type=int, default=50)
+    p.add_argument("--evidence-kb", type=int, default=16)
+    args = p.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = str(Path(tmp) / "e2e-tests.sqlite")
+        secrets = make_db(Path(db), args.credentials, rng)
+        line = "sshd[812]: session opened for user deploy by (uid=0) token=%s\n"
+        evidence = "".join(line % rng.choice(secrets) for _ in range(args.evidence_kb * 1024 // 70)).encode()
+        snapshot = ("- heading 'Settings'\n- textbox 'API token': " + secrets[0] + "\n").encode()
+        env = dict(os.environ, E2E_DB=db)
+
+        results: dict[str, dict[str, list[float]]] = {}
+        for mode in ("before", "scripts", "daemon"):
+            if mode == "daemon":
+                subprocess.run([PY, str(SCRIPTS / "e2e-daemon.py"), "start", "--db", db, "--idle-timeout", "0"],
+                               check=True, env=env, stdout=subprocess.DEVNULL)
+            try:
+                times = results[mode] = {}
+                expected = None
+                for i in range(args.steps):
+                    rendered = run_step(mode, db, f"APP-{i % 10 + 1:03d}", evidence, snapshot, times)
+                    if i == 0:
+                        expected = rendered
+                if not expected.startswith("Navigate to https://app1.test/admin (redis 7.2)"):
+                    print(f"{mode}: unexpected render {expected!r}", file=sys.stderr)
+                    return 1
+            finally:
+                if mode == "daemon":
+                    subprocess.run([PY, str(SCRIPTS / "e2e-daemon.py"), "stop", "--db", db],
+                                   env=env, stdout=subprocess.DEVNULL)
+
+    names = ["subject", "render", "redact", "detect"]
+    print(f"{args.steps} steps, {args.credentials} credentials, {len(evidence) // 1024} KB evidence per step\n")
+    print(f"{'':>8} " + " ".join(f"{n + ' ms':>11}" for n in names) + f" {'step ms':>9} {'vs before':>10}")
+    base = None
+    for mode, times in results.items():
+        med = {n: statistics.median(v) * 1000 for n, v in times.items()}
+        step = sum(med.values())
+        base = base or step
+        cells = " ".join(f"{med[n]:>11.1f}" if n in med else f"{'-':>11}" for n in names)
+        print(f"{mode:>8} {cells} {step:>9.1f} {base / step:>9.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
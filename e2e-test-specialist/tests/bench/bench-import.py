@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""End-to-end import benchmark for scripts/import-ledger.py.
+
+Generates synthetic ledgers at 1x, 10x, 100x and 1000x the size of
+tests/fixtures/sample-ledger.md: directives, infrastructure with credentials,
+an app matrix table, phases of bold-marker tests with numbered steps, a test
+count table and a Test Results Log with bugs. Each one is imported into a
+fresh database, in a fresh process, and the time is split by stage:
+
+    tokenize  markdown → events          parse   events → parsed trees
+    tag       taxonomy load + matching   write   Writer buffering + SQL
+    commit    the final COMMIT           other   everything else in main()
+
+Stage times are exclusive (tag time spent inside Writer.write_phase is not
+also counted as write). Peak RSS is the child process's ru_maxrss.
+
+Usage:
+    python3 tests/bench/bench-import.py [--scales 1,10,100,1000] [--repeat 3]
+        [--jobs N] [--json PATH] [--compare previous.json]
+    python3 tests/bench/bench-import.py --emit 100 > ledger.md
+
+Results go to bench-import-<plugin version>.json (or --json PATH) with the
+Python and SQLite versions next to the numbers; pass an older file to
+--compare to see the ratio per scale.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import functools
+import io
+import json
+import os
+import random
+import resource
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "tests" / "lib"))
+from plugin_scripts import load_script  # noqa: E402
+STAGES = ("tokenize", "parse", "tag", "write", "commit")
+
+WORDS = (
+    "navigate to /admin/sites", "click Save", "ssh root@{host}", "curl -sI https://{domain}/api/health",
+    "docker compose ps", "fill the login form", "open the dashboard", "run php artisan migrate --force",
+    "check the horizon queue", "verify the SSL certificate", "restart nginx", "tail storage/logs/laravel.log",
+)
+FOR_EACH = ("For each app, repeat on its own domain.", "Run this for every viewport.", "")
+
+
+def synthetic_ledger(scale: int, seed: int = 0) -> str:
+    """A deterministic ledger with ``scale`` units, each about the size of the
+    sample: 1 directive, 1 worker + 1 token, 1 app, 2 phases with 1-3 tests,
+    1 results-log round (every third one with bugs)."""
+    rnd = random.Random(seed)
+    directives = ["## Directives", ""]
+    infra = ["## VPS Infrastructure & Credentials", ""]
+    apps = ["## Test App Matrix", "", "| App | Type | DB | Redis | Key Features |", "|---|---|---|---|---|"]
+    phases = ["## E2E Test Phases", ""]
+    counts = ["## Test Count Summary", "", "| Phase | Tests |", "|-------|-------|"]
+    results = ["## Test Results Log", ""]
+    for i in range(scale):
+        host, domain = f"w{i}.example.test", f"app{i}.example.test"
+        directives += [f"### Directive {i}: never {rnd.choice(('drop', 'patch', 'reboot'))} in place",
+                       f"- **Enforcement**: {rnd.choice(('blocking', 'warning', 'advisory'))}",
+                       f"- You MUST NOT touch worker {i} outside a maintenance window.", ""]
+        infra += [f"### Worker {i} — App Server", f"- **Hostname**: {host}", f"- **IP**: 10.{i // 250}.{i % 250}.1",
+                  f"- **SSH Port**: {2200 + i % 100}", f"- **Root Password**: `pw-{i:05d}-{rnd.getrandbits(32):08x}`", "",
+                  f"### API Token {i}", f"- **Token**: ghp_{rnd.getrandbits(120):030x}{i:06d}", ""]
+        apps.append(f"| app{i} | laravel | {rnd.choice(('pg', 'mysql', 'sqlite'))} | {rnd.choice(('yes', '—'))} | feature {i} |")
+        for p in (2 * i, 2 * i + 1):
+            phases += [f"### Phase {p}: Area {p}", f"- Exercise area {p} on {domain}.", ""]
+            n_tests = rnd.randint(1, 3)
+            counts.append(f"| {p} | {n_tests} |")
+            for t in range(1, n_tests + 1):
+                phases.append(f"**{p}.{t} {rnd.choice(WORDS).format(host=host, domain=domain)}**")
+                hint = rnd.choice(FOR_EACH)
+                if hint:
+                    phases.append(hint)
+                for s in range(1, rnd.randint(2, 5) + 1):
+                    phases.append(f"{s}. {rnd.choice(WORDS).format(host=host, domain=domain)}")
+                    if rnd.random() < 0.2:
+                        phases.append("   Expect: no errors in the response body.")
+                phases.append("")
+        results += [f"### 2026-{i % 12 + 1:02d}-{i % 28 + 1:02d} — R-{i + 1:03d} — Round {i + 1}",
+                    f"- {rnd.randint(80, 100)}% of steps passed on {host}.", ""]
+        if i % 3 == 2:
+            results += ["**BUGS FOUND**:",
+                        f"1. **Queue worker stalls on app{i}**. critical data loss when horizon restarts",
+                        f"2. **Footer overlaps on mobile**. minor cosmetic, fixed in {rnd.getrandbits(28):07x}", ""]
+    return "\n".join(["# Synthetic E2E Ledger", ""] + directives + infra + apps + [""]
+                     + phases + counts + [""] + results) + "\n"
+
+
+class StageTimer:
+    """Wraps callables so each stage accumulates its own (exclusive) time."""
+
+    def __init__(self):
+        self.totals = dict.fromkeys(STAGES, 0.0)
+        self._child: list[float] = []
+
+    def wrap(self, stage: str, fn):
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            self._child.append(0.0)
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                dt = time.perf_counter() - t0
+                self.totals[stage] += dt - self._child.pop()
+                if self._child:
+                    self._child[-1] += dt
+        return timed
+
+
+def run_child(ledger: str, db: str, jobs: int) -> dict:
+    """Import ``ledger`` into ``db`` in this process and report stage times."""
+    mod = load_script("import-ledger")
+    timer = StageTimer()
+    mod.tokenize = timer.wrap("tokenize", mod.tokenize)
+    mod.parse_sections = timer.wrap("parse", mod.parse_sections)
+    mod.Tagger.load = staticmethod(timer.wrap("tag", mod.Tagger.load))
+    mod.Tagger.for_text = timer.wrap("tag", mod.Tagger.for_text)
+    for name in ("__init__", "flush", "finish_phases") + tuple(n for n in vars(mod.Writer) if n.startswith("write_")):
+        setattr(mod.Writer, name, timer.wrap("write", getattr(mod.Writer, name)))
+    mod.Writer.commit = timer.wrap("commit", mod.Writer.commit)
+
+    out = io.StringIO()
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(out):
+        rc = mod.main([ledger, "--db", db, "--json-summary", "--no-cache", "--jobs", str(jobs)])
+    total = time.perf_counter() - t0
+    if rc:
+        raise SystemExit(rc)
+    summary = json.loads(out.getvalue())
+    seconds = dict(timer.totals)
+    seconds["other"] = total - sum(seconds.values())
+    seconds["total"] = total
+    return {
+        "seconds": seconds,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        **{k: summary[k] for k in ("phases", "tests", "steps", "credentials", "apps", "runs", "bugs")},
+    }
+
+
+def measure(ledger: Path, jobs: int, repeat: int, workdir: Path) -> dict:
+    """Best-of-``repeat`` import, each into a fresh DB in a fresh process."""
+    best = None
+    schema = (ROOT / "schemas" / "schema.sql").read_text(encoding="utf-8")
+    for n in range(repeat):
+        db = workdir / f"run-{n}" / ".e2e-testing" / "e2e-tests.sqlite"
+        db.parent.mkdir(parents=True)
+        with contextlib.closing(sqlite3.connect(db)) as conn:
+            conn.executescript(schema)
+        proc = subprocess.run(
+            [sys.executable, __file__, "--child", str(ledger), str(db), str(jobs)],
+            capture_output=True, text=True, env={**os.environ, "CLAUDE_PLUGIN_ROOT": str(ROOT)},
+        )
+        if proc.returncode:
+            sys.exit(f"import of {ledger.name} failed:\n{proc.stderr}")
+        res = json.loads(proc.stdout)
+        if best is None or res["seconds"]["total"] < best["seconds"]["total"]:
+            best = res
+    return best
+
+
+def plugin_version() -> str:
+    try:
+        return json.loads((ROOT / ".claude-plugin" / "plugin.json").read_text())["version"]
+    except (OSError, ValueError, KeyError):
+        return "unknown"
+
+
+def main() -> int:
+    p = argparse.ArgumentParser()
+    p.add_argument("--scales", default="1,10,100,1000")
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--jobs", type=int, default=1, help="worker processes (import-ledger.py --jobs)")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--json", help="where to write the results (default bench-import-<version>.json)")
+    p.add_argument("--compare", help="earlier --json output to compare totals against")
+    p.add_argument("--emit", type=int, metavar="SCALE", help="print a generated ledger and exit")
+    p.add_argument("--child", nargs=3, metavar=("LEDGER", "DB", "JOBS"), help=argparse.SUPPRESS)
+    args = p.parse_args()
+
+    if args.child:
+        ledger, db, jobs = args.child
+        print(json.dumps(run_child(ledger, db, int(jobs))))
+        return 0
+    if args.emit is not None:
+        sys.stdout.write(synthetic_ledger(args.emit, args.seed))
+        return 0
+
+    previous = {}
+    if args.compare:
+        previous = {r["scale"]: r for r in json.loads(Path(args.compare).read_text())["results"]}
+
+    results = []
+    print(f"{'scale':>6} {'lines':>8} {'KB':>8} " + " ".join(f"{s:>8}" for s in STAGES)
+          + f" {'total ms':>9} {'RSS MB':>7}" + (f" {'vs prev':>8}" if previous else ""))
+    with tempfile.TemporaryDirectory(prefix="e2e-bench-") as tmp:
+        for scale in (int(s) for s in args.scales.split(",")):
+            text = synthetic_ledger(scale, args.seed)
+            ledger = Path(tmp) / f"ledger-{scale}x.md"
+            ledger.write_text(text, encoding="utf-8")
+            workdir = Path(tmp) / f"{scale}x"
+            res = {"scale": scale, "lines": text.count("\n"), "bytes": len(text.encode("utf-8")),
+                   **measure(ledger, args.jobs, args.repeat, workdir)}
+            results.append(res)
+            sec = res["seconds"]
+            line = (f"{scale:>6} {res['lines']:>8} {res['bytes'] / 1024:>8.1f} "
+                    + " ".join(f"{sec[s] * 1000:>8.1f}" for s in STAGES)
+                    + f" {sec['total'] * 1000:>9.1f} {res['peak_rss_mb']:>7.1f}")
+            if scale in previous:
+                line += f" {sec['total'] / previous[scale]['seconds']['total']:>7.2f}x"
+            print(line)
+
+    report = {
+        "benchmark": "import-ledger",
+        "plugin_version": plugin_version(),
+        "python": sys.version.split()[0],
+        "sqlite": sqlite3.sqlite_version,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "jobs": args.jobs,
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "results": results,
+    }
+    args.json = args.json or f"bench-import-{report['plugin_version']}.json"
+    Path(args.json).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(f"wrote {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Key/value bullet micro-benchmark for scripts/import-ledger.py.
+
+Builds infrastructure sections of ``- **Key**: value`` bullets (every fifth
+line a pipe-separated multi-pair line) at several sizes and times
+``parse_kv_bullets`` — the one-pass ``scan_kv_pairs`` scanner — against the
+earlier line-by-line loop (split, prefix test, INLINE_KV or BULLET_KV per
+line, with the lazy patterns of the time), kept below as the reference.
+Both must return the same dict.
+
+Usage:
+    python3 tests/bench/bench-kv.py [--lines 100,1000,10000] [--repeat 7]
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "tests" / "lib"))
+from plugin_scripts import load_script  # noqa: E402
+
+# The patterns the line-by-line parser used.
+BULLET_KV = re.compile(r"^\s*[-*]\s+\*\*(?P<key>[^*]+?)\*\*[^:\n]*?:\s*(?P<val>.+?)\s*$")
+INLINE_KV = re.compile(r"\*\*(?P<key>[^*]+?)\*\*\s*:\s*(?P<val>[^|*]+?)(?=\s*\||$)")
+
+
+def line_by_line(mod, block) -> dict[str, str]:
+    """The parser before scan_kv_pairs: one regex decision per line."""
+    out: dict[str, str] = {}
+    for line in block.lines():
+        if line.lstrip().startswith(("-", "*")) and "|" in line and "**" in line:
+            for m in INLINE_KV.finditer(line):
+                key = m.group("key").lower().strip()
+                val = m.group("val").strip().rstrip("|").strip()
+                if val.startswith("`") and val.endswith("`"):
+                    val = val[1:-1]
+                if key and val:
+                    out[key] = val
+            continue
+        m = BULLET_KV.match(line)
+        if m:
+            key = m.group("key").lower().strip()
+            val = m.group("val").strip()
+            if val.startswith("`") and val.endswith("`"):
+                val = val[1:-1]
+            out[key] = val
+    return out
+
+
+def infra_section(lines: int) -> str:
+    out = ["## VPS Infrastructure & Credentials", "", "### Fleet"]
+    for n in range(lines):
+        if n % 5 == 4:
+            out.append(f"- **IP {n}**: 10.0.{n // 256 % 256}.{n % 256} | **SSH Port {n}**: `{2200 + n % 100}`")
+        else:
+            out.append(f"- **Setting {n}** (host w{n % 9}): value-{n} for the worker pool")
+    return "\n".join(out) + "\n"
+
+
+def best_of(repeat: int, fn, *args) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> int:
+    p = argparse.ArgumentParser()
+    p.add_argument("--lines", default="100,1000,10000")
+    p.add_argument("--repeat", type=int, default=7)
+    args = p.parse_args()
+
+    mod = load_script("import-ledger")
+    print(f"{'lines':>7} {'pairs':>7} {'scan ms':>9} {'lines ms':>9} {'us/line':>8} {'speedup':>8}")
+    for lines in (int(s) for s in args.lines.split(",")):
+        (_, block), = mod.tokenize(infra_section(lines)).block().sections(mod.TOK_H2)
+        (_, fleet), = block.sections(mod.TOK_H3)
+        pairs = mod.parse_kv_bullets(fleet)
+        if pairs != line_by_line(mod, fleet):
+            print(f"{lines}: scan_kv_pairs disagrees with the line-by-line parser", file=sys.stderr)
+            return 1
+        scan = best_of(args.repeat, mod.parse_kv_bullets, fleet)
+        old = best_of(args.repeat, line_by_line, mod, fleet)
+        print(f"{lines:>7} {len(pairs):>7} {scan * 1000:>9.2f} {old * 1000:>9.2f} "
+              f"{scan * 1e6 / lines:>8.2f} {old / scan:>7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
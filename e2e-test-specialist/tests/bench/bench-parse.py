@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Parser scaling benchmark for scripts/import-ledger.py.
+
+Builds ledgers at 1x, 10x, 100x and 1000x the size of
+tests/fixtures/sample-ledger.md (every ### subsection repeated, phases
+renumbered) and times tokenize + every section parser. No database is touched.
+
+Usage:
+    python3 tests/bench/bench-parse.py [--scales 1,10,100,1000] [--repeat 3] [--jobs N]
+
+Import time should grow linearly with ledger size: the "us/line" column stays
+roughly flat across scales. Compare --jobs 1 against --jobs N to see what the
+process pool buys on this machine (it only pays off with several cores and
+ledgers in the megabyte range).
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "tests" / "lib"))
+from plugin_scripts import load_script  # noqa: E402
+
+
+def scaled_ledger(sample: str, scale: int) -> str:
+    """Repeat every ### subsection of the sample ``scale`` times."""
+    out: list[str] = []
+    phase_no = 0
+    for chunk in re.split(r"(?m)^(?=## )", sample):
+        head, _, body = chunk.partition("\n")
+        if not head.startswith("## "):
+            out.append(chunk)
+            continue
+        parts = re.split(r"(?m)^(?=### )", body)
+        out.append(head + "\n" + parts[0])
+        subs = parts[1:]
+        if not subs:
+            # Tables (app matrix, counts) — repeat the data rows instead.
+            lines = body.splitlines()
+            rows = [l for l in lines if l.startswith("|") and not set(l) <= set("|-: ")][1:]
+            out.append(body + "\n".join(rows * (scale - 1)) + "\n")
+            continue
+        for n in range(scale):
+            for sub in subs:
+                if sub.startswith("### Phase "):
+                    sub = re.sub(r"^### Phase \d+", f"### Phase {phase_no}", sub)
+                    phase_no += 1
+                else:
+                    title, _, rest = sub.partition("\n")
+                    sub = f"{title} ({n})\n{rest}"
+                out.append(sub)
+    return "".join(out)
+
+
+def parse_all(mod, text: str, jobs: int = 1) -> int:
+    ledger = mod.tokenize(text)
+    sections = ledger.block().sections(mod.TOK_H2)
+    n = 0
+    for (heading, _), result in zip(sections, mod.parse_sections(sections, jobs)):
+        kind = mod.detect_section(heading)
+        if kind in ("directives", "counts"):
+            n += len(result)
+        elif kind in ("infra", "distribution", "results"):
+            n += sum(map(len, result))
+        elif kind == "apps":
+            n += len(result[0])
+        elif kind == "phases":
+            n += sum(len(p.tests) for p in result)
+    return n
+
+
+def main() -> int:
+    p = argparse.ArgumentParser()
+    p.add_argument("--scales", default="1,10,100,1000")
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--jobs", type=int, default=1, help="worker processes (import-ledger.py --jobs)")
+    args = p.parse_args()
+
+    mod = load_script("import-ledger")
+    sample = (ROOT / "tests" / "fixtures" / "sample-ledger.md").read_text(encoding="utf-8")
+
+    print(f"{'scale':>6} {'lines':>8} {'KB':>8} {'best ms':>9} {'us/line':>8} {'items':>7}")
+    for scale in (int(s) for s in args.scales.split(",")):
+        text = scaled_ledger(sample, scale)
+        lines = text.count("\n") + 1
+        best = float("inf")
+        items = 0
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            items = parse_all(mod, text, args.jobs)
+            best = min(best, time.perf_counter() - t0)
+        print(f"{scale:>6} {lines:>8} {len(text) / 1024:>8.1f} {best * 1000:>9.2f} "
+              f"{best * 1e6 / lines:>8.2f} {items:>7}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
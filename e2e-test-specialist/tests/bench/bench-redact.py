@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""Redaction throughput benchmark for scripts/redact.py.
+
+Builds SSH-log-like text of several sizes with stored secrets sprinkled
+through it, and times ``Redactor.redact`` — find every value, copy once —
+against the earlier loop (sort longest first, one ``str.replace`` per value)
+and against two single-pass matchers: one longest-first alternation of the
+escaped values, and the same as a prefix trie so shared prefixes are tested
+once. All of them must produce the same text on this input. The two regex
+columns are why the Redactor scans once per value with ``str.find``:
+CPython's regex engine tries the alternation at nearly every position, and
+only the trie catches up, with many hundreds of secrets. A single pass is
+also leftmost-first. When a shorter value starts inside the text just
+before a longer one it overlaps, the shorter one wins, and the rest of the
+longer secret stays in clear. The Redactor masks the longer one, as the
+replace loop did; the run prints one such case. Detection is timed as well: ``Redactor.detect``
+(full, and ``first=True`` as ``redact-screenshot.py --quiet`` runs it), and so
+is ``Redactor.redact_stream`` in 64 KiB chunks, as the redact.py CLI runs.
+
+A second table times ``Redactor.from_db`` on databases of 20–1000
+credentials. A third redacts a synthetic run directory (--tree-files files,
+one in ten with secrets, a few over the mmap threshold): one ``redact.py``
+process per file as before, ``--tree`` serially and in a pool, and a second
+``--tree`` pass that skips by hash.
+
+Usage:
+    python3 tests/bench/bench-redact.py [--mb 1,5,20] [--secrets 10,50,200,1000] [--repeat 3]
+                                        [--credentials 20,200,1000] [--tree-files 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import random
+import re
+import shutil
+import sqlite3
+import string
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "scripts"))
+from redact import CHUNK_SIZE, Redactor  # noqa: E402
+
+WORDS = ("sshd Accepted publickey for root from 10.0.0.1 port 22 session opened closed "
+         "deploy step ok error warning composer install artisan migrate --force").split()
+
+
+def make_secrets(n: int, rng: random.Random) -> list[tuple[str, str, str]]:
+    alphabet = string.ascii_letters + string.digits + "_-!$"
+    values: set[str] = set()
+    while len(values) < n:
+        values.add("".join(rng.choice(alphabet) for _ in range(rng.randint(8, 48))))
+    return [(v, f"cred-{i}", "password") for i, v in enumerate(sorted(values))]
+
+
+def make_text(mb: float, secrets: list[tuple[str, str, str]], rng: random.Random) -> str:
+    lines: list[str] = []
+    size = 0
+    while size < mb * 1_000_000:
+        line = " ".join(rng.choice(WORDS) for _ in range(12))
+        if rng.random() < 0.01:
+            line += " token=" + rng.choice(secrets)[0]
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+
+def replace_loop(secrets: list[tuple[str, str, str]], text: str) -> str:
+    """redact.py before the Redactor: one full-text replace per value."""
+    for value, name, key in sorted(secrets, key=lambda p: -len(p[0])):
+        text = text.replace(value, f"[redacted:{name}:{key}]")
+    return text
+
+
+def alternation_regex(values: list[str]) -> re.Pattern:
+    """One regex for all values, longest first: at each position the first
+    (longest) value that matches wins."""
+    return re.compile("|".join(map(re.escape, sorted(values, key=len, reverse=True))))
+
+
+def trie_regex(values: list[str]) -> re.Pattern:
+    """One regex for all values; at each position the longest value wins."""
+    root: dict = {}
+    for v in values:
+        node = root
+        for ch in v:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        end = "" in node
+        alts = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        return f"(?:{body})?" if end else body
+
+    return re.compile(build(root))
+
+
+def stream(redactor: Redactor, text: str) -> str:
+    out = io.StringIO()
+    redactor.redact_stream(io.StringIO(text), out, CHUNK_SIZE)
+    return out.getvalue()
+
+
+def credentials_db(path: Path, n: int, rng: random.Random):
+    """A fresh schema with ``n`` credentials: a password and a token each,
+    a 1.6 KB private key on every tenth."""
+    conn = sqlite3.connect(path)
+    conn.executescript((ROOT / "schemas" / "schema.sql").read_text())
+    rand = lambda k: "".join(rng.choice(string.ascii_letters) for _ in range(k))  # noqa: E731
+    conn.executemany("INSERT INTO credentials (id, name, kind, fields) VALUES (?, ?, 'other', ?)", [
+        (f"CRED-{i:04d}", f"cred-{i}", json.dumps({
+            "host": "h.example.test", "password": rand(16), "token": rand(40),
+            **({"private_key": rand(1600)} if i % 10 == 0 else {})}))
+        for i in range(n)])
+    conn.commit()
+    conn.close()
+
+
+def run_tree(root: Path, n: int, secrets: list[str], rng: random.Random):
+    """``n`` evidence files under ``root``: one in ten holds a secret and one
+    in fifty is 2 MB."""
+    for i in range(n):
+        path = root / f"phase-{i % 10}" / f"step-{i:04d}.log"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        lines = [" ".join(rng.choice(WORDS) for _ in range(12)) for _ in range(200)]
+        if i % 10 == 0:
+            lines[rng.randrange(len(lines))] += " password=" + rng.choice(secrets)
+        text = "\n".join(lines) + "\n"
+        if i % 50 == 1:
+            text *= 2_000_000 // len(text) + 1
+        path.write_text(text)
+
+
+def tree_table(n: int, rng: random.Random):
+    redact = str(ROOT / "scripts" / "redact.py")
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "e2e-tests.sqlite"
+        credentials_db(db, 50, rng)
+        conn = sqlite3.connect(db)
+        secrets = [json.loads(f)["password"] for (f,) in conn.execute("SELECT fields FROM credentials")]
+        conn.close()
+        src = Path(tmp) / "run"
+        run_tree(src, n, secrets, rng)
+        files = sorted(p for p in src.rglob("*") if p.is_file())
+        mb = sum(p.stat().st_size for p in files) / 1e6
+
+        def per_file():
+            for p in files:
+                with open(p) as fin, open(os.devnull, "w") as fout:
+                    subprocess.run([sys.executable, redact, str(db)], stdin=fin, stdout=fout, check=True)
+
+        def tree(jobs: int, keep: bool = False):
+            out = Path(tmp) / "share"
+            if not keep:
+                shutil.rmtree(out, ignore_errors=True)
+            subprocess.run([sys.executable, redact, str(db), "--tree", str(src), "--out", str(out),
+                            "--jobs", str(jobs)], check=True, stdout=subprocess.DEVNULL)
+
+        rows = [("one process per file", per_file), ("--tree --jobs 1", lambda: tree(1)),
+                (f"--tree --jobs {os.cpu_count()}", lambda: tree(os.cpu_count() or 1)),
+                ("--tree rerun (unchanged)", lambda: tree(os.cpu_count() or 1, keep=True))]
+        print(f"\n{n} files, {mb:.1f} MB ({os.cpu_count()} CPUs)")
+        print(f"{'':>26} {'s':>7} {'MB/s':>7}")
+        for label, fn in rows:
+            t0 = time.perf_counter()
+            fn()
+            dt = time.perf_counter() - t0
+            print(f"{label:>26} {dt:>7.2f} {mb / dt:>7.1f}")
+
+
+def best_of(repeat: int, fn, *args) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> int:
+    p = argparse.ArgumentParser()
+    p.add_argument("--mb", default="1,5,20")
+    p.add_argument("--secrets", default="10,50,200,1000")
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--credentials", default="20,200,1000")
+    p.add_argument("--tree-files", type=int, default=200, help="0 skips the --tree table")
+    args = p.parse_args()
+
+    rng = random.Random(42)
+    overlap = [("aaaaaa", "short", "password"), ("aaaaaabbbbbbbbbb", "long", "password")]
+    text = "x aaaaaaabbbbbbbbbb y"
+    print(f"overlapping values {text!r}:\n  Redactor      {Redactor(overlap).redact(text)!r}\n"
+          f"  single pass   {alternation_regex([v for v, _, _ in overlap]).sub('[..]', text)!r}\n")
+    print(f"{'MB':>5} {'secrets':>7} {'redact ms':>10} {'MB/s':>7} {'loop ms':>9} {'speedup':>8}"
+          f" {'alt ms':>9} {'trie ms':>9} {'stream ms':>10} {'detect ms':>10} {'first ms':>9}")
+    for n in (int(s) for s in args.secrets.split(",")):
+        secrets = make_secrets(n, rng)
+        t0 = time.perf_counter()
+        redactor = Redactor(secrets)
+        prepare_ms = (time.perf_counter() - t0) * 1000
+        alt, trie = alternation_regex(redactor.values), trie_regex(redactor.values)
+        markers = redactor.markers
+        for mb in (float(s) for s in args.mb.split(",")):
+            text = make_text(mb, secrets, rng)
+            by_alt = lambda t: alt.sub(lambda m: markers[m.group()], t)  # noqa: E731
+            by_trie = lambda t: trie.sub(lambda m: markers[m.group()], t)  # noqa: E731
+            out = redactor.redact(text)
+            if {replace_loop(secrets, text), by_alt(text), by_trie(text), stream(redactor, text)} != {out}:
+                print(f"{mb} MB / {n} secrets: Redactor disagrees with the references", file=sys.stderr)
+                return 1
+            new = best_of(args.repeat, redactor.redact, text)
+            old = best_of(args.repeat, replace_loop, secrets, text)
+            rx_alt = best_of(args.repeat, by_alt, text)
+            rx_trie = best_of(args.repeat, by_trie, text)
+            streamed = best_of(args.repeat, stream, redactor, text)
+            det = best_of(args.repeat, redactor.detect, text)
+            first = best_of(args.repeat, redactor.detect, text, True)
+            print(f"{mb:>5g} {n:>7} {new * 1000:>10.1f} {len(text) / 1e6 / new:>7.1f} {old * 1000:>9.1f} "
+                  f"{old / new:>7.2f}x {rx_alt * 1000:>9.1f} {rx_trie * 1000:>9.1f} {streamed * 1000:>10.1f} "
+                  f"{det * 1000:>10.1f} "
+                  f"{first * 1000:>9.2f}")
+        print(f"      ({n} secrets prepared in {prepare_ms:.2f} ms)")
+
+    print(f"\n{'credentials':>11} {'from_db ms':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in (int(s) for s in args.credentials.split(",")):
+            db = Path(tmp) / f"{n}" / "e2e-tests.sqlite"
+            db.parent.mkdir()
+            credentials_db(db, n, rng)
+            prepare = best_of(args.repeat * 10, Redactor.from_db, str(db))
+            print(f"{n:>11} {prepare * 1000:>11.2f}")
+
+    if args.tree_files:
+        tree_table(args.tree_files, rng)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -47,3 +47,29 @@ sqlite3 "$E2E_DB" "
     INSERT INTO tests (id, phase_id, title, test_order)
     VALUES ('T-00.05','P00','plain', 5);
 " || { echo "default applies_to rejected"; exit 1; }
+
+# The importer validates applies_to in Python and suspends these triggers only
+# for its own bulk insert: unknown subjects are rejected before anything is
+# written, and both triggers are back in place afterwards.
+cat > roles-ledger.md <<'MD'
+## E2E Test Phases
+
+### Phase 7: Per-role access
+
+**7.1 Dashboard per role**
+For each role, open the dashboard.
+1. Navigate to /dashboard
+MD
+if python3 "$CLAUDE_PLUGIN_ROOT/scripts/import-ledger.py" roles-ledger.md >/dev/null 2>import.err; then
+    echo "importer accepted unseeded ROLE-* subjects"
+    exit 1
+fi
+grep -q "ROLE-user" import.err || { echo "importer error does not name the subject:"; cat import.err; exit 1; }
+[[ "$(sqlite3 "$E2E_DB" "SELECT COUNT(*) FROM phases WHERE id = 'P07';")" == "0" ]] \
+    || { echo "rejected import left rows behind"; exit 1; }
+
+sqlite3 "$E2E_DB" "INSERT INTO roles (id, name) VALUES ('ROLE-user', 'user'), ('ROLE-guest', 'guest');"
+python3 "$CLAUDE_PLUGIN_ROOT/scripts/import-ledger.py" roles-ledger.md >/dev/null \
+    || { echo "import with seeded roles failed"; exit 1; }
+n="$(sqlite3 "$E2E_DB" "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_tests_applies_to_validate_%';")"
+[[ "$n" == "2" ]] || { echo "applies_to triggers missing after import (found $n)"; exit 1; }
@@ -32,9 +32,79 @@ assert_count test_steps 4
 tag_links="$(sqlite3 "$E2E_DB" "SELECT COUNT(*) FROM test_tags;")"
 [[ "$tag_links" -ge 1 ]] || { echo "no auto-tags applied (got $tag_links)"; exit 1; }
 
-# Re-importing should be idempotent for tests/phases/steps (INSERT OR REPLACE)
+# The bulk load rebuilds memories_fts in one pass and checks foreign keys per
+# table instead of per row; the result must be indistinguishable.
+hits="$(sqlite3 "$E2E_DB" "SELECT COUNT(*) FROM memories_fts WHERE memories_fts MATCH 'seconds';")"
+[[ "$hits" -ge 1 ]] || { echo "imported memory not searchable"; exit 1; }
+sqlite3 "$E2E_DB" "INSERT INTO memories_fts(memories_fts) VALUES('integrity-check');" \
+    || { echo "memories_fts out of sync with memories"; exit 1; }
+orphans="$(sqlite3 "$E2E_DB" "PRAGMA foreign_key_check;")"
+[[ -z "$orphans" ]] || { echo "dangling references after import: $orphans"; exit 1; }
+n="$(sqlite3 "$E2E_DB" "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name = 'memories_ai';")"
+[[ "$n" == "1" ]] || { echo "memories_ai trigger missing after import"; exit 1; }
+
+# The deferred check fails an import only on rows it wrote: a violation the
+# database already had (a test whose phase was deleted by hand) is left alone.
+sqlite3 orphan.sqlite < "$CLAUDE_PLUGIN_ROOT/schemas/schema.sql" >/dev/null
+sqlite3 orphan.sqlite "PRAGMA foreign_keys = OFF;
+  INSERT INTO tests (id, phase_id, title, test_order) VALUES ('T-99.01', 'P99', 'orphan', 1);"
+python3 "$CLAUDE_PLUGIN_ROOT/scripts/import-ledger.py" "$CLAUDE_PLUGIN_ROOT/tests/fixtures/mini-ledger.md" \
+    --db orphan.sqlite >orphan.out 2>&1 \
+    || { echo "pre-existing FK violation failed the import"; cat orphan.out; exit 1; }
+orphans="$(sqlite3 orphan.sqlite "SELECT group_concat(rowid) FROM pragma_foreign_key_check('tests');")"
+[[ "$orphans" == "1" ]] || { echo "expected only the pre-existing orphan, got '$orphans'"; exit 1; }
+
+# Phase markdown compresses well enough to go to text_blobs; the short test
+# blocks and run summary stay inline. The views read both back verbatim.
+blobs="$(sqlite3 "$E2E_DB" "SELECT COUNT(*) FROM phases WHERE raw_blob IS NOT NULL AND raw_markdown IS NULL;")"
+[[ "$blobs" == "2" ]] || { echo "expected both phases in text_blobs, got $blobs"; exit 1; }
+sqlite3 "$E2E_DB" "SELECT raw_markdown FROM v_phase_markdown WHERE id = 'P00';" > p00.md
+sqlite3 "$E2E_DB" "SELECT raw_markdown FROM v_test_markdown WHERE id = 'T-00.01';" > t0001.md
+sqlite3 "$E2E_DB" "SELECT final_state FROM v_run_final_state LIMIT 1;" > run.md
+python3 "$CLAUDE_PLUGIN_ROOT/scripts/export-ledger.py" --include-history > exported.md
+python3 - "$CLAUDE_PLUGIN_ROOT/tests/fixtures/mini-ledger.md" <<'PY' || exit 1
+import sys
+ledger = open(sys.argv[1]).read()
+phase, test, run = (open(f).read().strip() for f in ("p00.md", "t0001.md", "run.md"))
+assert test and test in phase and phase in ledger, phase
+assert run and run in ledger and run in open("exported.md").read(), run
+PY
+
+# Re-importing should be idempotent for tests/phases/steps (content-hash upserts)
 python3 "$CLAUDE_PLUGIN_ROOT/scripts/import-ledger.py" \
     "$CLAUDE_PLUGIN_ROOT/tests/fixtures/mini-ledger.md" >/dev/null 2>&1
 
 phase_count_2="$(sqlite3 "$E2E_DB" "SELECT COUNT(*) FROM phases;")"
 [[ "$phase_count_2" -ge 2 ]] || { echo "phases lost on re-import: $phase_count_2"; exit 1; }
+
+# --profile / E2E_PROFILE=1 add timings, statement shapes and row counts.
+E2E_PROFILE=1 python3 "$CLAUDE_PLUGIN_ROOT/scripts/import-ledger.py" \
+    "$CLAUDE_PLUGIN_ROOT/tests/fixtures/mini-ledger.md" --no-cache --json-summary > profile.json
+python3 - profile.json <<'PY' || exit 1
+import json, sys
+prof = json.load(open(sys.argv[1])).get("profile")
+assert prof, "no profile in summary"
+assert prof["functions"]["parse_phases_section"]["calls"] == 1, prof["functions"]
+assert any(s["statement"].startswith("INSERT INTO memories") for s in prof["sql"]), prof["sql"]
+assert prof["peak_rss_mb"] > 0 and "commit" in prof["stages_ms"], prof
+PY
+
+# A long memory body goes to text_blobs as well. memories_fts reads it back
+# through v_memory_body whether the batch rebuilt the index (first import into
+# an empty table) or was indexed row by row (second import).
+python3 - <<'PY'
+body = "\n".join(f"- Node {i} runs the kubelet behind the bastion host." for i in range(40))
+open("notes.md", "w").write(f"# Ledger\n\n## Deployment Notes\n\n{body}\n")
+PY
+sqlite3 notes.sqlite < "$CLAUDE_PLUGIN_ROOT/schemas/schema.sql" >/dev/null
+for _ in 1 2; do
+    python3 "$CLAUDE_PLUGIN_ROOT/scripts/import-ledger.py" notes.md --db notes.sqlite >/dev/null
+done
+inline="$(sqlite3 notes.sqlite "SELECT COUNT(*) FROM memories WHERE body_blob IS NULL OR body <> '';")"
+[[ "$inline" == "0" ]] || { echo "expected both memory bodies in text_blobs, got $inline inline"; exit 1; }
+sqlite3 notes.sqlite "SELECT body FROM v_memory_body WHERE id = 'M-002';" > m002.md
+diff <(sed -n '5,$p' notes.md) m002.md >/dev/null || { echo "v_memory_body does not return the body"; exit 1; }
+hits="$(sqlite3 notes.sqlite "SELECT COUNT(*) FROM memories_fts WHERE memories_fts MATCH 'kubelet';")"
+[[ "$hits" == "2" ]] || { echo "expected both blob-backed memories searchable, got $hits"; exit 1; }
+sqlite3 notes.sqlite "INSERT INTO memories_fts(memories_fts) VALUES('integrity-check');" \
+    || { echo "memories_fts out of sync with v_memory_body"; exit 1; }
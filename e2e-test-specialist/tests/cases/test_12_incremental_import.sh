@@ -0,0 +1,94 @@
+#!/usr/bin/env bash
+# Verify re-imports are incremental: unchanged phases/tests are skipped by
+# content hash, an edited test is rewritten in place, and a removed test is
+# reported (and soft-deleted only with --deprecate-missing).
+set -euo pipefail
+
+bash "$CLAUDE_PLUGIN_ROOT/scripts/init-db.sh" >/dev/null
+
+IMPORTER="$CLAUDE_PLUGIN_ROOT/scripts/import-ledger.py"
+cp "$CLAUDE_PLUGIN_ROOT/tests/fixtures/mini-ledger.md" ledger.md
+
+changes() {  # changes <summary.json> <phases|tests> → "added changed unchanged removed"
+    python3 -c 'import json,sys; c=json.load(open(sys.argv[1]))["changes"][sys.argv[2]]; print(c["added"], c["changed"], c["unchanged"], c["removed"])' "$1" "$2"
+}
+
+python3 "$IMPORTER" ledger.md --json-summary > first.json
+[[ "$(changes first.json tests)" == "4 0 0 0" ]] || { echo "first import: $(changes first.json tests)"; exit 1; }
+
+# A hand-added tag and a recorded execution must survive re-imports; an auto
+# tag the ledger no longer produces must not. A hand-made link to an auto tag
+# (shared-auto) is manual too, although the importer links that name elsewhere.
+sqlite3 "$E2E_DB" "
+    INSERT INTO tags (name, auto) VALUES ('flaky-manual', 0), ('stale-auto', 1), ('shared-auto', 1);
+    INSERT INTO test_tags (test_id, tag_name, auto) VALUES
+        ('T-00.01', 'flaky-manual', 0), ('T-00.01', 'stale-auto', 1),
+        ('T-00.01', 'shared-auto', 0), ('T-01.01', 'shared-auto', 1);
+    INSERT INTO test_runs (id, status) VALUES ('R-900', 'completed');
+    INSERT INTO step_executions (id, run_id, test_id, step_id, status)
+    VALUES ('E-900', 'R-900', 'T-00.02', 'S-00.02.002', 'passed');
+"
+
+python3 "$IMPORTER" ledger.md --json-summary > same.json
+[[ "$(changes same.json phases)" == "0 0 2 0" ]] || { echo "unchanged phases: $(changes same.json phases)"; exit 1; }
+[[ "$(changes same.json tests)" == "0 0 4 0" ]] || { echo "unchanged tests: $(changes same.json tests)"; exit 1; }
+
+# Edit one step of T-00.01 and drop T-00.02 entirely.
+python3 - <<'PY'
+from pathlib import Path
+p = Path("ledger.md")
+s = p.read_text()
+s = s.replace("2. Verify HTTP 200 and the app title is visible.", "2. Verify HTTP 200 and the footer is visible.")
+start = s.index("**0.2 Login form renders**")
+s = s[:start] + s[s.index("### Phase 1"):]
+p.write_text(s)
+PY
+
+python3 "$IMPORTER" ledger.md --json-summary > edit.json
+[[ "$(changes edit.json tests)" == "0 1 2 1" ]] || { echo "after edit: $(changes edit.json tests)"; exit 1; }
+
+action="$(sqlite3 "$E2E_DB" "SELECT action FROM test_steps WHERE id = 'S-00.01.002';")"
+[[ "$action" == *footer* ]] || { echo "edited step not rewritten: $action"; exit 1; }
+manual="$(sqlite3 "$E2E_DB" "SELECT COUNT(*) FROM test_tags WHERE test_id = 'T-00.01' AND tag_name = 'flaky-manual';")"
+[[ "$manual" == "1" ]] || { echo "manual tag dropped on rewrite"; exit 1; }
+shared="$(sqlite3 "$E2E_DB" "SELECT COUNT(*) FROM test_tags WHERE test_id = 'T-00.01' AND tag_name = 'shared-auto';")"
+[[ "$shared" == "1" ]] || { echo "hand-made link to an auto tag dropped on rewrite"; exit 1; }
+stale="$(sqlite3 "$E2E_DB" "SELECT COUNT(*) FROM tags WHERE name = 'stale-auto';")"
+pruned="$(python3 -c 'import json,sys; print(json.load(open(sys.argv[1]))["tags_pruned"])' edit.json)"
+[[ "$stale $pruned" == "0 1" ]] || { echo "stale auto tag not pruned (left: $stale, pruned: $pruned)"; exit 1; }
+kept="$(sqlite3 "$E2E_DB" "SELECT COUNT(*) FROM test_tags WHERE test_id = 'T-00.01';")"
+[[ "$kept" -ge 2 ]] || { echo "rewritten test lost its current tags ($kept left)"; exit 1; }
+live="$(sqlite3 "$E2E_DB" "SELECT deprecated_at IS NULL FROM tests WHERE id = 'T-00.02';")"
+[[ "$live" == "1" ]] || { echo "removed test deprecated without --deprecate-missing"; exit 1; }
+orphans="$(sqlite3 "$E2E_DB" "SELECT COUNT(*) FROM text_blobs WHERE hash NOT IN (
+    SELECT raw_blob FROM phases WHERE raw_blob IS NOT NULL
+    UNION SELECT raw_blob FROM tests WHERE raw_blob IS NOT NULL
+    UNION SELECT final_state_blob FROM test_runs WHERE final_state_blob IS NOT NULL);")"
+[[ "$orphans" == "0" ]] || { echo "$orphans text blob(s) of rewritten rows left behind"; exit 1; }
+
+python3 "$IMPORTER" ledger.md --json-summary --deprecate-missing > dep.json
+reason="$(sqlite3 "$E2E_DB" "SELECT deprecated_reason FROM tests WHERE id = 'T-00.02';")"
+[[ "$reason" == "removed from ledger" ]] || { echo "T-00.02 not deprecated: '$reason'"; exit 1; }
+
+# Restoring the ledger brings the test back.
+cp "$CLAUDE_PLUGIN_ROOT/tests/fixtures/mini-ledger.md" ledger.md
+python3 "$IMPORTER" ledger.md >/dev/null
+live="$(sqlite3 "$E2E_DB" "SELECT deprecated_at IS NULL FROM tests WHERE id = 'T-00.02';")"
+[[ "$live" == "1" ]] || { echo "reappearing test still deprecated"; exit 1; }
+
+# The parse cache: a dry run followed by the real import parses once, and
+# writing a new entry evicts ones past import.cache_max_age_days.
+cache_state() { python3 -c 'import json,sys; print(json.load(open(sys.argv[1]))["parse_cache"])' "$1"; }
+echo "**9.9 Cache probe**" >> ledger.md
+python3 "$IMPORTER" ledger.md --dry-run --json-summary > dry.json
+python3 "$IMPORTER" ledger.md --json-summary > real.json
+[[ "$(cache_state dry.json) $(cache_state real.json)" == "miss hit" ]] \
+    || { echo "parse cache: $(cache_state dry.json) then $(cache_state real.json)"; exit 1; }
+cache_dir="$(dirname "$E2E_DB")/cache"
+touch -d '30 days ago' "$cache_dir/parsed-stale.json.z" "$cache_dir/tagger-other.json"
+echo "**9.10 Cache probe**" >> ledger.md
+python3 "$IMPORTER" ledger.md >/dev/null
+[[ ! -e "$cache_dir/parsed-stale.json.z" ]] || { echo "stale cache entry not evicted"; exit 1; }
+[[ -e "$cache_dir/tagger-other.json" ]] || { echo "parse cache pruned another cache's file"; exit 1; }
+python3 "$IMPORTER" ledger.md --no-cache --json-summary > nocache.json
+[[ "$(cache_state nocache.json)" == "off" ]] || { echo "--no-cache still used the cache"; exit 1; }
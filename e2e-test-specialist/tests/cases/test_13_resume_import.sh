@@ -0,0 +1,97 @@
+#!/usr/bin/env bash
+# Verify the chunk-committed Test Results Log import: an import interrupted
+# after a checkpoint keeps the committed chunks, --resume finishes it without
+# duplicating runs, bugs, memories or directives (also with the results log
+# parsed in a pool), and the cursor is cleared. The cursor is a byte offset
+# into the ledger file, so a CRLF ledger with non-ASCII text resumes at the
+# right run too.
+set -euo pipefail
+
+bash "$CLAUDE_PLUGIN_ROOT/scripts/init-db.sh" >/dev/null
+
+IMPORTER="$CLAUDE_PLUGIN_ROOT/scripts/import-ledger.py"
+python3 "$CLAUDE_PLUGIN_ROOT/tests/bench/bench-import.py" --emit 6 > ledger.md
+
+counts() {  # counts <db> → "runs bugs memories directives"
+    sqlite3 "$1" "SELECT (SELECT COUNT(*) FROM test_runs), (SELECT COUNT(*) FROM bugs),
+                         (SELECT COUNT(*) FROM memories), (SELECT COUNT(*) FROM directives);" | tr '|' ' '
+}
+
+# Reference: the same ledger in one transaction.
+mkdir -p ref/.e2e-testing
+sqlite3 ref/.e2e-testing/e2e-tests.sqlite < "$CLAUDE_PLUGIN_ROOT/schemas/schema.sql" >/dev/null
+python3 "$IMPORTER" ledger.md --db ref/.e2e-testing/e2e-tests.sqlite --chunk-runs 0 --no-cache >/dev/null
+expected="$(counts ref/.e2e-testing/e2e-tests.sqlite)"
+
+# Checkpoint every 2 runs and die while writing the 4th.
+cat > crash.py <<'PY'
+import sys
+from plugin_scripts import load_script
+mod = load_script("import-ledger")
+write_run, seen = mod.Writer.write_run, []
+def crash(self, r):
+    seen.append(r["id"])
+    if len(seen) == 4:
+        raise KeyboardInterrupt
+    write_run(self, r)
+mod.Writer.write_run = crash
+sys.exit(mod.main([*sys.argv[1:], "--chunk-runs", "2", "--no-cache"]))
+PY
+if python3 crash.py ledger.md 2>/dev/null; then
+    echo "interrupted import exited 0"
+    exit 1
+fi
+runs="$(sqlite3 "$E2E_DB" "SELECT COUNT(*) FROM test_runs;")"
+[[ "$runs" == "2" ]] || { echo "expected the first chunk (2 runs) committed, got $runs"; exit 1; }
+cursor="$(sqlite3 "$E2E_DB" "SELECT import_cursor FROM state WHERE id = 1;")"
+[[ -n "$cursor" ]] || { echo "no resume cursor after interruption"; exit 1; }
+
+# A different ledger must not be resumed onto this cursor.
+echo "" >> other.md && cat ledger.md >> other.md
+if python3 "$IMPORTER" other.md --resume >/dev/null 2>&1; then
+    echo "--resume accepted a different ledger"
+    exit 1
+fi
+
+python3 "$IMPORTER" ledger.md --resume --chunk-runs 2 --jobs 2 --json-summary > resumed.json \
+    || { echo "resume failed"; exit 1; }
+got="$(counts "$E2E_DB")"
+[[ "$got" == "$expected" ]] || { echo "after resume: $got, single import: $expected"; exit 1; }
+python3 -c 'import json,sys; s=json.load(open(sys.argv[1])); assert s["resumed_from"] and s["runs"] == 4 and s["checkpoints"] == 2, s' resumed.json \
+    || { echo "summary does not report the resume"; exit 1; }
+cursor="$(sqlite3 "$E2E_DB" "SELECT import_cursor IS NULL FROM state WHERE id = 1;")"
+[[ "$cursor" == "1" ]] || { echo "cursor not cleared after a finished import"; exit 1; }
+
+# Nothing left to resume.
+if python3 "$IMPORTER" ledger.md --resume >/dev/null 2>&1; then
+    echo "--resume succeeded without an interrupted import"
+    exit 1
+fi
+
+# CRLF line endings and multi-byte characters: the cursor must land on a run
+# heading in the file itself, and resuming from it must not skip or repeat runs.
+sed -e 's/Round/Ronde é/' -e 's/$/\r/' ledger.md > crlf.md
+mkdir -p crlf/.e2e-testing crlf-ref/.e2e-testing
+for d in crlf crlf-ref; do
+    sqlite3 "$d/.e2e-testing/e2e-tests.sqlite" < "$CLAUDE_PLUGIN_ROOT/schemas/schema.sql" >/dev/null
+done
+python3 "$IMPORTER" crlf.md --db crlf-ref/.e2e-testing/e2e-tests.sqlite --chunk-runs 0 --no-cache >/dev/null
+expected="$(counts crlf-ref/.e2e-testing/e2e-tests.sqlite)"
+if python3 crash.py crlf.md --db crlf/.e2e-testing/e2e-tests.sqlite 2>/dev/null; then
+    echo "interrupted CRLF import exited 0"
+    exit 1
+fi
+python3 - crlf.md crlf/.e2e-testing/e2e-tests.sqlite <<'PY' || { echo "cursor is not a byte offset of a run heading"; exit 1; }
+import json, sqlite3, sys
+raw = open(sys.argv[1], "rb").read()
+cursor = json.loads(sqlite3.connect(sys.argv[2]).execute("SELECT import_cursor FROM state").fetchone()[0])
+off = cursor["byte_offset"]
+assert raw[off - 2:off] == b"\r\n" and raw[off:].startswith("### 2026-03-03 — R-003".encode()), raw[off - 20:off + 30]
+PY
+python3 "$IMPORTER" crlf.md --db crlf/.e2e-testing/e2e-tests.sqlite --resume --chunk-runs 2 >/dev/null \
+    || { echo "CRLF resume failed"; exit 1; }
+got="$(counts crlf/.e2e-testing/e2e-tests.sqlite)"
+[[ "$got" == "$expected" ]] || { echo "CRLF ledger after resume: $got, single import: $expected"; exit 1; }
+labels="$(sqlite3 crlf/.e2e-testing/e2e-tests.sqlite "SELECT COUNT(*) FROM test_runs WHERE label LIKE 'Ronde é %';")"
+[[ "$labels" == "$(sqlite3 crlf/.e2e-testing/e2e-tests.sqlite "SELECT COUNT(*) FROM test_runs;")" ]] \
+    || { echo "resumed runs lost their non-ASCII labels"; exit 1; }
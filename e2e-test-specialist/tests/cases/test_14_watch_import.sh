@@ -0,0 +1,73 @@
+#!/usr/bin/env bash
+# Verify --watch: after the initial import, saved edits are applied section by
+# section — an edited test is rewritten, a new run and directive are appended,
+# a re-edited run only has its row updated — with one latency line per change.
+set -euo pipefail
+
+bash "$CLAUDE_PLUGIN_ROOT/scripts/init-db.sh" >/dev/null
+
+IMPORTER="$CLAUDE_PLUGIN_ROOT/scripts/import-ledger.py"
+cp "$CLAUDE_PLUGIN_ROOT/tests/fixtures/mini-ledger.md" ledger.md
+
+python3 "$IMPORTER" ledger.md --watch --interval 0.1 --json-summary > watch.out 2> watch.err &
+watcher=$!
+trap 'kill $watcher 2>/dev/null || true' EXIT
+
+wait_for() {  # wait_for <description> <command...> — poll up to ~20 s
+    local what="$1"; shift
+    for _ in $(seq 200); do
+        "$@" && return 0
+        kill -0 "$watcher" 2>/dev/null || { echo "watcher exited"; cat watch.err; exit 1; }
+        sleep 0.1
+    done
+    echo "timed out waiting for $what"; cat watch.out watch.err; exit 1
+}
+applied() { [[ "$(grep -c '"event": "applied"' watch.out)" -ge "$1" ]]; }
+
+wait_for "initial import" grep -q "watching" watch.err
+
+python3 - <<'PY'
+from pathlib import Path
+p = Path("ledger.md")
+s = p.read_text()
+s = s.replace("2. Verify HTTP 200 and the app title is visible.", "2. Verify HTTP 200 and the footer is visible.")
+s = s.replace("### Capture every bug", "### Fresh data per run\n\n**Enforcement**: advisory\n\nNever reuse fixtures.\n\n### Capture every bug")
+s += "\n### 2026-01-16 — R-002 — Second pass\n\n**Bugs found**: login button misaligned on mobile.\n"
+p.write_text(s)
+PY
+wait_for "three sections applied" applied 3
+
+python3 - watch.out <<'PY' || exit 1
+import json, sys
+events = [json.loads(l) for l in open(sys.argv[1]) if l.startswith('{"event"')]
+by = {e["kind"]: e for e in events}
+assert sorted(by) == ["directives", "phases", "results"], events
+assert by["directives"]["counts"] == {"directives": 1}, by["directives"]
+assert by["phases"]["changes"]["tests"]["changed"] == 1, by["phases"]
+assert by["phases"]["counts"]["phases"] == 1, by["phases"]  # only the edited phase was re-parsed
+assert by["results"]["counts"]["runs"] == 1, by["results"]
+assert all(e["apply_ms"] >= 0 and e["latency_ms"] >= e["apply_ms"] for e in events), events
+PY
+
+action="$(sqlite3 "$E2E_DB" "SELECT action FROM test_steps WHERE id = 'S-00.01.002';")"
+[[ "$action" == *footer* ]] || { echo "edited step not rewritten: $action"; exit 1; }
+n="$(sqlite3 "$E2E_DB" "SELECT COUNT(*) FROM directives;")"
+[[ "$n" == "3" ]] || { echo "expected 3 directives, got $n"; exit 1; }
+memories="$(sqlite3 "$E2E_DB" "SELECT COUNT(*) FROM memories;")"
+
+# Editing a stored run rewrites its row only; its memories are not appended again.
+sed -i 's/\*\*Final state\*\*: green\./**Final state**: green, retested./' ledger.md
+wait_for "run update applied" applied 4
+state="$(sqlite3 "$E2E_DB" "SELECT final_state FROM v_run_final_state WHERE id = 'R-001';")"
+[[ "$state" == *retested* ]] || { echo "R-001 not updated: $state"; exit 1; }
+[[ "$(sqlite3 "$E2E_DB" "SELECT COUNT(*) FROM memories;")" == "$memories" ]] \
+    || { echo "memories re-appended for a stored run"; exit 1; }
+[[ "$(sqlite3 "$E2E_DB" "SELECT COUNT(*) FROM test_runs;")" == "2" ]] || { echo "run count changed"; exit 1; }
+
+orphans="$(sqlite3 "$E2E_DB" "PRAGMA foreign_key_check;")"
+[[ -z "$orphans" ]] || { echo "dangling references after watch: $orphans"; exit 1; }
+
+# --watch and --dry-run do not mix.
+if python3 "$IMPORTER" ledger.md --watch --dry-run >/dev/null 2>&1; then
+    echo "--watch --dry-run was accepted"; exit 1
+fi
@@ -0,0 +1,65 @@
+#!/usr/bin/env bash
+# Verify multi-ledger import: a directory (or glob) of ledgers merges into one
+# database in one run, a phase number used by two ledgers is renumbered
+# deterministically and reported, and re-importing the set is a no-op.
+set -euo pipefail
+
+bash "$CLAUDE_PLUGIN_ROOT/scripts/init-db.sh" >/dev/null
+
+IMPORTER="$CLAUDE_PLUGIN_ROOT/scripts/import-ledger.py"
+mkdir ledgers
+cp "$CLAUDE_PLUGIN_ROOT/tests/fixtures/mini-ledger.md" ledgers/a-core.md
+cat > ledgers/b-billing.md <<'MD'
+# Billing ledger
+
+## E2E Test Phases
+
+### Phase 1: Billing
+
+Invoices for each app.
+
+**1.1 Invoice renders**
+1. Navigate to /billing/invoices/1.
+2. Verify the total is shown.
+
+## Test Count Summary
+
+| Phase | Tests |
+|-------|-------|
+| P01   | 1     |
+MD
+
+python3 "$IMPORTER" ledgers --json-summary > multi.json
+python3 - multi.json <<'PY' || exit 1
+import json, sys
+s = json.load(open(sys.argv[1]))
+assert s["ledgers"] == ["ledgers/a-core.md", "ledgers/b-billing.md"], s["ledgers"]
+assert s["phase_collisions"] == [{"ledger": "ledgers/b-billing.md", "phase": "P01",
+                                  "kept_by": "ledgers/a-core.md", "renumbered_to": "P02"}], s["phase_collisions"]
+assert s["phases"] == 3 and s["tests"] == 5, (s["phases"], s["tests"])
+PY
+
+title="$(sqlite3 "$E2E_DB" "SELECT title FROM phases WHERE id = 'P02';")"
+[[ "$title" == "Billing" ]] || { echo "P02 is '$title', expected the renumbered Billing phase"; exit 1; }
+counts="$(sqlite3 "$E2E_DB" "SELECT id || '=' || IFNULL(expected_test_count, '-') FROM phases WHERE id IN ('P01', 'P02') ORDER BY id;" | tr '\n' ' ')"
+[[ "$counts" == "P01=- P02=1 " ]] || { echo "expected counts not remapped: $counts"; exit 1; }
+n="$(sqlite3 "$E2E_DB" "SELECT COUNT(*) FROM tests WHERE id = 'T-02.01' AND phase_id = 'P02';")"
+[[ "$n" == "1" ]] || { echo "renumbered phase's test missing"; exit 1; }
+
+# Same set through a glob, with --deprecate-missing: nothing changes and the
+# other ledger's tests are not treated as removed.
+python3 "$IMPORTER" 'ledgers/*.md' --deprecate-missing --json-summary > again.json
+python3 - again.json <<'PY' || exit 1
+import json, sys
+s = json.load(open(sys.argv[1]))
+assert s["changes"]["phases"] == {"added": 0, "changed": 0, "unchanged": 3, "removed": 0}, s["changes"]
+assert s["changes"]["tests"]["removed"] == 0 and s["deprecated"] == 0, s["changes"]
+assert [c["renumbered_to"] for c in s["phase_collisions"]] == ["P02"], s["phase_collisions"]
+PY
+
+orphans="$(sqlite3 "$E2E_DB" "PRAGMA foreign_key_check;")"
+[[ -z "$orphans" ]] || { echo "dangling references after multi import: $orphans"; exit 1; }
+
+if python3 "$IMPORTER" ledgers --resume >/dev/null 2>&1; then
+    echo "--resume accepted several ledgers"; exit 1
+fi
@@ -0,0 +1,36 @@
+#!/usr/bin/env bash
+# Verify --progress ndjson: stderr carries one JSON event per line — stages in
+# order, one event per phase with its id, run chunks, ETA, and a final
+# "done" whose counts match the summary.
+set -euo pipefail
+
+bash "$CLAUDE_PLUGIN_ROOT/scripts/init-db.sh" >/dev/null
+
+IMPORTER="$CLAUDE_PLUGIN_ROOT/scripts/import-ledger.py"
+python3 "$CLAUDE_PLUGIN_ROOT/tests/bench/bench-import.py" --emit 120 > ledger.md
+
+python3 "$IMPORTER" ledger.md --progress ndjson --json-summary > summary.json 2> progress.ndjson
+python3 - summary.json progress.ndjson <<'PY' || exit 1
+import json, sys
+summary = json.load(open(sys.argv[1]))
+events = [json.loads(line) for line in open(sys.argv[2])]  # every line is JSON
+
+stages = [e["stage"] for e in events if e["event"] == "stage"]
+assert stages == ["parse", "write", "flush", "commit"], stages
+phases = [e["phase"] for e in events if e["event"] == "phase"]
+assert len(phases) == summary["phases"] and phases[0] == "P00", phases[:3]
+assert any(e["event"] == "runs" for e in events), "no results-log progress"
+elapsed = [e["elapsed_ms"] for e in events]
+assert elapsed == sorted(elapsed), elapsed
+written = [e for e in events if "eta_ms" in e and e["event"] != "done"]
+assert all(e["eta_ms"] is not None and e["eta_ms"] >= 0 for e in written), written[:2]
+done = [e["done"] for e in written]
+assert done == sorted(done) and done[-1] == 1.0, done
+last = events[-1]
+assert last["event"] == "done", last
+assert last["counts"]["tests"] == summary["tests"] and last["counts"]["runs"] == summary["runs"], last
+PY
+
+# Without the flag stderr stays quiet.
+python3 "$IMPORTER" ledger.md > /dev/null 2> quiet.err
+[[ ! -s quiet.err ]] || { echo "unexpected stderr without --progress:"; cat quiet.err; exit 1; }
@@ -0,0 +1,42 @@
+#!/usr/bin/env bash
+# Verify applies-to hint detection: hints from the steps ahead of the first
+# test marker reach every test merged with the test's own, both phrasings
+# share one scan (overlapping lead-ins included), and repeated text is
+# answered from the memo.
+set -euo pipefail
+
+python3 - <<'PY' || exit 1
+from plugin_scripts import load_script
+mod = load_script("import-ledger")
+
+hints = mod.detect_applies_to_hints
+assert hints("For each of the 10 sites, for every server:") == ["infrastructure"]  # "of" is no subject
+assert hints("Test EVERY page, then check all roles") == ["page", "role"]
+assert hints("for each check all pages") == ["page"]  # "check all" inside a for-each lead-in
+assert hints("Nothing to expand here.") == []
+
+ledger = """## E2E Test Phases
+
+### Phase 1: Sites
+
+Shared setup, before the first test:
+
+1. For each site, sign in as the admin.
+
+**1.1 Home page**
+1. Navigate to /.
+
+**1.2 Profile per user**
+1. Verify all tabs render.
+"""
+[(_, _, (phase,))] = mod.parse_ledger(ledger)
+got = {t.title: t.applies_to_hints for t in phase.tests}
+assert got == {"1.1 Home page": ["app"], "1.2 Profile per user": ["app", "tab"]}, got
+
+# Same text again is a memo hit: no new entry, same answer.
+size = len(mod._hints_memo)
+assert hints("Verify every viewport") == ["viewport"]
+assert len(mod._hints_memo) == size + 1
+assert hints("Verify every viewport") == ["viewport"]
+assert len(mod._hints_memo) == size + 1, "repeated text re-scanned"
+PY
@@ -0,0 +1,73 @@
+#!/usr/bin/env bash
+# Verify the key/value bullet scanner: single and pipe-separated pairs come
+# out of one pass with their spans, wrapped values and nested plain bullets
+# stay with their key, a nested bold-key bullet is a pair of its own, and
+# notes under a password, token or port are not folded into the value. A
+# key with nothing after its colon is skipped, with or without a trailing
+# blank.
+set -euo pipefail
+
+bash "$CLAUDE_PLUGIN_ROOT/scripts/init-db.sh" >/dev/null
+
+IMPORTER="$CLAUDE_PLUGIN_ROOT/scripts/import-ledger.py"
+cat > ledger.md <<'MD'
+## VPS Infrastructure & Credentials
+
+### Worker 2 — App Server
+- **IP**: 10.0.0.2 | **SSH Port**: `2222`
+- **Root Password** (rotated): `s3cret`
+- **Notes**:
+  - behind the load balancer
+    (see the LB runbook)
+  - no direct DNS
+- **Purpose**: queue workers for the
+  reporting apps
+  - **Wireguard IP**: 10.8.0.2
+- **Empty**:
+- **Blank**: 
+
+### Worker 3 — App Server
+- **IP**: 10.0.0.3
+- **SSH Port**: 2200
+  (changed from 22 in March)
+- **Password**: hunter2hunter2
+  (rotated monthly, ask ops)
+- **Deploy Token**: tok_0123456789abcdef
+  expires 2027-01
+MD
+
+python3 - <<'PY' || exit 1
+from plugin_scripts import load_script
+mod = load_script("import-ledger")
+
+text = open("ledger.md").read()
+pairs = list(mod.scan_kv_pairs(text, 0, text.index("### Worker 3")))
+assert [k for k, _, _ in pairs] == ["ip", "ssh port", "root password", "notes", "purpose", "wireguard ip"], pairs
+got = {k: v for k, v, _ in pairs}
+assert got["ssh port"] == "2222" and got["root password"] == "s3cret", got
+assert got["notes"] == "- behind the load balancer\n  (see the LB runbook)\n- no direct DNS", got["notes"]
+assert got["purpose"] == "queue workers for the\nreporting apps", got["purpose"]
+# A key with nothing after its colon has no value, trailing blank or not.
+assert "empty" not in got and "blank" not in got, got
+for key, _, (start, end) in pairs:
+    assert text[start:end].lstrip("- ").lower().startswith("**" + key), (key, text[start:end])
+PY
+
+python3 "$IMPORTER" ledger.md >/dev/null
+got="$(sqlite3 "$E2E_DB" "SELECT ip || ' ' || ssh_port || ' ' || wireguard_ip || ' ' || json_extract(metadata, '$.notes')
+                          FROM infrastructure WHERE name LIKE 'Worker 2%';")"
+expected="10.0.0.2 2222 10.8.0.2 - behind the load balancer
+  (see the LB runbook)
+- no direct DNS"
+[[ "$got" == "$expected" ]] || { echo "infrastructure row:"; echo "$got"; exit 1; }
+
+got="$(sqlite3 "$E2E_DB" "SELECT json_extract(fields, '$.password') || ' ' || json_extract(fields, '$.port')
+                          FROM credentials WHERE name LIKE 'worker-3%-ssh';
+                          SELECT ssh_port FROM infrastructure WHERE name LIKE 'Worker 3%';
+                          SELECT json_extract(fields, '$.token') FROM credentials WHERE name LIKE 'worker-3%-deploy-token';")"
+expected="hunter2hunter2 2200
+2200
+tok_0123456789abcdef"
+[[ "$got" == "$expected" ]] || { echo "worker 3 credentials:"; echo "$got"; exit 1; }
+out="$(printf 'login hunter2hunter2 with tok_0123456789abcdef\n' | python3 "$CLAUDE_PLUGIN_ROOT/scripts/redact.py" "$E2E_DB")"
+[[ "$out" != *hunter2* && "$out" != *tok_0123* ]] || { echo "stored values not redacted: $out"; exit 1; }
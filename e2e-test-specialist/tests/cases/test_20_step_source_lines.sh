@@ -0,0 +1,72 @@
+#!/usr/bin/env bash
+# Verify step source lines: every step records the ledger lines it spans
+# (wrapped steps included, also when parsed with --jobs), and lines added
+# above a phase move its steps on re-import and in --watch without
+# rewriting the unchanged tests.
+set -euo pipefail
+
+bash "$CLAUDE_PLUGIN_ROOT/scripts/init-db.sh" >/dev/null
+
+IMPORTER="$CLAUDE_PLUGIN_ROOT/scripts/import-ledger.py"
+cat > ledger.md <<'MD'
+# Ledger
+
+## E2E Test Phases
+
+### Phase 1: Home
+
+**1.1 Landing page**
+1. Navigate to /
+   and wait for the hero image.
+2. Verify the title.
+
+**1.2 Footer links**
+1. Click every footer link.
+
+### Phase 2: Setup
+
+1. Run the seeders
+   with the demo flag.
+2. Confirm 3 users exist.
+MD
+
+lines() { sqlite3 "$E2E_DB" "SELECT group_concat(id || ':' || source_line || '-' || source_line_end, ' ')
+                             FROM (SELECT * FROM test_steps ORDER BY id);"; }
+
+python3 "$IMPORTER" ledger.md >/dev/null
+expected="S-01.01.001:8-9 S-01.01.002:10-10 S-01.02.001:13-13 S-02.01.001:17-18 S-02.01.002:19-19"
+[[ "$(lines)" == "$expected" ]] || { echo "step lines: $(lines)"; exit 1; }
+action="$(sqlite3 "$E2E_DB" "SELECT action FROM test_steps WHERE id = 'S-01.01.001';")"
+[[ "$action" == "Navigate to /"*"hero image." ]] || { echo "wrapped action: $action"; exit 1; }
+
+# Parsing phase chunks in worker processes yields the same ledger lines.
+E2E_DB="$PWD/jobs.sqlite" bash "$CLAUDE_PLUGIN_ROOT/scripts/init-db.sh" >/dev/null
+python3 "$IMPORTER" ledger.md --db jobs.sqlite --jobs 2 --no-cache >/dev/null
+got="$(E2E_DB=jobs.sqlite lines)"
+[[ "$got" == "$expected" ]] || { echo "--jobs 2 step lines: $got"; exit 1; }
+
+# Two lines above the phases: every step moves, no test counts as changed.
+python3 -c 'from pathlib import Path; p = Path("ledger.md"); p.write_text(p.read_text().replace("# Ledger\n", "# Ledger\n\nIntro paragraph.\n", 1))'
+python3 "$IMPORTER" ledger.md --json-summary > moved.json
+python3 -c 'import json,sys; c=json.load(open(sys.argv[1]))["changes"]["tests"]; sys.exit(c["changed"] != 0)' moved.json \
+    || { echo "moved tests were rewritten"; cat moved.json; exit 1; }
+expected="S-01.01.001:10-11 S-01.01.002:12-12 S-01.02.001:15-15 S-02.01.001:19-20 S-02.01.002:21-21"
+[[ "$(lines)" == "$expected" ]] || { echo "step lines after re-import: $(lines)"; exit 1; }
+
+# --watch: a line inserted in Phase 1 re-applies that block on its real
+# lines and shifts the kept Phase 2 by one.
+python3 - <<'PY' || exit 1
+import argparse, os
+from plugin_scripts import load_script
+mod = load_script("import-ledger")
+
+old = open("ledger.md").read()
+new = old.replace("2. Verify the title.", "2. Verify the title\n   and the tagline.")
+args = argparse.Namespace(db=os.environ["E2E_DB"], deprecate_missing=False)
+tagger = mod.Tagger.load(os.path.join(os.environ["CLAUDE_PLUGIN_ROOT"], "schemas", "tag-taxonomy.json"))
+for _, sec, text, kept, moved in mod.plan_changes(mod.watched_sections(old), mod.watched_sections(new)):
+    assert kept == ["P02"] and moved == [(1, "P02")], (kept, moved)
+    mod.apply_change(args, tagger, sec, text, kept, moved)
+PY
+expected="S-01.01.001:10-11 S-01.01.002:12-13 S-01.02.001:16-16 S-02.01.001:20-21 S-02.01.002:22-22"
+[[ "$(lines)" == "$expected" ]] || { echo "step lines after watch apply: $(lines)"; exit 1; }
@@ -0,0 +1,66 @@
+#!/usr/bin/env bash
+# Verify the one-pass redaction engine: overlapping values resolve longest
+# first, regex metacharacters and multi-line values are literal, and
+# redact-screenshot.py lists every visible value (or only answers yes/no
+# with --quiet) from the same matcher, a region included though it is not
+# masked.
+set -euo pipefail
+
+bash "$CLAUDE_PLUGIN_ROOT/scripts/init-db.sh" >/dev/null
+source "$CLAUDE_PLUGIN_ROOT/scripts/lib.sh"
+
+# No credentials: text passes through untouched.
+printf 'nothing (to) hide\n' > plain.txt
+[[ "$(e2e_redact < plain.txt)" == "nothing (to) hide" ]] || { echo "text changed without credentials"; exit 1; }
+
+python3 - <<'PY'
+import json, os, sqlite3
+conn = sqlite3.connect(os.environ["E2E_DB"])
+rows = [
+    ("CRED-001", "db", {"password": "hunter2hunter2", "host": "db.internal"}),
+    ("CRED-002", "db-root", {"password": "hunter2hunter2-root"}),
+    ("CRED-003", "regexy", {"token": "a.b*c(d)+e|f"}),
+    ("CRED-004", "deploy-key", {"private_key": "-----BEGIN KEY-----\nAAAA1234\n-----END KEY-----"}),
+    ("CRED-005", "same-pass", {"password": "hunter2hunter2"}),
+    ("CRED-006", "bucket", {"region": "eu-central-1"}),
+]
+conn.executemany("INSERT INTO credentials (id, name, kind, fields) VALUES (?, ?, 'other', ?)",
+                 [(i, n, json.dumps(f)) for i, n, f in rows])
+conn.commit()
+PY
+
+cat > report.txt <<'EOF'
+root: hunter2hunter2-root
+app: hunter2hunter2 on db.internal
+token a.b*c(d)+e|f but not axbxcxdxexf
+-----BEGIN KEY-----
+AAAA1234
+-----END KEY-----
+EOF
+expected='root: [redacted:db-root:password]
+app: [redacted:db:password] on db.internal
+token [redacted:regexy:token] but not axbxcxdxexf
+[redacted:deploy-key:private_key]'
+got="$(e2e_redact < report.txt)"
+[[ "$got" == "$expected" ]] || { echo "redacted:"; echo "$got"; exit 1; }
+
+# Detection lists every visible value in table order, duplicates included;
+# the shorter password also shows inside the longer one.
+DETECT="$CLAUDE_PLUGIN_ROOT/scripts/redact-screenshot.py"
+if printf 'hunter2hunter2-root\n' | python3 "$DETECT" 2> warn.txt; then
+    echo "visible value not detected"; exit 1
+fi
+got="$(grep -o "credential '[^']*' field '[^']*'" warn.txt | tr '\n' ';')"
+[[ "$got" == "credential 'db' field 'password';credential 'db-root' field 'password';credential 'same-pass' field 'password';" ]] \
+    || { echo "findings: $got"; exit 1; }
+
+if printf 'key AAAA1234 and a.b*c(d)+e|f\n' | python3 "$DETECT" --quiet 2> quiet.txt; then
+    echo "--quiet missed a visible value"; exit 1
+fi
+[[ ! -s quiet.txt ]] || { echo "--quiet printed:"; cat quiet.txt; exit 1; }
+printf 'db.internal is fine\n' | python3 "$DETECT" --quiet || { echo "host flagged as secret"; exit 1; }
+[[ "$(printf 'in eu-central-1\n' | e2e_redact)" == "in eu-central-1" ]] || { echo "region masked"; exit 1; }
+if printf 'in eu-central-1\n' | python3 "$DETECT" 2> region.txt; then
+    echo "visible region not detected"; exit 1
+fi
+grep -q "credential 'bucket' field 'region'" region.txt || { cat region.txt; exit 1; }
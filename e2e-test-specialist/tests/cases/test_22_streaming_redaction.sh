@@ -0,0 +1,67 @@
+#!/usr/bin/env bash
+# Verify streaming redaction: values straddling chunk boundaries are still
+# masked, a short value is held back while a longer one overlapping it may
+# still complete, output arrives before stdin is closed, and peak memory does not
+# grow with the size of the input.
+set -euo pipefail
+
+bash "$CLAUDE_PLUGIN_ROOT/scripts/init-db.sh" >/dev/null
+sqlite3 "$E2E_DB" "
+    INSERT INTO credentials (id, name, kind, fields)
+    VALUES ('CRED-001', 'deploy', 'api-token', '{\"token\":\"tok_0123456789abcdef\"}'),
+           ('CRED-002', 'db', 'username-password', '{\"password\":\"hunter2hunter2\"}'),
+           ('CRED-003', 'short', 'other', '{\"password\":\"aaaaaa\"}'),
+           ('CRED-004', 'long', 'other', '{\"password\":\"aaaaaabbbbbbbbbbbbbbbbbbbbbbbb\"}');
+"
+
+python3 - "$CLAUDE_PLUGIN_ROOT/scripts/redact.py" <<'PY' || exit 1
+import os, resource, select, subprocess, sys
+redact, db = sys.argv[1], os.environ["E2E_DB"]
+
+# Every chunk size from 1 up: the values land on every possible boundary.
+text = "a tok_0123456789abcdef b hunter2hunter2 c tok_0123456789abcdefhunter2hunter2\n" * 3
+expected = text.replace("tok_0123456789abcdef", "[redacted:deploy:token]").replace(
+    "hunter2hunter2", "[redacted:db:password]")
+for size in range(1, 40):
+    out = subprocess.run([sys.executable, redact, db, "--chunk-size", str(size)],
+                         input=text, capture_output=True, text=True, check=True).stdout
+    assert out == expected, (size, out)
+
+# "aaaaaa" is complete before "aaaaaab...b" (the longest value), which starts
+# one character later, has arrived; the longer value still wins, as in a
+# single pass.
+long = "aaaaaa" + "b" * 24
+text = f"x a{long} y aaaaaa{long} z\n"
+expected = "x a[redacted:long:password] y [redacted:short:password][redacted:long:password] z\n"
+for size in range(1, 40):
+    out = subprocess.run([sys.executable, redact, db, "--chunk-size", str(size)],
+                         input=text, capture_output=True, text=True, check=True).stdout
+    assert out == expected, (size, out)
+
+# Output is flushed chunk by chunk, while the writer still holds stdin open.
+p = subprocess.Popen([sys.executable, redact, db, "--chunk-size", "4096"],
+                     stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+p.stdin.write(b"x" * 10000 + b" hunter2hunter2 " + b"y" * 10000)
+p.stdin.flush()
+ready, _, _ = select.select([p.stdout], [], [], 20)
+assert ready, "no output before EOF"
+first = os.read(p.stdout.fileno(), 4096)
+assert first.startswith(b"xxxx"), first[:20]
+p.stdin.close()
+rest = first + p.stdout.read()
+assert p.wait() == 0 and b"[redacted:db:password]" in rest and b"hunter2" not in rest
+
+# 64 MB through the default chunk size stays within a few MB of a tiny input.
+def peak_rss_kb(mb: int) -> int:
+    gen = ("import sys\nline = 'log line with hunter2hunter2 inside ' * 30 + '\\n'\n"
+           f"for _ in range({mb} * 1024 * 1024 // len(line)): sys.stdout.write(line)\n")
+    src = subprocess.Popen([sys.executable, "-c", gen], stdout=subprocess.PIPE)
+    run = subprocess.run(["bash", "-c", f'exec "{sys.executable}" "{redact}" "{db}" > /dev/null'],
+                         stdin=src.stdout, check=True)
+    src.wait()
+    return resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+
+small = peak_rss_kb(1)
+large = peak_rss_kb(64)
+assert large - small < 16 * 1024, f"peak RSS grew from {small} KB to {large} KB"
+PY
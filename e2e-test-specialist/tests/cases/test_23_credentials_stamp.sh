@@ -0,0 +1,35 @@
+#!/usr/bin/env bash
+# Verify state.credentials_stamp: every credential change replaces it, the
+# next redaction sees the change, and no credential value is written under
+# the DB directory (there is no on-disk matcher cache).
+set -euo pipefail
+
+bash "$CLAUDE_PLUGIN_ROOT/scripts/init-db.sh" >/dev/null
+source "$CLAUDE_PLUGIN_ROOT/scripts/lib.sh"
+DB_DIR="$(dirname "$E2E_DB")"
+stamp() { sqlite3 "$E2E_DB" "SELECT credentials_stamp FROM state;"; }
+
+sqlite3 "$E2E_DB" "INSERT INTO credentials (id, name, kind, fields)
+                   VALUES ('CRED-001', 'deploy', 'api-token', '{\"token\":\"tok_first_0123456789\"}');"
+printf 'a tok_first_0123456789 b tok_second_0123456789\n' > in.txt
+
+[[ "$(e2e_redact < in.txt)" == "a [redacted:deploy:token] b tok_second_0123456789" ]] || { echo "first call"; exit 1; }
+printf 'tok_first_0123456789\n' | python3 "$CLAUDE_PLUGIN_ROOT/scripts/redact-screenshot.py" --quiet && {
+    echo "visible value not detected"; exit 1; }
+
+# A changed credential replaces the stamp; the next call redacts the new value.
+old_stamp="$(stamp)"
+sqlite3 "$E2E_DB" "UPDATE credentials SET fields = '{\"token\":\"tok_second_0123456789\"}';"
+[[ "$(stamp)" != "$old_stamp" ]] || { echo "stamp not replaced"; exit 1; }
+[[ "$(e2e_redact < in.txt)" == "a tok_first_0123456789 b [redacted:deploy:token]" ]] || { echo "stale credentials"; exit 1; }
+
+# Edits that leave names and fields alone keep the stamp.
+old_stamp="$(stamp)"
+sqlite3 "$E2E_DB" "UPDATE credentials SET notes = 'rotated';"
+[[ "$(stamp)" == "$old_stamp" ]] || { echo "stamp replaced by a notes edit"; exit 1; }
+
+# Nothing beside the DB holds a credential value.
+if grep -rqs --exclude='e2e-tests.sqlite*' "tok_" "$DB_DIR"; then
+    echo "credential value written under $DB_DIR"; exit 1
+fi
+[[ -z "$(find "$DB_DIR" -name 'redact-*.bin')" ]] || { echo "matcher cache file written"; exit 1; }
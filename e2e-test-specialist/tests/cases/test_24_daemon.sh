@@ -0,0 +1,134 @@
+#!/usr/bin/env bash
+# Verify the opt-in daemon: the client gives the scripts' output and exit
+# status with and without it, warm state follows credential and subject
+# edits and a restored DB file, redaction still streams (also past the idle
+# timeout) and a failure part way through it exits non-zero, and a dead or
+# idle daemon leaves the client on the fallback path.
+set -euo pipefail
+
+bash "$CLAUDE_PLUGIN_ROOT/scripts/init-db.sh" >/dev/null
+source "$CLAUDE_PLUGIN_ROOT/scripts/lib.sh"
+S="$CLAUDE_PLUGIN_ROOT/scripts"
+client() { python3 -S "$S/e2e-client.py" "$@"; }
+trap 'python3 "$S/e2e-daemon.py" stop >/dev/null 2>&1 || true' EXIT
+
+sqlite3 "$E2E_DB" "
+    INSERT INTO credentials (id, name, kind, fields)
+    VALUES ('CRED-001', 'deploy', 'api-token', '{\"token\":\"tok_0123456789abcdef\"}');
+    INSERT INTO apps (id, name, app_type, target_domain, services)
+    VALUES ('APP-001', 'shop', 'laravel', 'shop.test', '{\"redis\":\"7.2\"}');
+"
+printf 'a tok_0123456789abcdef b\r\nc tok_second_0123456789\n' > in.txt
+printf 'page shows tok_0123456789abcdef\n' > snap.txt
+
+# Every call, as "<exit>|<stdout>|<stderr>", through the client.
+calls() {
+    local out err rc
+    for args in "redact <in.txt" "detect <snap.txt" "detect --quiet <snap.txt" "detect <in.txt" \
+                "render 'https://{{subject.target_domain}}/{{subject.services.redis}}' --subject APP-001" \
+                "render '{{subject.x}}' --subject APP-404" \
+                "render '{{subject.a.b}}' '{\"subject\":{\"a\":{\"b\":1}}}'" \
+                "render x '{bad'"; do
+        rc=0
+        out="$(eval "client $args" 2> err.txt)" || rc=$?
+        printf '%s|%s|%s\n' "$rc" "$out" "$(cat err.txt)"
+    done
+}
+
+helpers() {
+    e2e_render 'https://{{subject.target_domain}}/' APP-001
+    e2e_redact < in.txt
+    e2e_detect_credentials --quiet < snap.txt || echo "rc=$?"
+}
+
+calls > without.txt
+helpers > helpers-without.txt
+python3 "$S/e2e-daemon.py" start --idle-timeout 60 >/dev/null
+[[ -S "$(dirname "$E2E_DB")/daemon.sock" ]] || { echo "no socket"; exit 1; }
+[[ "$(stat -c %a "$(dirname "$E2E_DB")/daemon.sock" 2>/dev/null || stat -f %Lp "$(dirname "$E2E_DB")/daemon.sock")" == 600 ]] \
+    || { echo "socket is not owner-only"; exit 1; }
+calls > with.txt
+diff without.txt with.txt || { echo "daemon output differs from the scripts"; exit 1; }
+helpers > helpers-with.txt
+diff helpers-without.txt helpers-with.txt || { echo "lib.sh helpers differ with the daemon"; exit 1; }
+grep -qx 'rc=1' helpers-with.txt || { echo "e2e_detect_credentials missed a value"; exit 1; }
+grep -q $'^0|a \\[redacted:deploy:token\\] b\r$' with.txt || { echo "redaction missing:"; cat with.txt; exit 1; }
+[[ "$(python3 "$S/e2e-daemon.py" status)" == running:*requests=* ]] || { echo "status"; exit 1; }
+
+# Warm state follows edits made through other connections.
+sqlite3 "$E2E_DB" "UPDATE credentials SET fields = '{\"token\":\"tok_second_0123456789\"}';
+                   UPDATE apps SET target_domain = 'shop2.test';"
+[[ "$(client redact < in.txt | tail -n 1)" == "c [redacted:deploy:token]" ]] || { echo "stale credentials"; exit 1; }
+[[ "$(client render '{{subject.target_domain}}' --subject APP-001)" == "shop2.test" ]] || { echo "stale subject"; exit 1; }
+
+# A DB file replaced on disk (as /reset --hard does) is reopened.
+sqlite3 "$E2E_DB" ".backup restored.sqlite"
+sqlite3 restored.sqlite "UPDATE apps SET target_domain = 'restored.test';"
+rm -f "$E2E_DB" "$E2E_DB-wal" "$E2E_DB-shm"
+mv restored.sqlite "$E2E_DB"
+[[ "$(client render '{{subject.target_domain}}' --subject APP-001)" == "restored.test" ]] || { echo "replaced DB not reopened"; exit 1; }
+
+# Redaction streams through the daemon: output before EOF, values split
+# across the client's writes still masked.
+python3 - "$S/e2e-client.py" <<'PY'
+import select, subprocess, sys, time
+p = subprocess.Popen([sys.executable, "-S", sys.argv[1], "redact"], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+p.stdin.write(b"x" * 70000 + b" tok_second_")
+p.stdin.flush()
+assert select.select([p.stdout], [], [], 20)[0], "no output before EOF"
+time.sleep(0.2)
+p.stdin.write(b"0123456789 done\n")
+out, _ = p.communicate()
+assert out.endswith(b"x [redacted:deploy:token] done\n") and b"tok_second" not in out, out[-60:]
+PY
+
+# A killed daemon leaves its socket behind; the client falls back.
+pid="$(python3 "$S/e2e-daemon.py" status | sed 's/.*pid=\([0-9]*\).*/\1/')"
+kill -9 "$pid"
+sleep 0.2
+[[ -S "$(dirname "$E2E_DB")/daemon.sock" ]] || { echo "expected a stale socket"; exit 1; }
+[[ "$(client render '{{subject.target_domain}}' --subject APP-001)" == "restored.test" ]] || { echo "no fallback"; exit 1; }
+python3 "$S/e2e-daemon.py" status >/dev/null && { echo "dead daemon reported running"; exit 1; }
+
+# start replaces the stale socket; a redaction streaming for longer than the
+# idle timeout completes; then the idle daemon exits and removes the socket.
+python3 "$S/e2e-daemon.py" start --idle-timeout 1 >/dev/null
+python3 - "$S/e2e-client.py" <<'PY'
+import subprocess, sys, time
+p = subprocess.Popen([sys.executable, "-S", sys.argv[1], "redact"], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+for _ in range(4):
+    p.stdin.write(b"still streaming\n")
+    p.stdin.flush()
+    time.sleep(1)
+out, _ = p.communicate(b"tok_second_0123456789\n")
+assert p.returncode == 0 and out == b"still streaming\n" * 4 + b"[redacted:deploy:token]\n", (p.returncode, out)
+PY
+for _ in $(seq 50); do [[ -S "$(dirname "$E2E_DB")/daemon.sock" ]] || break; sleep 0.1; done
+[[ ! -e "$(dirname "$E2E_DB")/daemon.sock" ]] || { echo "idle daemon still listening"; exit 1; }
+grep -q '\[daemon\] stopped' "$E2E_LOG" || { echo "no stop logged"; exit 1; }
+
+# A redaction that fails after streaming part of its output exits 1.
+python3 - "$S" <<'PY'
+import os, subprocess, sys, threading, time
+from plugin_scripts import load_script
+daemon = load_script("e2e-daemon")
+db = os.path.abspath(os.environ["E2E_DB"])
+
+def fail_midway(self, src, dst, chunk_size=0):
+    dst.write("partial ")
+    dst.flush()
+    raise OSError("disk full")
+daemon.Redactor.redact_stream = fail_midway
+
+result = {}
+def client():
+    while daemon.request(db, "ping") is None:
+        time.sleep(0.05)
+    result["run"] = subprocess.run([sys.executable, "-S", os.path.join(sys.argv[1], "e2e-client.py"), "--db", db,
+                                    "redact"], input=b"tok_second_0123456789\n", capture_output=True)
+    daemon.request(db, "stop")
+threading.Thread(target=client).start()
+daemon.serve(db, 0)
+run = result["run"]
+assert run.returncode == 1 and run.stdout == b"partial " and b"redact failed: OSError: disk full" in run.stderr, run
+PY
@@ -0,0 +1,75 @@
+#!/usr/bin/env bash
+# Verify redact.py --tree: a mirror copy matches stdin redaction file for
+# file and leaves the source alone, in-place redaction keeps file modes,
+# binaries are flagged rather than rewritten, symlinks are not followed,
+# and the manifest lets a rerun skip files already clean until the
+# credentials change.
+set -euo pipefail
+
+bash "$CLAUDE_PLUGIN_ROOT/scripts/init-db.sh" >/dev/null
+source "$CLAUDE_PLUGIN_ROOT/scripts/lib.sh"
+R="$CLAUDE_PLUGIN_ROOT/scripts/redact.py"
+
+sqlite3 "$E2E_DB" "
+    INSERT INTO credentials (id, name, kind, fields)
+    VALUES ('CRED-001', 'deploy', 'api-token', '{\"token\":\"tok_0123456789abcdef\"}'),
+           ('CRED-002', 'db', 'username-password', '{\"user\":\"app\",\"password\":\"hunter2hunter2\"}');
+"
+mkdir -p run/evidence outside
+printf '# R-001\npassword hunter2hunter2 and tok_0123456789abcdef\n' > run/report.md
+printf 'line one\r\ntok_0123456789abcdef\r\n' > run/evidence/crlf.log
+printf 'nothing secret here\n' > run/evidence/clean.log
+printf '#!/bin/sh\necho hunter2hunter2\n' > run/replay.sh && chmod 755 run/replay.sh
+printf '\x89PNG\r\n\x1a\n\0\0hunter2hunter2' > run/shot.png
+printf 'tok_0123456789abcdef\n' > outside/secret.txt
+ln -s ../outside/secret.txt run/link.txt
+# > 1 MiB (read through mmap), a value at the very end.
+python3 -c "import sys; sys.stdout.write('ssh ok ' * 200000 + 'tok_0123456789abcdef')" > run/evidence/big.log
+
+# Mirror: exit 1 for the secret in the PNG; sources untouched.
+before="$(find run -type f -exec cksum {} + | sort)"
+rc=0; python3 "$R" "$E2E_DB" --tree run --out share --jobs 2 > out.txt 2> err.txt || rc=$?
+[[ $rc -eq 1 ]] || { echo "expected exit 1 for the binary, got $rc"; cat out.txt err.txt; exit 1; }
+grep -q "binary file shot.png contains credential values (db:password)" err.txt || { cat err.txt; exit 1; }
+grep -q "^6 files: 4 redacted, 1 clean, 0 unchanged, 1 binary" out.txt || { cat out.txt; exit 1; }
+[[ "$(find run -type f -exec cksum {} + | sort)" == "$before" ]] || { echo "source tree modified"; exit 1; }
+for f in report.md evidence/crlf.log evidence/clean.log evidence/big.log replay.sh; do
+    python3 "$R" "$E2E_DB" < "run/$f" | cmp -s - "share/$f" || { echo "share/$f differs from stdin redaction"; exit 1; }
+done
+cmp -s run/shot.png share/shot.png || { echo "binary not copied as is"; exit 1; }
+[[ ! -e share/link.txt ]] || { echo "symlink followed"; exit 1; }
+python3 - share/.redact-manifest.json <<'PY'
+import json, sys
+files = json.load(open(sys.argv[1]))["files"]
+found = {rel: [tuple(k) for k in e["found"]] for rel, e in files.items()}
+assert found == {"report.md": [("deploy", "token"), ("db", "password")], "evidence/crlf.log": [("deploy", "token")],
+                 "evidence/clean.log": [], "evidence/big.log": [("deploy", "token")],
+                 "replay.sh": [("db", "password")], "shot.png": [("db", "password")]}, found
+assert "hunter2" not in open(sys.argv[1]).read()
+PY
+
+# Nothing changed: every text file is skipped by hash.
+rm run/shot.png
+python3 "$R" "$E2E_DB" --tree run --out share > out.txt
+grep -q "^5 files: 0 redacted, 0 clean, 5 unchanged, 0 binary" out.txt || { cat out.txt; exit 1; }
+
+# In place, serially: modes kept, no temporary files left, a rerun skips all
+# and an edited file is the only one searched again.
+python3 "$R" "$E2E_DB" --tree run --jobs 1 > out.txt
+grep -q "^5 files: 4 redacted, 1 clean" out.txt || { cat out.txt; exit 1; }
+cmp -s run/report.md share/report.md || { echo "in-place and mirror output differ"; exit 1; }
+[[ -x run/replay.sh ]] || { echo "file mode lost"; exit 1; }
+[[ -z "$(find run -name '*.redact-tmp')" ]] || { echo "temporary file left"; exit 1; }
+[[ "$(cat outside/secret.txt)" == "tok_0123456789abcdef" ]] || { echo "symlink target rewritten"; exit 1; }
+python3 "$R" "$E2E_DB" --tree run > out.txt
+grep -q "^5 files: 0 redacted, 0 clean, 5 unchanged" out.txt || { cat out.txt; exit 1; }
+printf 'late hunter2hunter2\n' >> run/evidence/clean.log
+python3 "$R" "$E2E_DB" --tree run > out.txt
+grep -q "^5 files: 1 redacted, 0 clean, 4 unchanged" out.txt || { cat out.txt; exit 1; }
+
+# New credentials invalidate the manifest: everything is searched again.
+sqlite3 "$E2E_DB" "INSERT INTO credentials (id, name, kind, fields)
+                   VALUES ('CRED-003', 'late', 'api-token', '{\"token\":\"nothing secret\"}');"
+python3 "$R" "$E2E_DB" --tree run > out.txt
+grep -q "^5 files: 1 redacted, 4 clean, 0 unchanged" out.txt || { cat out.txt; exit 1; }
+grep -q "redacted:late:token" run/evidence/clean.log || { echo "new credential not redacted"; exit 1; }
@@ -0,0 +1,28 @@
+"""Import the plugin's scripts for self-tests and benchmarks.
+
+The scripts in scripts/ have dashed file names, so they cannot be imported by
+name. tests/run-tests.sh puts this directory on PYTHONPATH; benchmarks add it
+to sys.path themselves.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import sys
+from pathlib import Path
+from types import ModuleType
+
+SCRIPTS = Path(__file__).resolve().parents[2] / "scripts"
+
+
+def load_script(name: str) -> ModuleType:
+    """Import scripts/<name>.py as a module named with underscores
+    (``load_script("import-ledger")`` → ``import_ledger``). As when the script
+    runs, scripts/ is on sys.path for its sibling modules (``redact``)."""
+    if str(SCRIPTS) not in sys.path:
+        sys.path.insert(0, str(SCRIPTS))
+    spec = importlib.util.spec_from_file_location(name.replace("-", "_"), SCRIPTS / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module  # dataclasses resolve annotations via sys.modules
+    spec.loader.exec_module(module)
+    return module
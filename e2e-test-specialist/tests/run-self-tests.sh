@@ -1,7 +1,7 @@
 #!/usr/bin/env bash
 # Plugin self-tests. Verifies:
 #   - Fresh schema.sql compiles
-#   - Migration paths v1.0 → v1.4 produce a v1.4.0 DB with all tables/views
+#   - Migration paths v1.0 → v1.11 produce a v1.11.0 DB with all tables/views
 #   - Migrations are idempotent
 #   - Importer parses the sample ledger and produces non-zero counts
 #   - lifecycle_hooks / notifications / resource_ledger inserts work
@@ -27,8 +27,8 @@ pass() { echo "  ✓ $*"; }
 echo "--- 1. Fresh schema.sql ---"
 sqlite3 fresh.sqlite < "$PLUGIN_ROOT/schemas/schema.sql"
 v="$(sqlite3 fresh.sqlite 'SELECT version FROM schema_version ORDER BY applied_at DESC LIMIT 1;')"
-[[ "$v" == "1.4.0" ]] || fail "fresh schema version = '$v', expected 1.4.0"
-pass "fresh schema → v1.4.0"
+[[ "$v" == "1.11.0" ]] || fail "fresh schema version = '$v', expected 1.11.0"
+pass "fresh schema → v1.11.0"
 
 # Verify all v1.4 tables exist
 for t in directives lifecycle_hooks test_coverage_links notifications resource_ledger; do
@@ -46,8 +46,8 @@ pass "all v1.4 views present"
 
 # 2. v1.3 → v1.4 migration on a synthetic v1.3.0 DB
 echo "--- 2. Migration v1.3.0 → v1.4.0 ---"
-# Build a synthetic v1.3.0 DB by taking the fresh v1.4.0 schema and undoing
-# the v1.4-specific deltas (drop new tables/views, drop new columns).
+# Build a synthetic v1.3.0 DB by taking the fresh v1.11.0 schema and undoing
+# the v1.4–v1.11-specific deltas (drop new tables/views, drop new columns).
 cp fresh.sqlite mig.sqlite
 sqlite3 mig.sqlite "
   DELETE FROM schema_version;
@@ -59,10 +59,49 @@ sqlite3 mig.sqlite "
   DROP TABLE IF EXISTS test_coverage_links;
   DROP TABLE IF EXISTS notifications;
   DROP TABLE IF EXISTS resource_ledger;
+  DROP VIEW IF EXISTS v_phase_markdown;
+  DROP VIEW IF EXISTS v_test_markdown;
+  DROP VIEW IF EXISTS v_run_final_state;
+  DROP VIEW IF EXISTS v_memory_body;
+  DROP TABLE IF EXISTS text_blobs;
   ALTER TABLE step_executions DROP COLUMN skip_reason;
   ALTER TABLE step_executions DROP COLUMN fix_attempt_index;
   ALTER TABLE test_steps DROP COLUMN idempotent;
   ALTER TABLE bugs DROP COLUMN affected_tests;
+  ALTER TABLE phases DROP COLUMN content_hash;
+  ALTER TABLE tests DROP COLUMN content_hash;
+  ALTER TABLE state DROP COLUMN import_cursor;
+  ALTER TABLE phases DROP COLUMN raw_blob;
+  ALTER TABLE tests DROP COLUMN raw_blob;
+  ALTER TABLE test_runs DROP COLUMN final_state_blob;
+  ALTER TABLE test_steps DROP COLUMN source_line;
+  ALTER TABLE test_steps DROP COLUMN source_line_end;
+  DROP TRIGGER IF EXISTS trg_credentials_stamp_insert;
+  DROP TRIGGER IF EXISTS trg_credentials_stamp_update;
+  DROP TRIGGER IF EXISTS trg_credentials_stamp_delete;
+  ALTER TABLE state DROP COLUMN credentials_stamp;
+  DROP TRIGGER IF EXISTS memories_ai;
+  DROP TRIGGER IF EXISTS memories_ad;
+  DROP TRIGGER IF EXISTS memories_au;
+  DROP TABLE IF EXISTS memories_fts;
+  ALTER TABLE memories DROP COLUMN body_blob;
+  ALTER TABLE test_tags DROP COLUMN auto;
+  CREATE VIRTUAL TABLE memories_fts USING fts5(
+      title, body, tags, content='memories', content_rowid='rowid');
+  CREATE TRIGGER memories_ai AFTER INSERT ON memories BEGIN
+      INSERT INTO memories_fts(rowid, title, body, tags)
+      VALUES (NEW.rowid, NEW.title, NEW.body, NEW.tags);
+  END;
+  CREATE TRIGGER memories_ad AFTER DELETE ON memories BEGIN
+      INSERT INTO memories_fts(memories_fts, rowid, title, body, tags)
+      VALUES('delete', OLD.rowid, OLD.title, OLD.body, OLD.tags);
+  END;
+  CREATE TRIGGER memories_au AFTER UPDATE ON memories BEGIN
+      INSERT INTO memories_fts(memories_fts, rowid, title, body, tags)
+      VALUES('delete', OLD.rowid, OLD.title, OLD.body, OLD.tags);
+      INSERT INTO memories_fts(rowid, title, body, tags)
+      VALUES (NEW.rowid, NEW.title, NEW.body, NEW.tags);
+  END;
 " 2>/dev/null  # SQLite versions older than 3.35 don't support DROP COLUMN; tolerate.
 bash "$PLUGIN_ROOT/schemas/migrate-v1.3-to-v1.4.sh" mig.sqlite
 final="$(sqlite3 mig.sqlite 'SELECT version FROM schema_version ORDER BY applied_at DESC LIMIT 1;')"
@@ -75,6 +114,115 @@ bash "$PLUGIN_ROOT/schemas/migrate-v1.3-to-v1.4.sh" mig.sqlite | grep -q "Alread
     || fail "v1.3→v1.4 migration not idempotent"
 pass "v1.3→v1.4 migration is idempotent"
 
+# 3b. v1.4 → v1.5 on the migrated DB
+echo "--- 3b. Migration v1.4.0 → v1.5.0 ---"
+bash "$PLUGIN_ROOT/schemas/migrate-v1.4-to-v1.5.sh" mig.sqlite
+final="$(sqlite3 mig.sqlite 'SELECT version FROM schema_version ORDER BY applied_at DESC LIMIT 1;')"
+[[ "$final" == "1.5.0" ]] || fail "v1.4→v1.5 migration ended at '$final', expected 1.5.0"
+sqlite3 mig.sqlite "SELECT content_hash FROM phases LIMIT 0; SELECT content_hash FROM tests LIMIT 0;" \
+    || fail "content_hash columns missing after v1.4→v1.5 migration"
+bash "$PLUGIN_ROOT/schemas/migrate-v1.4-to-v1.5.sh" mig.sqlite | grep -q "Already at v1.5.0" \
+    || fail "v1.4→v1.5 migration not idempotent"
+pass "v1.4 → v1.5 migration reaches 1.5.0 and is idempotent"
+
+# 3c. v1.5 → v1.6 on the migrated DB
+echo "--- 3c. Migration v1.5.0 → v1.6.0 ---"
+bash "$PLUGIN_ROOT/schemas/migrate-v1.5-to-v1.6.sh" mig.sqlite
+final="$(sqlite3 mig.sqlite 'SELECT version FROM schema_version ORDER BY applied_at DESC LIMIT 1;')"
+[[ "$final" == "1.6.0" ]] || fail "v1.5→v1.6 migration ended at '$final', expected 1.6.0"
+sqlite3 mig.sqlite "SELECT import_cursor FROM state LIMIT 0;" \
+    || fail "state.import_cursor missing after v1.5→v1.6 migration"
+bash "$PLUGIN_ROOT/schemas/migrate-v1.5-to-v1.6.sh" mig.sqlite | grep -q "Already at v1.6.0" \
+    || fail "v1.5→v1.6 migration not idempotent"
+pass "v1.5 → v1.6 migration reaches 1.6.0 and is idempotent"
+
+# 3d. v1.6 → v1.7 on a DB with imported rows: their text moves into text_blobs
+# and reads back unchanged through the views.
+echo "--- 3d. Migration v1.6.0 → v1.7.0 ---"
+LONG="replace(hex(zeroblob(200)), '0', 'step ')"  # 2000 compressible chars
+sqlite3 mig.sqlite "
+  INSERT INTO phases (id, title, phase_order, raw_markdown, content_hash)
+  VALUES ('P90', 'imported', 90, '### Phase 90' || char(10) || $LONG, 'h90'),
+         ('P91', 'by hand', 91, 'hand-written ' || $LONG, NULL);
+  INSERT INTO test_runs (id, status, final_state) VALUES ('R-900', 'completed', 'All green. ' || $LONG);
+"
+bash "$PLUGIN_ROOT/schemas/migrate-v1.6-to-v1.7.sh" mig.sqlite
+final="$(sqlite3 mig.sqlite 'SELECT version FROM schema_version ORDER BY applied_at DESC LIMIT 1;')"
+[[ "$final" == "1.7.0" ]] || fail "v1.6→v1.7 migration ended at '$final', expected 1.7.0"
+moved="$(sqlite3 mig.sqlite "SELECT group_concat(id) FROM (SELECT id FROM phases WHERE raw_blob IS NOT NULL
+                             UNION ALL SELECT id FROM test_runs WHERE final_state_blob IS NOT NULL);")"
+[[ "$moved" == "P90,R-900" ]] || fail "expected the imported phase and the run in text_blobs, got '$moved'"
+same="$(sqlite3 mig.sqlite "
+  SELECT (SELECT raw_markdown FROM v_phase_markdown WHERE id = 'P90') = '### Phase 90' || char(10) || $LONG
+     AND (SELECT final_state FROM v_run_final_state WHERE id = 'R-900') = 'All green. ' || $LONG;")"
+[[ "$same" == "1" ]] || fail "views do not return the migrated text"
+bash "$PLUGIN_ROOT/schemas/migrate-v1.6-to-v1.7.sh" mig.sqlite | grep -q "Already at v1.7.0" \
+    || fail "v1.6→v1.7 migration not idempotent"
+pass "v1.6 → v1.7 migration moves imported text into text_blobs and is idempotent"
+
+# 3e. v1.7 → v1.8 on the migrated DB
+echo "--- 3e. Migration v1.7.0 → v1.8.0 ---"
+bash "$PLUGIN_ROOT/schemas/migrate-v1.7-to-v1.8.sh" mig.sqlite
+final="$(sqlite3 mig.sqlite 'SELECT version FROM schema_version ORDER BY applied_at DESC LIMIT 1;')"
+[[ "$final" == "1.8.0" ]] || fail "v1.7→v1.8 migration ended at '$final', expected 1.8.0"
+sqlite3 mig.sqlite "SELECT source_line, source_line_end FROM test_steps LIMIT 0;" \
+    || fail "test_steps.source_line columns missing after v1.7→v1.8 migration"
+bash "$PLUGIN_ROOT/schemas/migrate-v1.7-to-v1.8.sh" mig.sqlite | grep -q "Already at v1.8.0" \
+    || fail "v1.7→v1.8 migration not idempotent"
+pass "v1.7 → v1.8 migration reaches 1.8.0 and is idempotent"
+
+# 3f. v1.8 → v1.9: the state row gets a stamp, and credential writes replace it
+echo "--- 3f. Migration v1.8.0 → v1.9.0 ---"
+bash "$PLUGIN_ROOT/schemas/migrate-v1.8-to-v1.9.sh" mig.sqlite
+final="$(sqlite3 mig.sqlite 'SELECT version FROM schema_version ORDER BY applied_at DESC LIMIT 1;')"
+[[ "$final" == "1.9.0" ]] || fail "v1.8→v1.9 migration ended at '$final', expected 1.9.0"
+stamp="$(sqlite3 mig.sqlite "SELECT credentials_stamp FROM state WHERE id = 1;")"
+[[ ${#stamp} -eq 32 ]] || fail "state.credentials_stamp not set after v1.8→v1.9 migration: '$stamp'"
+sqlite3 mig.sqlite "INSERT INTO credentials (id, name, kind, fields) VALUES ('CRED-900', 'mig', 'other', '{}');"
+[[ "$(sqlite3 mig.sqlite "SELECT credentials_stamp FROM state WHERE id = 1;")" != "$stamp" ]] \
+    || fail "credential insert did not replace the stamp after v1.8→v1.9 migration"
+bash "$PLUGIN_ROOT/schemas/migrate-v1.8-to-v1.9.sh" mig.sqlite | grep -q "Already at v1.9.0" \
+    || fail "v1.8→v1.9 migration not idempotent"
+pass "v1.8 → v1.9 migration reaches 1.9.0, stamps credential writes and is idempotent"
+
+# 3g. v1.9 → v1.10: long memory bodies move into text_blobs and stay searchable
+echo "--- 3g. Migration v1.9.0 → v1.10.0 ---"
+sqlite3 mig.sqlite "
+  INSERT INTO memories (id, title, kind, body) VALUES
+    ('M-900', 'long', 'environment', 'kubelet ' || $LONG),
+    ('M-901', 'short', 'gotcha', 'short kubelet note');
+"
+bash "$PLUGIN_ROOT/schemas/migrate-v1.9-to-v1.10.sh" mig.sqlite
+final="$(sqlite3 mig.sqlite 'SELECT version FROM schema_version ORDER BY applied_at DESC LIMIT 1;')"
+[[ "$final" == "1.10.0" ]] || fail "v1.9→v1.10 migration ended at '$final', expected 1.10.0"
+moved="$(sqlite3 mig.sqlite "SELECT group_concat(id) FROM memories WHERE body_blob IS NOT NULL;")"
+[[ "$moved" == "M-900" ]] || fail "expected only the long memory body in text_blobs, got '$moved'"
+same="$(sqlite3 mig.sqlite "SELECT body = 'kubelet ' || $LONG FROM v_memory_body WHERE id = 'M-900';")"
+[[ "$same" == "1" ]] || fail "v_memory_body does not return the migrated body"
+hits="$(sqlite3 mig.sqlite "SELECT COUNT(*) FROM memories_fts WHERE memories_fts MATCH 'kubelet';")"
+[[ "$hits" == "2" ]] || fail "memories_fts finds $hits of 2 memories after v1.9→v1.10 migration"
+sqlite3 mig.sqlite "INSERT INTO memories_fts(memories_fts) VALUES('integrity-check');" \
+    || fail "memories_fts out of sync after v1.9→v1.10 migration"
+bash "$PLUGIN_ROOT/schemas/migrate-v1.9-to-v1.10.sh" mig.sqlite | grep -q "Already at v1.10.0" \
+    || fail "v1.9→v1.10 migration not idempotent"
+pass "v1.9 → v1.10 migration moves memory bodies into text_blobs, keeps them searchable and is idempotent"
+
+# 3h. v1.10 → v1.11: existing links to auto tags are marked as the importer's
+echo "--- 3h. Migration v1.10.0 → v1.11.0 ---"
+sqlite3 mig.sqlite "
+  INSERT INTO tests (id, phase_id, title, test_order) VALUES ('T-90.01', 'P90', 'tagged', 1);
+  INSERT INTO tags (name, auto) VALUES ('smoke', 1), ('hand', 0);
+  INSERT INTO test_tags (test_id, tag_name) VALUES ('T-90.01', 'smoke'), ('T-90.01', 'hand');
+"
+bash "$PLUGIN_ROOT/schemas/migrate-v1.10-to-v1.11.sh" mig.sqlite
+final="$(sqlite3 mig.sqlite 'SELECT version FROM schema_version ORDER BY applied_at DESC LIMIT 1;')"
+[[ "$final" == "1.11.0" ]] || fail "v1.10→v1.11 migration ended at '$final', expected 1.11.0"
+marked="$(sqlite3 mig.sqlite "SELECT group_concat(tag_name || '=' || auto) FROM (SELECT * FROM test_tags ORDER BY tag_name);")"
+[[ "$marked" == "hand=0,smoke=1" ]] || fail "unexpected test_tags.auto after v1.10→v1.11 migration: '$marked'"
+bash "$PLUGIN_ROOT/schemas/migrate-v1.10-to-v1.11.sh" mig.sqlite | grep -q "Already at v1.11.0" \
+    || fail "v1.10→v1.11 migration not idempotent"
+pass "v1.10 → v1.11 migration marks links to auto tags and is idempotent"
+
 # 4. Importer
 echo "--- 4. Importer on sample ledger ---"
 mkdir -p .e2e-testing
@@ -14,6 +14,8 @@ set -uo pipefail
 
 ROOT="$(cd "$(dirname "$0")/.." && pwd)"
 export CLAUDE_PLUGIN_ROOT="$ROOT"
+# Python snippets in the cases import the scripts via tests/lib/plugin_scripts.py.
+export PYTHONPATH="$ROOT/tests/lib${PYTHONPATH:+:$PYTHONPATH}"
 
 KEEP_GOING=0
 SELECTED=""